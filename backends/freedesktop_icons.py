@@ -0,0 +1,427 @@
+"""
+Application icons on Linux and other freedesktop.org desktops.
+
+An executable is matched to its .desktop entry (by the program in Exec or
+TryExec, the entry id or StartupWMClass), and the entry's Icon is resolved
+through the icon theme, its inherited themes, hicolor and the pixmaps
+folders, following the icon theme specification.
+
+Both the .desktop entries and the theme directories are indexed once, on
+the first lookup, so a lookup is a few dict reads instead of a walk over
+/usr/share/icons. Benchmark with:
+
+    python -m backends.freedesktop_icons [exe_path ...]
+"""
+
+import base64
+import io
+import os
+import re
+import shlex
+import threading
+import time
+from backends.icons import IconBackend
+
+ICON_SIZE = 32
+
+# SVG icons are skipped, PIL cannot render them
+IMAGE_EXTENSIONS = (".png", ".xpm")
+
+FALLBACK_THEME = "hicolor"
+
+# Programs that start something else; their name says nothing about the app
+LAUNCHERS = {"flatpak", "snap", "sh", "bash", "gtk-launch", "xdg-open"}
+
+# Interpreters running a script or a jar. Indexing them would give every
+# python3 or java process the icon of whichever app happens to use it.
+INTERPRETERS = {"python", "node", "nodejs", "java", "perl", "ruby", "mono", "gjs"}
+
+
+def data_dirs():
+    """
+    Returns:
+        list: $XDG_DATA_HOME followed by $XDG_DATA_DIRS, most important first.
+    """
+    home = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    return [home] + [d for d in dirs.split(":") if d]
+
+
+def read_ini(path):
+    """
+    Reads a .desktop or index.theme file. Much cheaper than configparser for
+    the hundreds of small files read by the index.
+
+    Returns:
+        dict: Section name -> dict of keys, localized keys ("Name[de]") skipped.
+    """
+    sections = {}
+    values = None
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] == "#":
+                    continue
+                if line[0] == "[":
+                    values = sections.setdefault(line[1:-1], {})
+                elif values is not None:
+                    key, sep, value = line.partition("=")
+                    if sep and "[" not in key:
+                        values[key.strip()] = value.strip()
+    except OSError:
+        pass
+    return sections
+
+
+def current_theme_name():
+    """
+    Reads the icon theme from the GTK or KDE settings, None if not found.
+    """
+    theme = os.environ.get("TIMETOSLEEP_ICON_THEME")
+    if theme:
+        return theme
+    config = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    for name, section, key in (
+        ("gtk-4.0/settings.ini", "Settings", "gtk-icon-theme-name"),
+        ("gtk-3.0/settings.ini", "Settings", "gtk-icon-theme-name"),
+        ("kdeglobals", "Icons", "Theme"),
+    ):
+        theme = read_ini(os.path.join(config, name)).get(section, {}).get(key)
+        if theme:
+            return theme.strip("\"'")
+    return None
+
+
+def exec_program(exec_line):
+    """
+    Returns the program an Exec line starts, skipping `env VAR=value`.
+    """
+    try:
+        args = shlex.split(exec_line)
+    except ValueError:
+        return None
+    if args and os.path.basename(args[0]) == "env":
+        args = args[1:]
+        while args and "=" in args[0]:
+            args = args[1:]
+    return args[0] if args and not args[0].startswith("%") else None
+
+
+def runs_other_programs(program):
+    """
+    True for launchers and interpreters, also versioned ones ("python3.12").
+    """
+    name = os.path.basename(program)
+    return name in LAUNCHERS or re.sub(r"[\d.]+$", "", name) in INTERPRETERS
+
+
+class DesktopIndex:
+    """
+    Maps executables to the Icon of their .desktop entry.
+    """
+
+    def __init__(self):
+        self.by_path = {}
+        self.by_name = {}
+
+    def build(self, dirs):
+        # Earlier folders win, as in the menu specification
+        for base in dirs:
+            self._scan(os.path.join(base, "applications"), "")
+        return self
+
+    def _scan(self, folder, prefix):
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir():
+                self._scan(entry.path, prefix + entry.name + "-")
+            elif entry.name.endswith(".desktop"):
+                self._add(entry.path, prefix + entry.name[: -len(".desktop")])
+
+    def _add(self, path, entry_id):
+        values = read_ini(path).get("Desktop Entry", {})
+        icon = values.get("Icon")
+        if not icon:
+            return
+        keys = [entry_id, values.get("StartupWMClass", "")]
+        for field in ("TryExec", "Exec"):
+            program = exec_program(values.get(field, ""))
+            if program and not runs_other_programs(program):
+                if os.path.isabs(program):
+                    self.by_path.setdefault(program, icon)
+                    self.by_path.setdefault(os.path.realpath(program), icon)
+                keys.append(os.path.basename(program))
+        for key in keys:
+            if key:
+                self.by_name.setdefault(key.lower(), icon)
+
+    def lookup(self, exe_path):
+        """
+        Returns:
+            str: The Icon value (a name or an absolute path), or None.
+        """
+        icon = self.by_path.get(exe_path) or self.by_name.get(
+            os.path.basename(exe_path).lower()
+        )
+        if icon is None:
+            # Exec may name a symlink to the binary that is running
+            real_path = os.path.realpath(exe_path)
+            icon = self.by_path.get(real_path) or self.by_name.get(
+                os.path.basename(real_path).lower()
+            )
+        return icon
+
+
+def size_distance(info, size):
+    """
+    How far a theme directory is from the wanted size, per the icon theme
+    specification. 0 means the directory holds icons of that size.
+    """
+    try:
+        scale = int(info.get("Scale", 1))
+        nominal = int(info["Size"])
+        kind = info.get("Type", "Threshold")
+        if kind == "Fixed":
+            low = high = nominal
+        elif kind == "Scalable":
+            low = int(info.get("MinSize", nominal))
+            high = int(info.get("MaxSize", nominal))
+        else:
+            threshold = int(info.get("Threshold", 2))
+            low, high = nominal - threshold, nominal + threshold
+    except (KeyError, ValueError):
+        return None
+    # HiDPI copies of a directory rank after the plain one
+    penalty = 0 if scale == 1 else 1
+    if low <= size <= high:
+        return penalty
+    return min(abs(low - size), abs(high - size)) * 2 + penalty
+
+
+class ThemeIndex:
+    """
+    For each theme in use, the best image per icon name at the wanted size.
+
+    A theme is indexed the first time it is needed: its index.theme is read
+    in every base folder and each of its directories is listed once.
+    """
+
+    def __init__(self, dirs, size=ICON_SIZE):
+        self.base_dirs = [os.path.join(os.path.expanduser("~"), ".icons")] + [
+            os.path.join(d, "icons") for d in dirs
+        ]
+        self.pixmap_dirs = [os.path.join(d, "pixmaps") for d in dirs]
+        self.size = size
+        self._themes = {}
+        self._pixmaps = None
+
+    def theme(self, name):
+        """
+        Returns:
+            tuple: (icons dict name -> path, list of inherited theme names)
+        """
+        if name not in self._themes:
+            self._themes[name] = self._index_theme(name)
+        return self._themes[name]
+
+    def _index_theme(self, name):
+        best = {}
+        inherits = []
+        for base in self.base_dirs:
+            theme_dir = os.path.join(base, name)
+            sections = read_ini(os.path.join(theme_dir, "index.theme"))
+            info = sections.get("Icon Theme")
+            if not info:
+                continue
+            if not inherits:
+                inherits = [t for t in info.get("Inherits", "").split(",") if t]
+            folders = info.get("Directories", "").split(",")
+            folders += info.get("ScaledDirectories", "").split(",")
+            for folder in filter(None, folders):
+                distance = size_distance(sections.get(folder, {}), self.size)
+                if distance is not None:
+                    self._index_folder(os.path.join(theme_dir, folder), distance, best)
+        return {n: path for n, (_, path) in best.items()}, inherits
+
+    @staticmethod
+    def _index_folder(folder, distance, best):
+        try:
+            entries = os.scandir(folder)
+        except OSError:
+            return
+        with entries:
+            for entry in entries:
+                icon_name, ext = os.path.splitext(entry.name)
+                if ext in IMAGE_EXTENSIONS:
+                    current = best.get(icon_name)
+                    if current is None or distance < current[0]:
+                        best[icon_name] = (distance, entry.path)
+
+    def pixmaps(self):
+        if self._pixmaps is None:
+            self._pixmaps = {}
+            # Loose icons in the base folders, then the pixmaps folders
+            for folder in self.base_dirs + self.pixmap_dirs:
+                found = {}
+                self._index_folder(folder, 0, found)
+                for icon_name, (_, path) in found.items():
+                    self._pixmaps.setdefault(icon_name, path)
+        return self._pixmaps
+
+    def lookup(self, icon_name, theme_name=None):
+        """
+        Resolves an icon name through the theme, the themes it inherits
+        and hicolor, then the pixmaps folders.
+
+        Returns:
+            str: Path of the image, or None.
+        """
+        pending = [theme_name] if theme_name else []
+        pending.append(FALLBACK_THEME)
+        seen = set()
+        while pending:
+            name = pending.pop(0)
+            if name in seen:
+                continue
+            seen.add(name)
+            icons, inherits = self.theme(name)
+            if icon_name in icons:
+                return icons[icon_name]
+            # Parents are searched depth first, hicolor always comes last
+            pending[0:0] = [t for t in inherits if t != FALLBACK_THEME]
+        return self.pixmaps().get(icon_name)
+
+
+def encode_png(path, size=ICON_SIZE):
+    """
+    Returns the image at `path` as a base64 PNG of size x size. A PNG that
+    already has that size is passed through without decoding it.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[16:24] == (
+        size.to_bytes(4, "big") * 2
+    ):
+        return base64.b64encode(data).decode("ascii")
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGBA")
+        if image.size != (size, size):
+            image = image.resize((size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class FreedesktopIconBackend(IconBackend):
+    """
+    Icons for executables from .desktop entries and the icon theme.
+    """
+
+    def __init__(self, theme=None, dirs=None, size=ICON_SIZE):
+        """
+        Args:
+            theme (str): Icon theme, read from the desktop settings by default.
+            dirs (list): XDG data folders, from the environment by default.
+            size (int): Width and height of the returned icons.
+        """
+        self.theme_name = theme
+        self.dirs = dirs
+        self.size = size
+        self.desktop = None
+        self.themes = None
+        self._lock = threading.Lock()
+
+    def build_index(self):
+        """
+        Indexes the .desktop entries and the theme chain. Runs on the first
+        lookup; calling it earlier moves the cost off that lookup.
+        """
+        with self._lock:
+            if self.desktop is None:
+                dirs = self.dirs or data_dirs()
+                if self.theme_name is None:
+                    self.theme_name = current_theme_name()
+                self.themes = ThemeIndex(dirs, self.size)
+                # Looking up a name that matches nothing indexes every theme
+                # of the chain and the pixmaps folders
+                self.themes.lookup("", self.theme_name)
+                self.desktop = DesktopIndex().build(dirs)
+        return self
+
+    def find_icon_path(self, exe_path):
+        if self.desktop is None:
+            self.build_index()
+        # Many apps without a .desktop entry still name their icon after
+        # the executable
+        icon = self.desktop.lookup(exe_path) or os.path.basename(exe_path)
+        if os.path.isabs(icon):
+            return icon if os.path.isfile(icon) else None
+        name, ext = os.path.splitext(icon)
+        if ext in IMAGE_EXTENSIONS:
+            icon = name
+        return self.themes.lookup(icon, self.theme_name)
+
+    def get_icon_base64(self, exe_path):
+        path = self.find_icon_path(exe_path)
+        if path is None:
+            return None
+        try:
+            return encode_png(path, self.size)
+        except Exception as e:
+            print(f"Error reading icon {path}: {e}")
+            return None
+
+
+def benchmark(exe_paths, repeat=1000):
+    """
+    Times the cold index build and warm lookups.
+
+    Returns:
+        dict: Milliseconds for the index build, microseconds per lookup,
+            and how many of the executables resolved to an icon.
+    """
+    backend = FreedesktopIconBackend()
+    start = time.perf_counter()
+    backend.build_index()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for exe_path in exe_paths:
+            backend.find_icon_path(exe_path)
+    lookups = max(repeat * len(exe_paths), 1)
+    warm_us = (time.perf_counter() - start) * 1e6 / lookups
+
+    return {
+        "theme": backend.theme_name,
+        "desktop_entries": len(backend.desktop.by_name),
+        "cold_index_ms": round(cold_ms, 2),
+        "warm_lookup_us": round(warm_us, 2),
+        "resolved": sum(1 for p in exe_paths if backend.find_icon_path(p)),
+        "total": len(exe_paths),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    paths = sys.argv[1:]
+    if not paths:
+        import psutil
+
+        paths = sorted(
+            {p.info["exe"] for p in psutil.process_iter(["exe"]) if p.info["exe"]}
+        )
+    print(json.dumps(benchmark(paths), indent=2))
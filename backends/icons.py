@@ -0,0 +1,75 @@
+import sys
+
+
+class IconBackend:
+    """
+    Extracts application icons. Backends return a base64 encoded PNG string,
+    or None when no icon can be found, so the UI falls back to a generic icon.
+    """
+
+    def get_icon_base64(self, exe_path):
+        raise NotImplementedError
+
+
+class NullIconBackend(IconBackend):
+    """Used where no icon source is available, every app gets the generic icon."""
+
+    def get_icon_base64(self, exe_path):
+        return None
+
+
+class WindowsIconBackend(IconBackend):
+    """
+    Reads icons from executables through pywin32. icon_extractor, and with it
+    win32ui, win32gui and PIL, is only imported on the first lookup.
+    """
+
+    def __init__(self):
+        self._extractor = None
+        self._unavailable = False
+
+    def get_icon_base64(self, exe_path):
+        if self._unavailable:
+            return None
+        if self._extractor is None:
+            try:
+                import icon_extractor
+            except ImportError as e:
+                print(f"Icon extraction unavailable: {e}")
+                self._unavailable = True
+                return None
+            self._extractor = icon_extractor
+        return self._extractor.get_icon_base64(exe_path)
+
+
+_backend = None
+
+
+def get_icon_backend():
+    """
+    Returns the icon backend for the current platform, created on first use.
+    """
+    global _backend
+    if _backend is None:
+        if sys.platform == "win32":
+            _backend = WindowsIconBackend()
+        elif sys.platform == "darwin":
+            _backend = NullIconBackend()
+        else:
+            from backends.freedesktop_icons import FreedesktopIconBackend
+
+            _backend = FreedesktopIconBackend()
+    return _backend
+
+
+def set_icon_backend(backend):
+    global _backend
+    _backend = backend
+
+
+def extract_icon(exe_path):
+    """
+    Icon of an executable from the current backend. A plain function, so
+    it can be handed to a worker process.
+    """
+    return get_icon_backend().get_icon_base64(exe_path)
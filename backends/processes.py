@@ -0,0 +1,205 @@
+import itertools
+from services.clock import system_clock
+
+
+class ProcessBackend:
+    """
+    Lists, terminates and waits for processes. process_manager goes through
+    the current backend, so tests can swap the live system for a fake one.
+    """
+
+    def iter_processes(self):
+        """
+        Yields a dict {'pid': int, 'name': str, 'exe': str|None,
+        'ppid': int|None, 'create_time': float|None} per process.
+        """
+        raise NotImplementedError
+
+    def cmdline(self, pid):
+        """
+        Returns the arguments of a process as a list, or None if they cannot
+        be read. Slower than listing, so only asked for when needed.
+        """
+        raise NotImplementedError
+
+    def terminate(self, pid):
+        """
+        Returns True if the process was asked to exit.
+        """
+        raise NotImplementedError
+
+    def wait_for_exit(self, pids, timeout):
+        """
+        Returns True if all the processes exited within the timeout.
+        """
+        raise NotImplementedError
+
+
+class PsutilProcessBackend(ProcessBackend):
+    def __init__(self):
+        # Imported here so the fake backend works without psutil
+        import psutil
+
+        self.psutil = psutil
+        self.errors = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+    def iter_processes(self):
+        for proc in self.psutil.process_iter(
+            ["pid", "name", "exe", "ppid", "create_time"]
+        ):
+            yield proc.info
+
+    def cmdline(self, pid):
+        try:
+            return self.psutil.Process(pid).cmdline()
+        except self.errors:
+            return None
+
+    def terminate(self, pid):
+        try:
+            self.psutil.Process(pid).terminate()
+            return True
+        except self.errors as e:
+            print(f"Error killing process {pid}: {e}")
+            return False
+
+    def wait_for_exit(self, pids, timeout):
+        procs = []
+        for pid in pids:
+            try:
+                procs.append(self.psutil.Process(pid))
+            except self.errors:
+                pass
+
+        _, alive = self.psutil.wait_procs(procs, timeout=timeout)
+        return not alive
+
+
+class FakeProcessBackend(ProcessBackend):
+    """
+    An in-memory process table driven by a clock, for tests and simulations.
+
+    Processes are added with spawn(). A terminated process exits
+    `exit_delay` seconds later on the clock, and wait_for_exit() sleeps on
+    the clock, so with a VirtualClock waits cost no real time.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock or system_clock
+        self.processes = {}
+        self.terminated = []
+        self.cmdline_reads = 0
+        self._pids = itertools.count(1000)
+
+    def spawn(
+        self,
+        name,
+        exe=None,
+        count=1,
+        exit_delay=0.0,
+        protected=False,
+        parent=None,
+        cmdline=None,
+        pid=None,
+    ):
+        """
+        Adds `count` processes.
+
+        Args:
+            exit_delay (float): Seconds between terminate() and the exit.
+            protected (bool): terminate() fails, as for another user's process.
+            parent (int): PID of the parent process.
+            cmdline (list): Arguments, [exe or name] by default.
+            pid (int): Reuses this PID, replacing the process that had it.
+
+        Returns:
+            list: The new PIDs.
+        """
+        pids = []
+        for _ in range(count):
+            if pid is None or pids:
+                pid = next(self._pids)
+            self.processes[pid] = {
+                "pid": pid,
+                "name": name,
+                "exe": exe,
+                "ppid": parent,
+                "create_time": self.clock.time(),
+                "cmdline": cmdline or [exe or name],
+                "exit_delay": exit_delay,
+                "protected": protected,
+                "exits_at": None,
+            }
+            pids.append(pid)
+        return pids
+
+    def is_alive(self, pid):
+        proc = self.processes.get(pid)
+        if proc is None:
+            return False
+        return proc["exits_at"] is None or proc["exits_at"] > self.clock.monotonic()
+
+    def iter_processes(self):
+        for pid in list(self.processes):
+            if self.is_alive(pid):
+                proc = self.processes[pid]
+                yield {
+                    "pid": pid,
+                    "name": proc["name"],
+                    "exe": proc["exe"],
+                    "ppid": proc["ppid"],
+                    "create_time": proc["create_time"],
+                }
+
+    def cmdline(self, pid):
+        self.cmdline_reads += 1
+        if not self.is_alive(pid):
+            return None
+        return list(self.processes[pid]["cmdline"])
+
+    def terminate(self, pid):
+        if not self.is_alive(pid) or self.processes[pid]["protected"]:
+            return False
+        proc = self.processes[pid]
+        if proc["exits_at"] is None:
+            proc["exits_at"] = self.clock.monotonic() + proc["exit_delay"]
+        self.terminated.append(pid)
+        return True
+
+    def wait_for_exit(self, pids, timeout):
+        now = self.clock.monotonic()
+        exits = []
+        for pid in pids:
+            if self.is_alive(pid):
+                exits_at = self.processes[pid]["exits_at"]
+                exits.append(float("inf") if exits_at is None else exits_at)
+        if not exits:
+            return True
+        last_exit = max(exits)
+        if timeout is None:
+            if last_exit == float("inf"):
+                # A real wait would block forever
+                return False
+        elif last_exit > now + timeout:
+            self.clock.sleep(timeout)
+            return False
+        self.clock.sleep(last_exit - now)
+        return True
+
+
+_backend = None
+
+
+def get_process_backend():
+    """
+    Returns the process backend, created on first use.
+    """
+    global _backend
+    if _backend is None:
+        _backend = PsutilProcessBackend()
+    return _backend
+
+
+def set_process_backend(backend):
+    global _backend
+    _backend = backend
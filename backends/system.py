@@ -0,0 +1,88 @@
+import os
+import sys
+
+
+class SystemBackend:
+    """
+    Power and session actions for one platform.
+    """
+
+    def shutdown(self):
+        raise NotImplementedError
+
+    def restart(self):
+        raise NotImplementedError
+
+    def lock(self):
+        raise NotImplementedError
+
+    def sleep(self):
+        raise NotImplementedError
+
+
+class WindowsSystemBackend(SystemBackend):
+    def shutdown(self):
+        os.system("shutdown /s /t 1")
+
+    def restart(self):
+        os.system("shutdown /r /t 1")
+
+    def lock(self):
+        import ctypes
+
+        ctypes.windll.user32.LockWorkStation()
+
+    def sleep(self):
+        # Helper to enable hibernation if needed, but for sleep we specifically want suspend
+        os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+
+
+class LinuxSystemBackend(SystemBackend):
+    def shutdown(self):
+        os.system("systemctl poweroff")
+
+    def restart(self):
+        os.system("systemctl reboot")
+
+    def lock(self):
+        os.system("loginctl lock-session")
+
+    def sleep(self):
+        os.system("systemctl suspend")
+
+
+class MacSystemBackend(SystemBackend):
+    def shutdown(self):
+        os.system("osascript -e 'tell app \"System Events\" to shut down'")
+
+    def restart(self):
+        os.system("osascript -e 'tell app \"System Events\" to restart'")
+
+    def lock(self):
+        os.system("pmset displaysleepnow")
+
+    def sleep(self):
+        os.system("pmset sleepnow")
+
+
+_backend = None
+
+
+def get_system_backend():
+    """
+    Returns the system backend for the current platform, created on first use.
+    """
+    global _backend
+    if _backend is None:
+        if sys.platform == "win32":
+            _backend = WindowsSystemBackend()
+        elif sys.platform == "darwin":
+            _backend = MacSystemBackend()
+        else:
+            _backend = LinuxSystemBackend()
+    return _backend
+
+
+def set_system_backend(backend):
+    global _backend
+    _backend = backend
@@ -0,0 +1,120 @@
+"""
+Client for the control API of a running Time to Sleep instance.
+
+    python control_client.py timer.list
+    python control_client.py timer.start after=2h30m action=Sleep
+    python control_client.py timer.start after=45m processes=chrome,steam
+    python control_client.py processes.list query=chrome
+    python control_client.py processes.list group_by=app
+    python control_client.py processes.list query=node cmdline=server.js
+    python control_client.py schedule.add rule="weekdays 23:30" action=Lock
+    python control_client.py --batch < commands.jsonl
+
+Arguments are key=value pairs; values that parse as JSON (numbers, true,
+lists) are sent as such, anything else as a string. With --batch, each stdin
+line is a JSON command and all of them are sent in a single round-trip.
+"""
+
+import json
+import socket
+import sys
+from services.control_address import default_address
+
+
+class ControlClient:
+    def __init__(self, address=None, timeout=5.0):
+        self.address = address or default_address()
+        self.timeout = timeout
+        self._file = None
+        self._sock = None
+
+    def connect(self):
+        if sys.platform == "win32":
+            self._file = open(self.address, "r+b", buffering=0)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            self._sock.connect(self.address)
+            self._file = self._sock.makefile("rwb", buffering=0)
+        return self
+
+    def close(self):
+        if self._file:
+            self._file.close()
+        if self._sock:
+            self._sock.close()
+        self._file = None
+        self._sock = None
+
+    def __enter__(self):
+        if self._file is None:
+            self.connect()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, payload):
+        """
+        Sends one command dict, or a list of them as a batch, and returns the
+        reply (a list of replies for a batch).
+        """
+        self._file.write(json.dumps(payload).encode() + b"\n")
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Control server closed the connection")
+        return json.loads(line)
+
+    def call(self, cmd, **args):
+        """
+        Runs a single command and returns its result. Raises RuntimeError if
+        the server reports an error.
+        """
+        reply = self.request({"cmd": cmd, "args": args})
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error"))
+        return reply.get("result")
+
+
+def parse_args(pairs):
+    args = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected key=value, got {pair!r}")
+        try:
+            args[key] = json.loads(value)
+        except ValueError:
+            args[key] = value
+    return args
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return 0
+
+    try:
+        if argv[0] == "--batch":
+            payload = [json.loads(line) for line in sys.stdin if line.strip()]
+        else:
+            payload = {"cmd": argv[0], "args": parse_args(argv[1:])}
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        with ControlClient() as client:
+            reply = client.request(payload)
+    except OSError as e:
+        print(f"error: Time to Sleep is not running ({e})", file=sys.stderr)
+        return 3
+
+    print(json.dumps(reply, indent=2))
+    replies = reply if isinstance(reply, list) else [reply]
+    return 0 if all(r.get("ok") for r in replies) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
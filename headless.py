@@ -0,0 +1,242 @@
+"""
+Headless mode: runs a timer and its action without the Flet UI or the tray.
+
+    python main.py --headless --after 2h30m --terminate chrome,steam --then sleep
+    python main.py --headless --at 23:30 --action lock
+
+Progress goes to stdout one line at a time, so the output reads well in a
+terminal, a log file or the systemd journal. The exit code tells scripts what
+happened (see the EXIT_* constants).
+"""
+
+import argparse
+import signal
+import sys
+import threading
+from services.timer_service import TimerService
+from services.action_executor import ActionExecutor
+from services.time_utils import (
+    format_duration,
+    parse_clock,
+    parse_duration,
+    seconds_until,
+)
+import process_manager
+
+EXIT_OK = 0
+EXIT_ACTION_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NO_MATCH = 3
+EXIT_CANCELLED = 130
+
+SYSTEM_ACTIONS = {
+    "shutdown": "Shutdown",
+    "restart": "Restart",
+    "lock": "Lock",
+    "sleep": "Sleep",
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py --headless",
+        description="Run a Time to Sleep timer without the UI.",
+    )
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+
+    when = parser.add_mutually_exclusive_group(required=True)
+    when.add_argument("--after", metavar="DURATION", help="e.g. 2h30m, 45m, 90s")
+    when.add_argument("--at", metavar="HH:MM", help="next time the clock shows this")
+    when.add_argument("--now", action="store_true", help="run the action right away")
+
+    parser.add_argument(
+        "--terminate",
+        metavar="NAMES",
+        help="comma separated process names, e.g. chrome,steam",
+    )
+    parser.add_argument(
+        "--then",
+        "--action",
+        dest="system_action",
+        choices=sorted(SYSTEM_ACTIONS),
+        help="system action to run (after terminating, if --terminate is given)",
+    )
+    parser.add_argument(
+        "--wait",
+        type=int,
+        default=30,
+        metavar="SECONDS",
+        help="how long to wait for terminated apps to exit before --then",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=int,
+        default=60,
+        metavar="SECONDS",
+        help="print the remaining time this often, 0 to disable",
+    )
+    parser.add_argument("--quiet", action="store_true", help="only print the result")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print what would run when the timer ends, without running it",
+    )
+    return parser
+
+
+def build_plan(args):
+    """
+    Returns:
+        tuple: (action, pipeline) as accepted by ActionExecutor.
+    """
+    system_action = SYSTEM_ACTIONS.get(args.system_action)
+    if args.terminate and system_action:
+        return "Pipeline", [
+            {
+                "actions": ["Terminate Process"],
+                "timeout": None,
+                "on_failure": "continue",
+            },
+            {
+                "actions": ["Wait For Exit"],
+                "timeout": args.wait,
+                "on_failure": "continue",
+            },
+            {"actions": [system_action], "timeout": None, "on_failure": "abort"},
+        ]
+    if args.terminate:
+        return "Terminate Process", []
+    return system_action, []
+
+
+def resolve_seconds(args):
+    if args.now:
+        return 0
+    if args.after:
+        return parse_duration(args.after)
+    return seconds_until(parse_clock(args.at))
+
+
+def run(argv, out=None):
+    out = out or sys.stdout
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    def say(message, always=False):
+        if always or not args.quiet:
+            print(message, file=out, flush=True)
+
+    if not args.terminate and not args.system_action:
+        parser.print_usage(sys.stderr)
+        print("error: nothing to do, pass --terminate and/or --then", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        total_seconds = resolve_seconds(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if total_seconds <= 0 and not args.now:
+        print("error: time must be greater than 0", file=sys.stderr)
+        return EXIT_USAGE
+
+    action, pipeline = build_plan(args)
+    names = args.terminate.split(",") if args.terminate else []
+
+    if names:
+        # Only a hint at this point; processes are matched again when the
+        # timer ends, since they may start or restart in the meantime.
+        groups = process_manager.get_running_processes(show_all=True, with_icons=False)
+        _, missing = process_manager.find_process_groups(names, groups)
+        if missing:
+            say(f"Not running yet: {', '.join(missing)}")
+
+    if total_seconds:
+        say(f"{action} in {format_duration(total_seconds)}")
+        if not wait_for_timer(total_seconds, args.progress_interval, say):
+            say("Cancelled.", always=True)
+            return EXIT_CANCELLED
+
+    selected = []
+    if names:
+        groups = process_manager.get_running_processes(show_all=True, with_icons=False)
+        selected, missing = process_manager.find_process_groups(names, groups)
+        if not selected and action == "Terminate Process":
+            say(f"No running process matches: {', '.join(missing)}", always=True)
+            return EXIT_NO_MATCH
+
+    if args.dry_run:
+        targets = ", ".join(g.name for g in selected) or "-"
+        say(f"Would run {action} (targets: {targets})", always=True)
+        return EXIT_OK
+
+    if action == "Pipeline":
+        result = ActionExecutor.execute_pipeline(pipeline, selected)
+    else:
+        result = ActionExecutor.execute(action, selected)
+    return report(result, say)
+
+
+def wait_for_timer(total_seconds, progress_interval, say):
+    """
+    Runs the countdown on TimerService and blocks until it ends.
+    Returns False if it was interrupted by Ctrl+C or SIGTERM.
+    """
+    timer_service = TimerService()
+    finished = threading.Event()
+    cancelled = threading.Event()
+
+    def on_tick(remaining, total):
+        elapsed = total - remaining
+        if progress_interval and remaining and elapsed % progress_interval == 0:
+            say(f"Remaining {format_duration(remaining)}")
+
+    def on_signal(signum, frame):
+        cancelled.set()
+        finished.set()
+
+    previous = signal.signal(signal.SIGTERM, on_signal)
+    timer_service.start_timer(total_seconds, on_tick=on_tick, on_finish=finished.set)
+    try:
+        # Short waits keep the main thread responsive to Ctrl+C
+        while not finished.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        cancelled.set()
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+    if cancelled.is_set():
+        timer_service.cancel_timer()
+        return False
+    return True
+
+
+def report(result, say):
+    if result.get("type") == "termination":
+        say(
+            f"Terminated {result.get('count', 0)}/{result.get('total', 0)} apps.",
+            always=True,
+        )
+        ok = result.get("count") == result.get("total")
+    else:
+        say(result.get("message", ""), always=True)
+        ok = result.get("success", False)
+
+    for stage in result.get("stages", []):
+        if stage.get("skipped"):
+            status = "skipped"
+        else:
+            status = "ok" if stage["success"] else "failed"
+            status += f" in {stage['elapsed']:.2f}s"
+        say(f"  {' + '.join(stage['actions'])}: {status}")
+
+    return EXIT_OK if ok else EXIT_ACTION_FAILED
+
+
+def main(argv=None):
+    return run(sys.argv[1:] if argv is None else argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
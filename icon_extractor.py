@@ -6,49 +6,78 @@ from PIL import Image
 import io
 import base64
 
+
 def get_icon_base64(exe_path):
     """
     Extracts the icon from an executable and returns it as a base64 encoded PNG string.
     Returns None if extraction fails.
+
+    Every icon, DC and bitmap handle is released, also when extraction fails
+    halfway, since this runs for every new executable in the process list.
     """
+    large, small = [], []
+    screen_dc = None
+    hdc = mem_dc = hbmp = None
     try:
         # Get the large icon handle
         large, small = win32gui.ExtractIconEx(exe_path, 0)
-        
+
         if not large:
             return None
-            
+
         hIcon = large[0]
-        
+
         # Create a device context
-        hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
+        screen_dc = win32gui.GetDC(0)
+        hdc = win32ui.CreateDCFromHandle(screen_dc)
         hbmp = win32ui.CreateBitmap()
         hbmp.CreateCompatibleBitmap(hdc, 32, 32)
-        hdc = hdc.CreateCompatibleDC()
-        
-        hdc.SelectObject(hbmp)
-        
+        mem_dc = hdc.CreateCompatibleDC()
+
+        mem_dc.SelectObject(hbmp)
+
         # Draw the icon
-        hdc.DrawIcon((0, 0), hIcon)
-        
+        mem_dc.DrawIcon((0, 0), hIcon)
+
         # Convert to PIL Image
         bmpinfo = hbmp.GetInfo()
         bmpstr = hbmp.GetBitmapBits(True)
         img = Image.frombuffer(
-            'RGBA',
-            (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-            bmpstr, 'raw', 'BGRA', 0, 1
+            "RGBA",
+            (bmpinfo["bmWidth"], bmpinfo["bmHeight"]),
+            bmpstr,
+            "raw",
+            "BGRA",
+            0,
+            1,
         )
-        
-        # Clean up
-        win32gui.DestroyIcon(hIcon)
-        win32gui.DestroyIcon(small[0]) if small else None
-        
+
         # Convert to base64
         buffer = io.BytesIO()
         img.save(buffer, format="PNG")
-        return base64.b64encode(buffer.getvalue()).decode('utf-8')
-        
+        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
     except Exception as e:
         # print(f"Error extracting icon from {exe_path}: {e}")
         return None
+
+    finally:
+        # Clean up
+        for handle in list(large) + list(small):
+            _release(win32gui.DestroyIcon, handle)
+        if mem_dc is not None:
+            _release(mem_dc.DeleteDC)
+        if hbmp is not None:
+            _release(win32gui.DeleteObject, hbmp.GetHandle())
+        if hdc is not None:
+            # Wraps the screen DC, which is returned with ReleaseDC below
+            _release(hdc.Detach)
+        if screen_dc is not None:
+            _release(win32gui.ReleaseDC, 0, screen_dc)
+
+
+def _release(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        pass
@@ -0,0 +1,155 @@
+"""
+Import-time report for the modules the GUI loads before its first paint.
+
+Runs a fresh interpreter with `-X importtime`, so the numbers reflect a cold
+start of this code base (with warm .pyc files). Usage:
+
+    python import_report.py [--top N]
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# What main.main() imports before the window is painted
+STARTUP_MODULES = [
+    "main",
+    "flet",
+    "views.home_view",
+    "views.settings_view",
+    "services.timer_service",
+]
+
+# Heavy or platform-specific modules that must only load on first use
+DEFERRED_MODULES = [
+    "PIL",
+    "psutil",
+    "pystray",
+    "win32api",
+    "win32con",
+    "win32gui",
+    "win32ui",
+    "icon_extractor",
+    "services.tray_service",
+    "services.tray_icons",
+]
+
+# Top-level names of this repository's own modules
+APP_PACKAGES = {
+    "main",
+    "state",
+    "process_manager",
+    "icon_extractor",
+    "import_report",
+    "load_harness",
+    "views",
+    "services",
+    "backends",
+}
+
+# Budgets in milliseconds. "app" is the self time of this repository's own
+# modules, "total" includes flet and everything else loaded before first paint.
+# Measured at about 10-20 ms and 500-670 ms; the margin only covers noise.
+BUDGET_MS = {"app": 25, "total": 800}
+
+
+def parse(output):
+    """
+    Parses `-X importtime` output.
+
+    Returns:
+        list: Dicts with 'name', 'self_us', 'cumulative_us' and 'depth'.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            depth = (len(name) - len(name.lstrip())) // 2
+            entries.append(
+                {
+                    "name": name.strip(),
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": depth,
+                }
+            )
+        except ValueError:
+            continue
+    return entries
+
+
+def measure(modules=None):
+    """
+    Imports the given modules in a fresh interpreter and returns parsed entries.
+    """
+    modules = modules or STARTUP_MODULES
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse(result.stderr)
+
+
+def summarize(entries):
+    """
+    Returns:
+        dict: {'total_ms', 'app_ms', 'loaded' (set of module names)}
+    """
+    total_us = sum(entry["self_us"] for entry in entries)
+    app_us = sum(
+        entry["self_us"]
+        for entry in entries
+        if entry["name"].split(".")[0] in APP_PACKAGES
+    )
+    return {
+        "total_ms": total_us / 1000,
+        "app_ms": app_us / 1000,
+        "loaded": {entry["name"] for entry in entries},
+    }
+
+
+def deferred_loaded(entries):
+    """
+    Returns the deferred modules (or their submodules) that were imported.
+    """
+    loaded = {entry["name"] for entry in entries}
+    return sorted(
+        name
+        for name in loaded
+        if any(
+            name == module or name.startswith(module + ".")
+            for module in DEFERRED_MODULES
+        )
+    )
+
+
+def main():
+    top = 15
+    if "--top" in sys.argv:
+        top = int(sys.argv[sys.argv.index("--top") + 1])
+
+    entries = measure()
+    summary = summarize(entries)
+    print(f"Total: {summary['total_ms']:.1f} ms (budget {BUDGET_MS['total']} ms)")
+    print(f"App:   {summary['app_ms']:.1f} ms (budget {BUDGET_MS['app']} ms)")
+
+    deferred = deferred_loaded(entries)
+    if deferred:
+        print("Deferred modules loaded at startup: " + ", ".join(deferred))
+
+    print(f"\nTop {top} by cumulative time:")
+    for entry in sorted(entries, key=lambda e: e["cumulative_us"], reverse=True)[:top]:
+        print(f"{entry['cumulative_us'] / 1000:9.1f} ms  {entry['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Headless load test for the process list.
+
+Mounts ProcessSelector (or the whole HomeView) on a Flet page whose
+connection only records what would be sent, feeds it a synthetic process
+table through FakeProcessBackend and replays scripted interactions. For each
+one it reports the time taken, the bytes of update payload and the number of
+controls on the page, and checks them against BUDGETS. Usage:
+
+    python load_harness.py [--groups N] [--view selector|home]
+"""
+
+import json
+import sys
+import time
+import flet as ft
+
+# Private flet API, used only by the adapter block below
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import (
+    ClientActions,
+    ClientMessage,
+    CommandEncoder,
+    PageCommandsBatchResponsePayload,
+)
+import process_manager
+from backends.icons import NullIconBackend, get_icon_backend, set_icon_backend
+from backends.processes import (
+    FakeProcessBackend,
+    get_process_backend,
+    set_process_backend,
+)
+from views.render_batcher import render_batcher
+
+DEFAULT_GROUPS = 20000
+
+# Per interaction: most milliseconds, bytes sent and controls on the page.
+# The byte and control budgets do not grow with the number of groups, the
+# list only ever holds MAX_ROWS rows.
+BUDGETS = {
+    "mount": {"ms": 1000, "bytes": 80_000, "controls": 700},
+    "type_query": {"ms": 300, "bytes": 120_000, "controls": 700},
+    "select_200": {"ms": 200, "bytes": 20_000, "controls": 700},
+    "refresh_filtered": {"ms": 1000, "bytes": 80_000, "controls": 700},
+    "cmdline_query": {"ms": 1500, "bytes": 120_000, "controls": 700},
+}
+
+# Names are built from these, so searches match realistic slices of the table
+NAME_STEMS = ["chrome", "python", "node", "java", "svchost", "helper", "updater"]
+
+QUERY = "node-012"
+
+
+# ---------------------------------------------------------------------------
+# Adapter over private flet API (checked against flet 0.28).
+#
+# A page without a client needs flet internals: the connection base class,
+# the protocol messages and the Page constructor. They are imported at the
+# top and used here and nowhere else, so a flet upgrade only needs those
+# imports and this block looked at.
+# ---------------------------------------------------------------------------
+
+
+class RecordingConnection(LocalConnection):
+    """
+    A connection without a client. Commands are turned into the messages
+    the socket server would send, and their JSON size is added up.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bytes_sent = 0
+        self.updates = 0
+
+    def send_commands(self, session_id, commands):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ("add", "get"):
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            batch = ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages)
+            self.bytes_sent += len(
+                json.dumps(batch, cls=CommandEncoder, separators=(",", ":"))
+            )
+            self.updates += 1
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def send_command(self, session_id, command):
+        return self.send_commands(session_id, [command])
+
+
+def recording_page():
+    """
+    Returns:
+        tuple: (ft.Page, RecordingConnection) with nothing on the other end.
+    """
+    conn = RecordingConnection()
+    return ft.Page(conn, "load-harness", loop=None), conn
+
+
+# ------------------------- end of the flet adapter -------------------------
+
+
+def synthetic_backend(groups, processes_per_group=2):
+    """
+    Returns a FakeProcessBackend with `groups` differently named programs.
+    """
+    backend = FakeProcessBackend()
+    for i in range(groups):
+        name = f"{NAME_STEMS[i % len(NAME_STEMS)]}-{i:05d}.exe"
+        backend.spawn(
+            name,
+            exe=f"C:\\Apps\\{name}",
+            count=processes_per_group,
+            cmdline=[name, f"--port={i}"],
+        )
+    return backend
+
+
+class LoadHarness:
+    def __init__(self, groups=DEFAULT_GROUPS, view="selector"):
+        """
+        Args:
+            groups (int): Number of process groups in the synthetic table.
+            view (str): "selector" mounts ProcessSelector alone, "home" the
+                whole HomeView.
+        """
+        self.groups = groups
+        self.view_name = view
+        self.backend = synthetic_backend(groups)
+        self.page, self.conn = recording_page()
+        self.view = None
+        self.selector = None
+        self.results = []
+        self._saved = None
+
+    def __enter__(self):
+        self._saved = (
+            get_process_backend(),
+            get_icon_backend(),
+            process_manager.IconCache._cache,
+            process_manager.CmdlineCache._cache,
+        )
+        set_process_backend(self.backend)
+        # Icon extraction is not what is measured
+        set_icon_backend(NullIconBackend())
+        process_manager.IconCache._cache = {}
+        process_manager.CmdlineCache._cache = {}
+        return self
+
+    def __exit__(self, *exc):
+        process_backend, icon_backend, icons, cmdlines = self._saved
+        set_process_backend(process_backend)
+        set_icon_backend(icon_backend)
+        process_manager.IconCache._cache = icons
+        process_manager.CmdlineCache._cache = cmdlines
+
+    def measure(self, name, func):
+        """
+        Runs one interaction and records what it cost, including UI changes
+        the render batcher held back for its frame-rate cap.
+        """
+        bytes_before = self.conn.bytes_sent
+        updates_before = self.conn.updates
+        start = time.perf_counter()
+        func()
+        render_batcher.flush()
+        result = {
+            "name": name,
+            "ms": (time.perf_counter() - start) * 1000,
+            "bytes": self.conn.bytes_sent - bytes_before,
+            "updates": self.conn.updates - updates_before,
+            "controls": len(self.page.index),
+        }
+        self.results.append(result)
+        return result
+
+    def mount(self):
+        if self.view_name == "home":
+            from views.home_view import HomeView
+
+            self.view = HomeView()
+            self.selector = self.view.process_selector
+            # Not the selection saved on this machine
+            self.selector.restore_selection([])
+            self.page.add(self.view)
+            self.view.refresh_thread.join()
+        else:
+            from views.components.process_selector import ProcessSelector
+
+            self.view = self.selector = ProcessSelector()
+            self.page.add(self.view)
+            self.selector.refresh_processes()
+
+    def type_query(self, query=QUERY):
+        # One search per keystroke, as the text field's on_change does
+        for i in range(1, len(query) + 1):
+            self.selector.search_field.value = query[:i]
+            self.selector.filter_processes(query[:i])
+
+    def clear_query(self):
+        self.selector.search_field.value = ""
+        self.selector.filter_processes("")
+
+    def select(self, count=200):
+        for group in self.selector.all_processes[:count]:
+            self.selector.select_process(group)
+
+    def churn(self, fraction=0.01):
+        """
+        Starts and ends about `fraction` of the groups, so the next refresh
+        has something to show.
+        """
+        count = max(1, int(self.groups * fraction))
+        for pid in list(self.backend.processes)[:count]:
+            self.backend.terminate(pid)
+        for i in range(count):
+            name = f"new-{i:05d}.exe"
+            self.backend.spawn(name, exe=f"C:\\Apps\\{name}")
+
+    def refresh_filtered(self):
+        self.selector.search_field.value = QUERY[:5]
+        self.selector.filter_processes(QUERY[:5])
+        self.churn()
+        self.selector.refresh_processes()
+
+    def cmdline_query(self, query="--port"):
+        # The first keystroke reads every command line, the others none
+        self.clear_query()
+        self.selector.set_cmdline_search(True)
+        self.type_query(query)
+
+    def run(self):
+        """
+        Replays the script and returns the results.
+        """
+        self.measure("mount", self.mount)
+        self.measure("type_query", self.type_query)
+        self.clear_query()
+        self.measure("select_200", self.select)
+        self.measure("refresh_filtered", self.refresh_filtered)
+        self.measure("cmdline_query", self.cmdline_query)
+        return self.results
+
+
+def check(results, budgets=None, keys=None):
+    """
+    Returns a message for every measurement over its budget.
+
+    Args:
+        keys (iterable): Only check these measurements, e.g. ("bytes",
+            "controls") in unit tests, where wall-clock times are too noisy.
+    """
+    budgets = budgets or BUDGETS
+    problems = []
+    for result in results:
+        budget = budgets.get(result["name"], {})
+        for key, limit in budget.items():
+            if keys is not None and key not in keys:
+                continue
+            if result[key] > limit:
+                problems.append(
+                    f"{result['name']}: {key} {result[key]:.0f} over budget {limit}"
+                )
+    return problems
+
+
+def main():
+    groups = DEFAULT_GROUPS
+    view = "selector"
+    if "--groups" in sys.argv:
+        groups = int(sys.argv[sys.argv.index("--groups") + 1])
+    if "--view" in sys.argv:
+        view = sys.argv[sys.argv.index("--view") + 1]
+
+    with LoadHarness(groups, view) as harness:
+        results = harness.run()
+
+    print(f"{groups} groups, {view} view")
+    print(f"{'interaction':<18} {'ms':>8} {'bytes':>9} {'updates':>8} {'controls':>9}")
+    for r in results:
+        print(
+            f"{r['name']:<18} {r['ms']:>8.1f} {r['bytes']:>9} "
+            f"{r['updates']:>8} {r['controls']:>9}"
+        )
+
+    problems = check(results)
+    for problem in problems:
+        print(f"OVER BUDGET {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
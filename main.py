@@ -1,18 +1,39 @@
-import flet as ft
-from views.home_view import HomeView
-from views.settings_view import SettingsView
-from state import app_state
-from services.timer_service import TimerService
-from services.tray_service import TrayService
+import atexit
+import sys
 import threading
-import time
+from state import app_state
+from services.profiler import profiler
+
+# Seconds between fallback checks for a minimized window
+MINIMIZE_CHECK_INTERVAL = 2.0
+
+# Control commands from the launch arguments, run once the app is up
+launch_commands = []
+
 
+@profiler.section("startup")
+def main(page):
+    # UI modules are imported here rather than at module level, so importing
+    # main (e.g. for the import-time report) does not load flet.
+    import flet as ft
+    from views.home_view import HomeView
+    from views.settings_view import SettingsView
+    from views.schedules_view import SchedulesView
+    from services.timer_service import TimerService
+    from services.settings_store import settings
+    from services.scheduler import scheduler
+    from services.telemetry import telemetry
+
+    # Saved settings are applied before anything is drawn
+    settings.load().bind(app_state)
+    atexit.register(settings.flush)
+    telemetry.enabled = telemetry.enabled or settings.get("telemetry", False)
+    scheduler.load(settings)
 
-def main(page: ft.Page):
     app_state.set_page(page)
 
     page.title = "Time to Sleep"
-    page.theme_mode = ft.ThemeMode.DARK
+    page.theme_mode = ft.ThemeMode.DARK if app_state.dark_mode else ft.ThemeMode.LIGHT
     page.padding = 0
     page.window.width = 500
     page.window.height = 750
@@ -23,46 +44,137 @@ def main(page: ft.Page):
     if not app_state.timer_service:
         app_state.timer_service = TimerService()
 
-    tray_service = TrayService()
-    tray_service.run_detached()
-
-    # Window Event Handler (Minimize Polling because event is unreliable)
-    def minimize_watcher():
-        while True:
-            try:
-                if page.window.minimized and app_state.minimize_to_tray:
-                    # Only hide logic if tray is actually running
-                    if tray_service.is_active():
-                        page.window.visible = False
-                        page.update()
-                    # If tray failed, standard minimize happens (window stays in taskbar, just minimized)
-            except Exception:
-                pass
-            time.sleep(0.3)
-
-    threading.Thread(target=minimize_watcher, daemon=True).start()
-
     # Views
     home_view = HomeView()
+    schedules_view = SchedulesView()
     settings_view = SettingsView()
 
     def on_nav_change(e):
         index = e.control.selected_index
         home_view.visible = index == 0
-        settings_view.visible = index == 1
+        schedules_view.visible = index == 1
+        settings_view.visible = index == 2
         page.update()
 
     page.navigation_bar = ft.NavigationBar(
         destinations=[
             ft.NavigationBarDestination(icon="home", label="Home"),
+            ft.NavigationBarDestination(icon="event_repeat", label="Schedules"),
             ft.NavigationBarDestination(icon="settings", label="Settings"),
         ],
         on_change=on_nav_change,
     )
 
     # Layout Assembly
-    page.add(ft.Column([home_view, settings_view], expand=True))
+    page.add(ft.Column([home_view, schedules_view, settings_view], expand=True))
 
+    # The tray pulls in pystray and PIL, so it starts after the first paint
+    threading.Thread(
+        target=start_background_services, args=(page,), daemon=True
+    ).start()
+
+
+def start_background_services(page):
+    handler = start_control_server()
+    for command in launch_commands:
+        reply = handler.handle(command)
+        if not reply["ok"]:
+            print(f"Launch argument failed: {reply['error']}")
+
+    try:
+        from services.tray_service import TrayService
+    except Exception as e:
+        # pystray raises more than ImportError when no tray is available
+        print(f"System tray unavailable: {e}")
+        return
+
+    tray_service = TrayService()
+    tray_service.run_detached()
+
+    watch_minimize(page, tray_service)
+
+
+def watch_minimize(page, tray_service):
+    import flet as ft
+    from services.housekeeping import housekeeper
+
+    def hide_to_tray(minimized):
+        try:
+            if minimized and app_state.minimize_to_tray:
+                # Only hide logic if tray is actually running
+                if tray_service.is_active():
+                    page.window.visible = False
+                    page.update()
+                # If tray failed, standard minimize happens (window stays in taskbar, just minimized)
+        except Exception:
+            pass
+
+    def on_window_event(e):
+        if e.type == ft.WindowEventType.MINIMIZE:
+            hide_to_tray(True)
+
+    page.window.on_event = on_window_event
+    page.update()
+
+    # The minimize event is not delivered on every platform, so a slow check
+    # on the shared housekeeping thread catches the rest.
+    housekeeper.call_every(
+        MINIMIZE_CHECK_INTERVAL,
+        lambda: hide_to_tray(page.window.minimized),
+        name="minimize check",
+    )
+
+
+def start_control_server():
+    from services.control_server import ControlHandler, ControlServer
+
+    handler = ControlHandler(app_state.timer_service, state=app_state)
+    # Used by later launches to bring this window up
+    handler.register("app.show", lambda args: app_state.show_window())
+
+    server = ControlServer(handler)
+    try:
+        server.start()
+    except OSError as e:
+        print(f"Control API unavailable: {e}")
+        return handler
+    app_state.control_server = server
+    return handler
+
+
+def run_gui():
+    import flet as ft
 
-if __name__ == "__main__":
     ft.app(target=main, assets_dir="assets")
+
+
+if __name__ == "__main__":
+    # Stopping writes the profile, also when the app exits mid-window
+    atexit.register(profiler.stop)
+
+    if "--headless" in sys.argv[1:]:
+        # Headless mode never imports flet or pystray
+        import headless
+
+        profiler.start_from_env()
+        sys.exit(headless.main())
+
+    import single_instance
+
+    options = single_instance.build_parser().parse_args(sys.argv[1:])
+    launch_commands = single_instance.launch_commands(sys.argv[1:])
+    instance_lock = single_instance.InstanceLock()
+    if not instance_lock.acquire():
+        # Already running: pass the arguments on and exit before loading flet
+        sys.exit(
+            single_instance.hand_off(launch_commands, lock_path=instance_lock.path)
+        )
+    # app.show is only meaningful for later launches
+    launch_commands = launch_commands[1:]
+
+    # Started before flet is imported, so the profile covers startup
+    if options.profile:
+        profiler.start(options.profile, options.profile_seconds)
+    else:
+        profiler.start_from_env()
+    run_gui()
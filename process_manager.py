@@ -1,48 +1,436 @@
-import psutil
 import os
-import icon_extractor
+import sys
+from array import array
+from backends.icons import extract_icon
+from backends.processes import get_process_backend
+from backends.system import get_system_backend
+from services.icon_pool import IconPool
+from services.telemetry import telemetry
+
+# Ways of putting processes into groups, with their labels
+GROUPINGS = {
+    "name": "Process Name",
+    "exe": "Executable Path",
+    "app": "Application",
+}
+
+# Programs that start applications rather than belong to one. Grouping by
+# application climbs the process tree up to, and not including, these.
+LAUNCHERS = frozenset(
+    {
+        "explorer.exe",
+        "services.exe",
+        "svchost.exe",
+        "wininit.exe",
+        "winlogon.exe",
+        "userinit.exe",
+        "sihost.exe",
+        "cmd.exe",
+        "powershell.exe",
+        "pwsh.exe",
+        "windowsterminal.exe",
+        "openconsole.exe",
+        "conhost.exe",
+        "init",
+        "systemd",
+        "launchd",
+        "login",
+        "sshd",
+        "sh",
+        "bash",
+        "zsh",
+        "fish",
+        "tmux: server",
+        "screen",
+        "gnome-shell",
+        "plasmashell",
+        "kwin_x11",
+        "kwin_wayland",
+        "gnome-terminal-server",
+        "konsole",
+        "xterm",
+    }
+)
 
 
 class IconCache:
     _cache = {}
+    _pool = None
+
+    @classmethod
+    def pool(cls):
+        """
+        Returns the shared IconPool, created on first use. Extraction runs in
+        child processes when TIMETOSLEEP_ICON_ISOLATION=1.
+        """
+        if cls._pool is None:
+            cls._pool = IconPool(
+                extract_icon,
+                isolate=os.environ.get("TIMETOSLEEP_ICON_ISOLATION") == "1",
+            )
+        return cls._pool
 
     @classmethod
     def get_icon(cls, exe_path):
         if exe_path not in cls._cache:
-            cls._cache[exe_path] = icon_extractor.get_icon_base64(exe_path)
+            telemetry.count("icons.cache_miss")
+            cls._cache[exe_path] = cls.pool().submit(exe_path).result()
         return cls._cache[exe_path]
 
+    @classmethod
+    def fetch_many(cls, exe_paths):
+        """
+        Yields (path, icon) for every path: cached ones first, then the
+        others as the workers finish them.
+        """
+        missing = []
+        for exe_path in dict.fromkeys(exe_paths):
+            if exe_path in cls._cache:
+                yield exe_path, cls._cache[exe_path]
+            else:
+                missing.append(exe_path)
+        if missing:
+            telemetry.count("icons.cache_miss", len(missing))
+        for exe_path, icon in cls.pool().extract_many(missing):
+            cls._cache[exe_path] = icon
+            yield exe_path, icon
+
+    @classmethod
+    def fetch_async(cls, exe_paths, callback):
+        """
+        Calls callback(path, icon) for every path without waiting: right away
+        for cached ones, from a worker thread as the others finish.
+        """
+        for exe_path in dict.fromkeys(exe_paths):
+            if exe_path in cls._cache:
+                callback(exe_path, cls._cache[exe_path])
+                continue
+            telemetry.count("icons.cache_miss")
+            cls.pool().submit(exe_path).add_done_callback(
+                lambda future, p=exe_path: cls._store(p, future.result(), callback)
+            )
+
+    @classmethod
+    def _store(cls, exe_path, icon, callback):
+        cls._cache[exe_path] = icon
+        callback(exe_path, icon)
+
+    @classmethod
+    def peek(cls, exe_path):
+        """
+        Returns the cached icon for a path, without extracting it.
+        """
+        return cls._cache.get(exe_path)
+
+
+class CmdlineCache:
+    """
+    Command lines of running processes, read only when a search or a
+    selection needs them.
+
+    Entries are keyed by (pid, create_time), so a PID reused by a new process
+    is read again instead of matching the old command line. Every enumeration
+    notes the start times and drops the entries of processes that are gone,
+    so a refresh only costs reads for processes that started since.
+    """
+
+    _cache = {}
+    _started = {}
+
+    @classmethod
+    def observe(cls, infos):
+        started = {info["pid"]: info.get("create_time") for info in infos}
+        cls._started = started
+        cls._cache = {
+            key: line
+            for key, line in cls._cache.items()
+            if started.get(key[0]) == key[1]
+        }
+
+    @classmethod
+    def get(cls, pid):
+        """
+        Returns the lowercased command line of a process, "" if it cannot be
+        read.
+        """
+        key = (pid, cls._started.get(pid))
+        line = cls._cache.get(key)
+        if line is None:
+            telemetry.count("cmdlines.read")
+            args = get_process_backend().cmdline(pid)
+            line = " ".join(args).lower() if args else ""
+            cls._cache[key] = line
+        return line
+
+    @classmethod
+    def matching(cls, pids, query):
+        """
+        Returns the PIDs whose command line contains the lowercase query.
+        """
+        return [pid for pid in pids if query in cls.get(pid)]
+
+
+class ProcessGroup:
+    """
+    The running processes that share a name, an executable or a top-level
+    application, depending on the grouping. `key` identifies the group
+    within its grouping: the name, the executable path, or the path of the
+    application's top process. A group picked by a command line search has
+    `match` set and only holds the processes whose command line contains it.
+    `started` holds the start time the enumeration saw for each PID, in the
+    same order, so a PID reused since can be told apart; it is None for
+    groups not built from an enumeration.
+
+    Large process tables are kept for the life of the selector, so a group
+    uses __slots__, keeps its PIDs in an unsigned int array rather than a list
+    of int objects and interns its name, which recurs on every refresh. The
+    icon is not embedded: `icon` looks the base64 string up in IconCache.
+    """
+
+    __slots__ = ("name", "pids", "started", "path", "key", "grouping", "match")
+
+    def __init__(
+        self, name, pids=(), path="", key=None, grouping="name", match="", started=()
+    ):
+        self.name = sys.intern(name)
+        self.pids = array("I", pids)
+        self.started = array("d", started) if started else None
+        self.path = path
+        self.key = self.name if key is None else key
+        self.grouping = grouping
+        self.match = match
+
+    @property
+    def id(self):
+        """
+        Identifies the selection: the key, plus the command line match.
+        """
+        return f"{self.key}\n{self.match}" if self.match else self.key
+
+    @property
+    def label(self):
+        return f"{self.name} ({self.match})" if self.match else self.name
+
+    def add(self, pid, create_time=None):
+        """
+        Appends a process with the start time the enumeration saw, 0 if the
+        backend did not report one.
+        """
+        if self.started is None:
+            self.started = array("d", [0.0] * len(self.pids))
+        self.pids.append(pid)
+        self.started.append(create_time or 0.0)
+
+    def start_times(self):
+        """
+        Returns:
+            dict: PID to the start time seen by the enumeration, empty if
+                the group was not built from one.
+        """
+        if self.started is None or len(self.started) != len(self.pids):
+            return {}
+        return {pid: t for pid, t in zip(self.pids, self.started) if t}
+
+    def narrowed(self, match):
+        """
+        Returns a copy holding only the processes whose command line contains
+        `match` (lowercase).
+        """
+        pids = CmdlineCache.matching(self.pids, match)
+        times = self.start_times()
+        return ProcessGroup(
+            self.name,
+            pids,
+            self.path,
+            self.key,
+            self.grouping,
+            match,
+            [times.get(pid, 0.0) for pid in pids] if times else (),
+        )
+
+    @property
+    def icon(self):
+        return IconCache.peek(self.path) if self.path else None
 
-def get_running_processes(show_all=False):
+    def to_dict(self, with_icon=True):
+        """
+        Returns the group as a JSON-friendly dict, e.g. for the control API.
+        """
+        result = {
+            "name": self.name,
+            "key": self.key,
+            "pids": self.pids.tolist(),
+            "path": self.path,
+        }
+        if self.match:
+            result["match"] = self.match
+        if with_icon:
+            result["icon"] = self.icon
+        return result
+
+    def __repr__(self):
+        return f"ProcessGroup({self.name!r}, pids={self.pids.tolist()!r})"
+
+
+def app_roots(table):
+    """
+    Maps every PID to the top process of its application: the highest
+    ancestor reached without passing a launcher, a process without an
+    executable or a parent that is gone.
+
+    Args:
+        table (dict): PID to process info with 'name', 'exe' and 'ppid', from
+            a single enumeration. Parents are looked up here, never queried.
     """
-    Retrieves a list of running processes grouped by name.
-    Returns a list of dicts: {'name': str, 'pids': list[int], 'path': str, 'icon': str}
+    roots = {}
+    for pid in table:
+        chain = []
+        seen = set()
+        current = pid
+        while current not in roots:
+            chain.append(current)
+            seen.add(current)
+            parent = table.get(table[current].get("ppid"))
+            if (
+                parent is None
+                or parent["pid"] in seen
+                or not parent["exe"]
+                or parent["name"].lower() in LAUNCHERS
+            ):
+                roots[current] = current
+                break
+            current = parent["pid"]
+        root = roots[current]
+        for member in chain:
+            roots[member] = root
+    return roots
+
+
+def group_processes(infos, grouping="name", show_all=False):
+    """
+    Groups process infos from the backend.
+
+    Args:
+        infos (iterable): Dicts with 'pid', 'name', 'exe' and 'ppid'.
+        grouping (str): One of GROUPINGS.
+        show_all (bool): Also group processes without an executable path
+            (mostly system processes). With "app", the top process decides.
+
+    Returns:
+        list: ProcessGroups sorted by name.
     """
+    if grouping not in GROUPINGS:
+        raise ValueError(f"Unknown grouping: {grouping}")
+    if grouping == "app":
+        table = {info["pid"]: info for info in infos}
+        roots = app_roots(table)
+        infos = table.values()
+
     process_groups = {}
-    for proc in psutil.process_iter(["pid", "name", "exe"]):
-        try:
-            # If show_all is False, we only show processes with an executable path (usually user apps)
-            if show_all or proc.info["exe"]:
-                name = proc.info["name"]
-                if name not in process_groups:
-                    # Try to get icon if exe exists
-                    icon_b64 = None
-                    exe_path = proc.info["exe"] or ""
-                    if exe_path:
-                        icon_b64 = IconCache.get_icon(exe_path)
-
-                    process_groups[name] = {
-                        "name": name,
-                        "pids": [],
-                        "path": exe_path,
-                        "icon": icon_b64,
-                    }
-                process_groups[name]["pids"].append(proc.info["pid"])
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+    # Top processes already in their group, several may share one
+    added_roots = set()
+    for info in infos:
+        pid = info["pid"]
+        head = table[roots[pid]] if grouping == "app" else info
+        # If show_all is False, we only show processes with an executable path (usually user apps)
+        if not (show_all or head["exe"]):
+            continue
+        key = head["name"] if grouping == "name" else head["exe"] or head["name"]
+        group = process_groups.get(key)
+        if group is None:
+            group = ProcessGroup(
+                head["name"], path=head["exe"] or "", key=key, grouping=grouping
+            )
+            process_groups[key] = group
+        if grouping == "app":
+            # Each top process before its children, so it is terminated first
+            if head["pid"] not in added_roots:
+                added_roots.add(head["pid"])
+                group.add(head["pid"], head.get("create_time"))
+            if head is info:
+                continue
+        group.add(pid, info.get("create_time"))
+
+    return sorted(process_groups.values(), key=lambda x: (x.name.lower(), x.key))
+
+
+def enumerate_processes():
+    """
+    Lists the process infos from the backend in one pass, and notes their
+    start times for CmdlineCache.
+    """
+    infos = list(get_process_backend().iter_processes())
+    CmdlineCache.observe(infos)
+    return infos
+
+
+@telemetry.timed("processes.list")
+def get_running_processes(show_all=False, with_icons=True, grouping="name"):
+    """
+    Retrieves the running processes grouped by name (or by executable path
+    or application, see GROUPINGS), sorted by name.
+    Icons are not extracted when with_icons is False, e.g. in headless mode.
+    Returns a list of ProcessGroup.
+    """
+    groups = group_processes(enumerate_processes(), grouping, show_all)
+
+    if with_icons:
+        # Extracted in parallel, a slow executable only costs its timeout
+        paths = [group.path for group in groups if group.path]
+        for _ in IconCache.fetch_many(paths):
             pass
 
-    # Convert to list and sort
-    return sorted(process_groups.values(), key=lambda x: x["name"].lower())
+    return groups
+
+
+def current_groups(groups):
+    """
+    Looks groups up again in the running processes, each under the grouping
+    it was made with and narrowed by its command line match, so processes
+    started since it was picked are included and ones that exited are not.
+
+    Returns:
+        list: A current ProcessGroup for every given group, in order, with
+            no PIDs if nothing in it runs any more.
+    """
+    infos = enumerate_processes()
+    by_grouping = {}
+    result = []
+    for group in groups:
+        if group.grouping not in by_grouping:
+            by_grouping[group.grouping] = {
+                g.key: g for g in group_processes(infos, group.grouping, True)
+            }
+        current = by_grouping[group.grouping].get(group.key)
+        if current is None:
+            current = ProcessGroup(
+                group.name, path=group.path, key=group.key, grouping=group.grouping
+            )
+        if group.match:
+            current = current.narrowed(group.match)
+        result.append(current)
+    return result
+
+
+def normalize_process_name(name):
+    name = name.strip().lower()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+def find_process_groups(names, process_groups):
+    """
+    Picks the process groups whose name matches one of the given names,
+    ignoring case and a trailing ".exe".
+    Returns a tuple: (matched groups, names that matched nothing)
+    """
+    wanted = {normalize_process_name(name) for name in names if name.strip()}
+    matched = [
+        group
+        for group in process_groups
+        if normalize_process_name(group.name) in wanted
+    ]
+    found = {normalize_process_name(group.name) for group in matched}
+    return matched, sorted(wanted - found)
 
 
 def kill_processes(pids):
@@ -50,32 +438,34 @@ def kill_processes(pids):
     Terminates a list of processes by their PIDs.
     Returns True if at least one process was terminated successfully.
     """
+    backend = get_process_backend()
     success_count = 0
     for pid in pids:
-        try:
-            process = psutil.Process(pid)
-            process.terminate()
+        if backend.terminate(pid):
             success_count += 1
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
-            print(f"Error killing process {pid}: {e}")
 
     return success_count > 0
 
 
+def wait_for_exit(pids, timeout):
+    """
+    Waits until all processes in a list of PIDs have exited.
+    Returns True if they all exited within the timeout.
+    """
+    return get_process_backend().wait_for_exit(pids, timeout)
+
+
 def shutdown_system():
-    os.system("shutdown /s /t 1")
+    get_system_backend().shutdown()
 
 
 def restart_system():
-    os.system("shutdown /r /t 1")
+    get_system_backend().restart()
 
 
 def lock_system():
-    import ctypes
-
-    ctypes.windll.user32.LockWorkStation()
+    get_system_backend().lock()
 
 
 def sleep_system():
-    # Helper to enable hibernation if needed, but for sleep we specifically want suspend
-    os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+    get_system_backend().sleep()
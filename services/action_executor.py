@@ -1,15 +1,231 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import process_manager
+from services.clock import system_clock
+from services.telemetry import telemetry
+
+# Actions that can be used as pipeline steps, in addition to the system actions
+PIPELINE_ACTIONS = [
+    "Terminate Process",
+    "Wait For Exit",
+    "Shutdown",
+    "Restart",
+    "Lock",
+    "Sleep",
+]
+
+# Steps that act on the selected processes, looked up again when they run
+PROCESS_STEPS = frozenset({"Terminate Process", "Wait For Exit"})
+
+# Dedicated workers so actions never run on the timer thread or the UI thread.
+# More than one, so an action stuck past its timeout does not block the next.
+_action_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="action")
+
+# Shared by the branches of all pipeline stages. Bounded, so a pipeline that
+# terminates hundreds of groups, or branches stuck past their stage timeout,
+# cannot pile up threads; extra branches queue for a free worker.
+_stage_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="stage")
+
+
+class ActionHandle:
+    """
+    Tracks an action submitted with ActionExecutor.submit(): its progress,
+    completion, cancellation and timeout.
+
+    Cancellation is cooperative. The action stops at its next checkpoint
+    (between process groups or pipeline stages), but the handle resolves
+    immediately, so nothing waiting on it is held up.
+    """
+
+    def __init__(self, action):
+        self.action = action
+        self.progress = 0.0
+        self.progress_message = ""
+        self.cancel_event = threading.Event()
+        self._future = Future()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._timeout_timer = None
+        self._progress_listeners = []
+
+    def add_progress_listener(self, callback):
+        if callback not in self._progress_listeners:
+            self._progress_listeners.append(callback)
+
+    def remove_progress_listener(self, callback):
+        if callback in self._progress_listeners:
+            self._progress_listeners.remove(callback)
+
+    def add_done_callback(self, callback):
+        """
+        Calls `callback(result)` once the action completes, is cancelled or
+        times out. Runs immediately if the handle is already done.
+        """
+
+        def on_done(future):
+            try:
+                callback(future.result())
+            except Exception as e:
+                print(f"Error in action done callback: {e}")
+
+        self._future.add_done_callback(on_done)
+
+    def report_progress(self, fraction, message=""):
+        self.progress = fraction
+        self.progress_message = message
+        for listener in self._progress_listeners:
+            try:
+                listener(fraction, message)
+            except Exception as e:
+                print(f"Error in progress listener: {e}")
+
+    def cancel(self):
+        """
+        Cancels the action. Returns False if it had already finished.
+        """
+        self.cancel_event.set()
+        if self._worker:
+            self._worker.cancel()
+        return self.resolve(
+            {"success": False, "message": "Action cancelled.", "cancelled": True}
+        )
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def done(self):
+        return self._future.done()
+
+    def result(self, timeout=None):
+        """
+        Blocks until the action is done and returns its result dict.
+        """
+        return self._future.result(timeout)
+
+    def resolve(self, result):
+        with self._lock:
+            if self._future.done():
+                return False
+            self._future.set_result(result)
+        if self._timeout_timer:
+            self._timeout_timer.cancel()
+        return True
+
+    def start_timeout(self, timeout):
+        def expire():
+            self.cancel_event.set()
+            self.resolve(
+                {
+                    "success": False,
+                    "message": f"{self.action} timed out after {timeout}s.",
+                    "timed_out": True,
+                }
+            )
+
+        self._timeout_timer = threading.Timer(timeout, expire)
+        self._timeout_timer.daemon = True
+        self._timeout_timer.start()
 
 
 class ActionExecutor:
+    # Times pipelines and stages; tests swap in a VirtualClock
+    clock = system_clock
+    _completion_listeners = []
+
+    @classmethod
+    def add_completion_listener(cls, callback):
+        if callback not in cls._completion_listeners:
+            cls._completion_listeners.append(callback)
+
+    @classmethod
+    def remove_completion_listener(cls, callback):
+        if callback in cls._completion_listeners:
+            cls._completion_listeners.remove(callback)
+
+    @classmethod
+    def _notify_completion(cls, result):
+        for listener in cls._completion_listeners:
+            try:
+                listener(result)
+            except Exception as e:
+                print(f"Error in completion listener: {e}")
+
+    @staticmethod
+    def submit(
+        action,
+        selected_processes=None,
+        pipeline=None,
+        timeout=None,
+        on_progress=None,
+        on_done=None,
+    ):
+        """
+        Runs an action on the action worker pool without blocking the caller.
+
+        Args:
+            action (str): The action to perform, or "Pipeline".
+            selected_processes (list): ProcessGroups used by the action, or
+                a callable returning them, called on the worker so the
+                caller's thread does not enumerate processes.
+            pipeline (list): Stage dicts, only for the "Pipeline" action.
+            timeout (float): Seconds after which the handle resolves as timed out.
+            on_progress (callable): Optional progress listener, (fraction, message).
+            on_done (callable): Optional, called with the result dict.
+                Both are registered before the action is queued, so a fast
+                action cannot finish before they are in place.
+
+        Returns:
+            ActionHandle: Handle to track progress, cancel or wait for the result.
+        """
+        handle = ActionHandle(action)
+
+        def run():
+            if handle.is_cancelled():
+                return
+            try:
+                processes = selected_processes
+                if callable(processes):
+                    processes = processes()
+                if action == "Pipeline":
+                    result = ActionExecutor.execute_pipeline(
+                        pipeline,
+                        processes,
+                        progress=handle.report_progress,
+                        cancel_event=handle.cancel_event,
+                    )
+                else:
+                    result = ActionExecutor.execute(
+                        action,
+                        processes,
+                        progress=handle.report_progress,
+                        cancel_event=handle.cancel_event,
+                    )
+            except Exception as e:
+                result = {"success": False, "message": f"{action} failed: {e}"}
+            handle.resolve(result)
+
+        if on_progress:
+            handle.add_progress_listener(on_progress)
+        if on_done:
+            handle.add_done_callback(on_done)
+        handle.add_done_callback(ActionExecutor._notify_completion)
+        if timeout:
+            handle.start_timeout(timeout)
+        handle._worker = _action_pool.submit(run)
+        return handle
+
     @staticmethod
-    def execute(action, selected_processes=None):
+    @telemetry.timed("actions.execute")
+    def execute(action, selected_processes=None, progress=None, cancel_event=None):
         """
         Executes the specified action.
 
         Args:
             action (str): The action to perform ("Terminate Process", "Shutdown", etc.).
-            selected_processes (list): List of process dicts to terminate (only for "Terminate Process").
+            selected_processes (list): ProcessGroups to terminate (only for "Terminate Process"),
+                looked up again under their grouping when the action runs.
+            progress (callable): Optional, called with (fraction, message) as work completes.
+            cancel_event (threading.Event): Optional, stops termination between groups when set.
 
         Returns:
             dict: A result dictionary with keys 'success', 'message', 'count' (optional).
@@ -17,19 +233,12 @@ class ActionExecutor:
         if action == "Terminate Process":
             if not selected_processes:
                 return {"success": False, "message": "No processes selected."}
-
-            success_count = 0
-            for proc in selected_processes:
-                # Assuming proc has 'pids' key as per existing logic
-                if process_manager.kill_processes(proc.get("pids", [])):
-                    success_count += 1
-
-            return {
-                "success": True,
-                "count": success_count,
-                "total": len(selected_processes),
-                "type": "termination",
-            }
+            # Processes started since the selection belong to their group too
+            return ActionExecutor._terminate(
+                process_manager.current_groups(selected_processes),
+                progress,
+                cancel_event,
+            )
 
         elif action == "Shutdown":
             process_manager.shutdown_system()
@@ -64,3 +273,181 @@ class ActionExecutor:
             }
 
         return {"success": False, "message": f"Unknown action: {action}"}
+
+    @staticmethod
+    def _terminate(groups, progress=None, cancel_event=None):
+        success_count = 0
+        for index, proc in enumerate(groups):
+            if cancel_event and cancel_event.is_set():
+                break
+            if process_manager.kill_processes(proc.pids):
+                success_count += 1
+            if progress:
+                progress((index + 1) / len(groups), f"Terminated {proc.name}")
+
+        return {
+            "success": True,
+            "count": success_count,
+            "total": len(groups),
+            "type": "termination",
+        }
+
+    @staticmethod
+    def execute_pipeline(
+        stages, selected_processes=None, progress=None, cancel_event=None
+    ):
+        """
+        Runs a sequence of stages. The actions of a stage run concurrently, and
+        "Terminate Process" gets one branch per selected group, so a stage
+        takes as long as its slowest branch.
+
+        Args:
+            stages (list): Stage dicts with keys 'actions' (list of str),
+                'timeout' (seconds) and 'on_failure' ("continue" or "abort").
+            selected_processes (list): ProcessGroups used by "Terminate Process"
+                and "Wait For Exit" steps.
+            progress (callable): Optional, called with (fraction, message) after each stage.
+            cancel_event (threading.Event): Optional, skips the remaining stages when set.
+
+        Returns:
+            dict: A result dictionary with keys 'success', 'message', 'type',
+                'elapsed' and 'stages' (per-stage results and timings).
+        """
+        if not stages:
+            return {"success": False, "message": "Pipeline has no stages."}
+
+        selected_processes = selected_processes or []
+        stage_results = []
+        aborted = False
+        pipeline_start = ActionExecutor.clock.monotonic()
+
+        for index, stage in enumerate(stages):
+            if cancel_event and cancel_event.is_set():
+                aborted = True
+            if aborted:
+                stage_results.append(
+                    {"index": index, "actions": stage["actions"], "skipped": True}
+                )
+                continue
+
+            result = ActionExecutor._run_stage(stage, selected_processes)
+            result["index"] = index
+            stage_results.append(result)
+
+            if not result["success"] and stage.get("on_failure") == "abort":
+                aborted = True
+            if progress:
+                progress(
+                    (index + 1) / len(stages),
+                    f"Stage {index + 1}/{len(stages)} done",
+                )
+
+        elapsed = ActionExecutor.clock.monotonic() - pipeline_start
+        completed = sum(1 for r in stage_results if r.get("success"))
+        return {
+            "success": not aborted,
+            "message": (
+                f"Pipeline finished in {elapsed:.1f}s"
+                f" ({completed}/{len(stages)} stages succeeded)."
+                if not aborted
+                else f"Pipeline aborted after {elapsed:.1f}s."
+            ),
+            "type": "pipeline",
+            "elapsed": elapsed,
+            "stages": stage_results,
+        }
+
+    @staticmethod
+    def _stage_branches(stage, selected_processes):
+        """
+        Expands a stage into (label, callable) pairs that can run in parallel.
+        """
+        timeout = stage.get("timeout")
+        if selected_processes and PROCESS_STEPS.intersection(stage["actions"]):
+            # Once per stage, every branch sees the same processes
+            selected_processes = process_manager.current_groups(selected_processes)
+        branches = []
+        for action in stage["actions"]:
+            if action == "Terminate Process":
+                for proc in selected_processes:
+                    branches.append(
+                        (
+                            f"Terminate {proc.name}",
+                            lambda p=proc: ActionExecutor._terminate([p]),
+                        )
+                    )
+            elif action == "Wait For Exit":
+                branches.append(
+                    (
+                        action,
+                        lambda: ActionExecutor._wait_for_exit(
+                            selected_processes, timeout
+                        ),
+                    )
+                )
+            else:
+                branches.append((action, lambda a=action: ActionExecutor.execute(a)))
+        return branches
+
+    @staticmethod
+    def _wait_for_exit(selected_processes, timeout):
+        pids = [pid for proc in selected_processes for pid in proc.pids]
+        if process_manager.wait_for_exit(pids, timeout):
+            return {"success": True, "message": "All processes exited."}
+        return {"success": False, "message": "Processes still running."}
+
+    @staticmethod
+    def _branch_succeeded(result):
+        if not result.get("success"):
+            return False
+        if result.get("type") == "termination":
+            return result.get("count") == result.get("total")
+        return True
+
+    @staticmethod
+    def _run_stage(stage, selected_processes):
+        branches = ActionExecutor._stage_branches(stage, selected_processes)
+        stage_start = ActionExecutor.clock.monotonic()
+        if not branches:
+            return {
+                "actions": stage["actions"],
+                "success": False,
+                "timed_out": False,
+                "elapsed": 0.0,
+                "branches": [],
+            }
+
+        def timed(func):
+            start = ActionExecutor.clock.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                result = {"success": False, "message": str(e)}
+            result["elapsed"] = ActionExecutor.clock.monotonic() - start
+            return result
+
+        # Branches that outlive the timeout keep running in the background;
+        # the pipeline does not wait for them. Those that have not started
+        # by then are dropped.
+        futures = [(label, _stage_pool.submit(timed, func)) for label, func in branches]
+        done, not_done = wait([f for _, f in futures], timeout=stage.get("timeout"))
+        for future in not_done:
+            future.cancel()
+
+        branch_results = []
+        for label, future in futures:
+            if future in done:
+                result = future.result()
+                result["label"] = label
+                result["success"] = ActionExecutor._branch_succeeded(result)
+            else:
+                result = {"label": label, "success": False, "timed_out": True}
+            branch_results.append(result)
+
+        return {
+            "actions": stage["actions"],
+            "success": all(r["success"] for r in branch_results),
+            "timed_out": bool(not_done),
+            "elapsed": ActionExecutor.clock.monotonic() - stage_start,
+            "branches": branch_results,
+        }
@@ -0,0 +1,160 @@
+import time
+from services.trigger_watcher import TriggerWatcher
+
+
+class PsutilPowerSource:
+    """Reads the real battery through psutil."""
+
+    def __init__(self):
+        # Imported here so the GUI can start without loading psutil
+        import psutil
+
+        self.psutil = psutil
+
+    def read(self):
+        """
+        Returns:
+            tuple: (percent, plugged) or None if the machine has no battery.
+        """
+        try:
+            battery = self.psutil.sensors_battery()
+        except Exception:
+            return None
+        if battery is None:
+            return None
+        return battery.percent, bool(battery.power_plugged)
+
+
+class FakePowerSource:
+    """A power source whose charge and plug state are set by hand."""
+
+    def __init__(self, percent=100, plugged=False):
+        self.percent = percent
+        self.plugged = plugged
+
+    def read(self):
+        if self.percent is None:
+            return None
+        return self.percent, self.plugged
+
+
+class BatteryMonitor(TriggerWatcher):
+    """
+    Fires when the charge drops to the threshold while running on battery, and
+    re-arms once the charger is connected again.
+
+    The polling interval adapts to how close the charge is to the threshold:
+    the watcher checks rarely while on AC or far from the threshold, and more
+    often as the estimated time to reach it shrinks.
+    """
+
+    one_shot = False
+
+    # Discharge rate assumed until two samples give a real one (percent/second).
+    # 1% per minute is pessimistic for any laptop, so the first estimate errs
+    # towards polling too often rather than too late.
+    ASSUMED_RATE = 1 / 60
+
+    def __init__(
+        self,
+        threshold,
+        power_source=None,
+        min_interval=10.0,
+        max_interval=300.0,
+        time_func=time.monotonic,
+    ):
+        """
+        Args:
+            threshold (float): Charge percent at or below which the trigger fires.
+            power_source: Object with a `read()` method, defaults to psutil.
+            min_interval (float): Shortest delay between polls in seconds.
+            max_interval (float): Longest delay between polls in seconds.
+            time_func (callable): Monotonic clock in seconds.
+        """
+        super().__init__()
+        self.threshold = threshold
+        self.power_source = power_source or PsutilPowerSource()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.time_func = time_func
+        self.armed = True
+        self._last_sample = None
+        self._rate = None
+
+    def reset(self):
+        self._last_sample = None
+        self._rate = None
+
+    def discharge_rate(self):
+        """Smoothed discharge rate in percent per second, or None if unknown."""
+        return self._rate
+
+    def _update_rate(self, now, percent, plugged):
+        if plugged:
+            self._last_sample = None
+            self._rate = None
+            return
+
+        if self._last_sample is not None:
+            last_time, last_percent = self._last_sample
+            elapsed = now - last_time
+            if elapsed > 0 and percent < last_percent:
+                rate = (last_percent - percent) / elapsed
+                # Exponential smoothing keeps one odd reading from swinging
+                # the interval around.
+                if self._rate is None:
+                    self._rate = rate
+                else:
+                    self._rate = 0.7 * self._rate + 0.3 * rate
+
+        if self._last_sample is None or percent != self._last_sample[1]:
+            self._last_sample = (now, percent)
+
+    def next_interval(self, percent, plugged):
+        if plugged or not self.armed:
+            return self.max_interval
+
+        margin = percent - self.threshold
+        if margin <= 0:
+            return self.min_interval
+
+        rate = self._rate or self.ASSUMED_RATE
+        # Check twice within the estimated time left so the threshold is not
+        # overshot by more than about half a step.
+        interval = (margin / rate) / 2
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def time_to_threshold(self, percent):
+        if self._rate is None or self._rate <= 0:
+            return None
+        return max(0.0, (percent - self.threshold) / self._rate)
+
+    def poll(self):
+        reading = self.power_source.read()
+        if reading is None:
+            self.emit_update(
+                {"percent": None, "plugged": False, "armed": self.armed, "eta": None}
+            )
+            return self.max_interval
+
+        percent, plugged = reading
+        now = self.time_func()
+        self._update_rate(now, percent, plugged)
+
+        if plugged:
+            self.armed = True
+        elif self.armed and percent <= self.threshold:
+            self.armed = False
+            self.fire()
+
+        interval = self.next_interval(percent, plugged)
+        self.emit_update(
+            {
+                "percent": percent,
+                "plugged": plugged,
+                "armed": self.armed,
+                "eta": None if plugged else self.time_to_threshold(percent),
+                "interval": interval,
+            }
+        )
+        return interval
@@ -0,0 +1,86 @@
+import time
+from datetime import datetime
+
+
+class SystemClock:
+    """
+    The real clocks. Code that measures or waits takes a clock argument
+    defaulting to `system_clock`, so tests can hand it a VirtualClock.
+    """
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def time(self):
+        return time.time()
+
+    def now(self):
+        return datetime.now()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock(SystemClock):
+    """
+    A clock that only moves when told to, for fast deterministic tests.
+
+    Housekeepers built on it (Housekeeper(time_func=clock.monotonic,
+    autostart=False)) and attached with attach() run their tasks as the
+    clock moves:
+
+    - advance(seconds) stops at every deadline in between and runs the due
+      tasks in order, like a machine that stays awake.
+    - jump(seconds) moves at once and runs what is due a single time, like
+      a machine waking from suspend. Hours of timer ticks cost one call.
+    """
+
+    def __init__(self, start=None):
+        """
+        Args:
+            start (datetime): Wall clock time at monotonic 0.
+        """
+        self._start = (start or datetime(2024, 1, 1)).timestamp()
+        self._monotonic = 0.0
+        self._housekeepers = []
+
+    def attach(self, housekeeper):
+        self._housekeepers.append(housekeeper)
+        return housekeeper
+
+    def monotonic(self):
+        return self._monotonic
+
+    def time(self):
+        return self._start + self._monotonic
+
+    def now(self):
+        return datetime.fromtimestamp(self.time())
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        target = self._monotonic + seconds
+        while True:
+            deadlines = [
+                deadline
+                for deadline in (h.next_deadline() for h in self._housekeepers)
+                if deadline is not None and deadline <= target
+            ]
+            if not deadlines:
+                break
+            self._monotonic = max(self._monotonic, min(deadlines))
+            for housekeeper in self._housekeepers:
+                housekeeper.run_due(self._monotonic)
+        # A task may have slept on the clock (advance within advance), so
+        # it can already be past the target
+        self._monotonic = max(self._monotonic, target)
+
+    def jump(self, seconds):
+        self._monotonic += seconds
+        for housekeeper in self._housekeepers:
+            housekeeper.run_due(self._monotonic)
+
+
+system_clock = SystemClock()
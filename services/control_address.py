@@ -0,0 +1,73 @@
+import errno
+import getpass
+import os
+import socket
+import stat
+import sys
+import tempfile
+
+# Kept free of heavy imports: a second launch only needs these helpers to
+# find the running instance before it exits.
+
+
+def runtime_dir():
+    """
+    Returns the per-user directory for sockets and lock files. Without
+    XDG_RUNTIME_DIR it is a private directory under the shared temp dir,
+    so other users can neither connect to the socket nor plant files there.
+    """
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.environ["XDG_RUNTIME_DIR"]
+    if sys.platform == "win32":
+        # Already per user
+        return tempfile.gettempdir()
+    return private_dir(
+        os.path.join(tempfile.gettempdir(), f"timetosleep-{getpass.getuser()}")
+    )
+
+
+def private_dir(path):
+    """
+    Creates `path` with mode 0700, or checks that an existing one is a real
+    directory owned by the current user, and makes it 0700.
+
+    Raises:
+        PermissionError: If `path` is a symlink, a file or another user's.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(errno.EACCES, "Not a private directory", path)
+    if stat.S_IMODE(info.st_mode) != 0o700:
+        os.chmod(path, 0o700)
+    return path
+
+
+def default_address():
+    """
+    Returns the per-user address of the control channel: a named pipe on
+    Windows, a Unix domain socket elsewhere.
+    """
+    user = getpass.getuser()
+    if sys.platform == "win32":
+        return rf"\\.\pipe\timetosleep-{user}"
+    return os.path.join(runtime_dir(), f"timetosleep-{user}.sock")
+
+
+def default_lock_path():
+    return os.path.join(runtime_dir(), f"timetosleep-{getpass.getuser()}.lock")
+
+
+def address_in_use(address):
+    """
+    Returns True if something is accepting connections on a Unix socket path.
+    """
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(0.5)
+        probe.connect(address)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
@@ -0,0 +1,360 @@
+import asyncio
+import errno
+import json
+import os
+import sys
+import threading
+import process_manager
+from services.action_executor import ActionExecutor
+from services.control_address import address_in_use, default_address, private_dir
+from services.scheduler import Schedule, scheduler
+from services.time_utils import parse_clock, parse_duration, seconds_until
+from services.telemetry import telemetry
+from state import TimerInfo
+
+
+class ControlError(Exception):
+    """Raised by command handlers to report a failure to the client."""
+
+
+class ControlHandler:
+    """
+    Executes control commands against a TimerService and process_manager.
+
+    A command is a dict {"cmd": str, "args": dict, "id": any}. The reply is
+    {"id": ..., "ok": True, "result": ...} or {"id": ..., "ok": False, "error": str}.
+    """
+
+    def __init__(self, timer_service, state=None):
+        """
+        Args:
+            timer_service (TimerService): The timer the commands operate on.
+            state (AppState): Optional, the TimerInfo is shared through its
+                `timer` field so the tray and the API describe the same timer.
+        """
+        self.timer_service = timer_service
+        self.state = state
+        self._timer = None
+        self._commands = {
+            "ping": lambda args: "pong",
+            "timer.start": self.start_timer,
+            "timer.list": self.list_timers,
+            "timer.pause": self.pause_timer,
+            "timer.resume": self.resume_timer,
+            "timer.cancel": self.cancel_timer,
+            "processes.list": self.list_processes,
+            "housekeeping.stats": lambda args: timer_service.housekeeper.stats(),
+            "telemetry.snapshot": lambda args: telemetry.snapshot(),
+            "schedule.list": self.list_schedules,
+            "schedule.add": self.add_schedule,
+            "schedule.remove": self.remove_schedule,
+        }
+
+    @property
+    def timer(self):
+        if self.state is not None:
+            return self.state.timer
+        return self._timer
+
+    @timer.setter
+    def timer(self, info):
+        if self.state is not None:
+            self.state.timer = info
+        else:
+            self._timer = info
+
+    def register(self, name, func):
+        """
+        Adds a command. `func` receives the args dict and returns a JSON value.
+        """
+        self._commands[name] = func
+
+    def commands(self):
+        return sorted(self._commands)
+
+    def handle(self, command):
+        reply = {"id": command.get("id")} if isinstance(command, dict) else {}
+        try:
+            if not isinstance(command, dict) or "cmd" not in command:
+                raise ControlError("Command must be an object with a 'cmd' key")
+            func = self._commands.get(command["cmd"])
+            if func is None:
+                raise ControlError(f"Unknown command: {command['cmd']}")
+            reply["result"] = func(command.get("args") or {})
+            reply["ok"] = True
+        except ControlError as e:
+            reply.update(ok=False, error=str(e))
+        except Exception as e:
+            reply.update(ok=False, error=f"{type(e).__name__}: {e}")
+        return reply
+
+    def start_timer(self, args):
+        """
+        Args: one of 'seconds' (int), 'after' ("2h30m") or 'at' ("23:30"),
+        plus 'action' (default "Terminate Process") and 'processes'
+        (names, as a list or a comma separated string). With 'cmdline', only
+        the processes whose command line contains it are terminated.
+        """
+        if self.timer_service.is_running():
+            raise ControlError("A timer is already running")
+
+        try:
+            if "seconds" in args:
+                total_seconds = int(args["seconds"])
+            elif "after" in args:
+                total_seconds = parse_duration(str(args["after"]))
+            elif "at" in args:
+                total_seconds = seconds_until(parse_clock(str(args["at"])))
+            else:
+                raise ControlError("Pass 'seconds', 'after' or 'at'")
+        except ValueError as e:
+            raise ControlError(str(e))
+        if total_seconds <= 0:
+            raise ControlError("Time must be greater than 0")
+
+        action = args.get("action", "Terminate Process")
+        names = args.get("processes") or []
+        if isinstance(names, str):
+            names = names.split(",")
+        if action == "Terminate Process" and not names:
+            raise ControlError("Pass 'processes' to terminate")
+        match = str(args.get("cmdline", "")).lower()
+
+        def on_finish():
+            # Matched when the timer ends, PIDs may have changed by then
+            selected = []
+            if names:
+                groups = process_manager.get_running_processes(
+                    show_all=True, with_icons=False
+                )
+                selected, _ = process_manager.find_process_groups(names, groups)
+                if match:
+                    selected = [group.narrowed(match) for group in selected]
+            ActionExecutor.submit(action, selected)
+            self.timer = None
+
+        self.timer_service.start_timer(total_seconds, on_tick=None, on_finish=on_finish)
+        # Set once the timer runs: subscribers such as HomeView show it then
+        self.timer = TimerInfo(
+            action=action,
+            target=(
+                (", ".join(names) + (f" ({match})" if match else ""))
+                if names
+                else "System"
+            ),
+            total_seconds=total_seconds,
+        )
+        return self._timer_info()
+
+    def _timer_info(self):
+        status = self.timer_service.get_status()
+        status["id"] = "main"
+        status["action"] = self.timer.action if self.timer else None
+        status["target"] = self.timer.target if self.timer else None
+        return status
+
+    def list_timers(self, args):
+        if not self.timer_service.is_running():
+            return []
+        return [self._timer_info()]
+
+    def _require_timer(self):
+        if not self.timer_service.is_running():
+            raise ControlError("No timer is running")
+
+    def pause_timer(self, args):
+        self._require_timer()
+        self.timer_service.pause_timer()
+        return self._timer_info()
+
+    def resume_timer(self, args):
+        self._require_timer()
+        self.timer_service.resume_timer()
+        return self._timer_info()
+
+    def cancel_timer(self, args):
+        self._require_timer()
+        self.timer_service.cancel_timer()
+        self.timer = None
+        return True
+
+    def _schedule_info(self, schedule):
+        info = schedule.to_dict()
+        info["next_fire"] = schedule.next_fire
+        return info
+
+    def list_schedules(self, args):
+        return [self._schedule_info(s) for s in scheduler.schedules()]
+
+    def add_schedule(self, args):
+        """
+        Args: 'rule' ("weekdays 23:30" or a cron line), 'action' (default
+        "Terminate Process") and 'processes' (list or comma separated string).
+        """
+        names = args.get("processes") or []
+        if isinstance(names, str):
+            names = names.split(",")
+        try:
+            schedule = Schedule(
+                str(args.get("rule", "")),
+                args.get("action", "Terminate Process"),
+                names,
+            )
+        except ValueError as e:
+            raise ControlError(str(e))
+        return self._schedule_info(scheduler.add(schedule))
+
+    def remove_schedule(self, args):
+        if not scheduler.remove(str(args.get("id", ""))):
+            raise ControlError(f"No schedule with id {args.get('id')!r}")
+        return True
+
+    def list_processes(self, args):
+        """
+        Args: 'query', 'show_all', 'group_by' ("name", "exe" or "app") and
+        'cmdline', which keeps the processes whose command line contains it.
+        """
+        try:
+            groups = process_manager.get_running_processes(
+                show_all=bool(args.get("show_all")),
+                with_icons=False,
+                grouping=str(args.get("group_by", "name")),
+            )
+        except ValueError as e:
+            raise ControlError(str(e))
+        query = str(args.get("query", "")).lower()
+        groups = [g for g in groups if query in g.name.lower()]
+        match = str(args.get("cmdline", "")).lower()
+        if match:
+            # Only the matched groups' command lines are read
+            groups = [g for g in (g.narrowed(match) for g in groups) if g.pids]
+        return [g.to_dict(with_icon=False) for g in groups]
+
+
+class ControlServer:
+    """
+    Serves a ControlHandler over a local socket (named pipe on Windows) from
+    one asyncio loop on a background thread.
+
+    The protocol is line-delimited JSON. A line holding a single command gets
+    a single reply; a line holding a list of commands is a batch and gets a
+    list of replies in the same order, in one round-trip.
+    """
+
+    def __init__(self, handler, address=None):
+        self.handler = handler
+        self.address = address or default_address()
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._started = threading.Event()
+        self._error = None
+
+    def start(self):
+        """
+        Starts serving. Raises OSError if the address cannot be bound.
+        """
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error:
+            raise self._error
+
+    def stop(self):
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        # Only remove the socket if this server created it
+        if self._server and sys.platform != "win32" and os.path.exists(self.address):
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+    def is_running(self):
+        return bool(self._loop and self._loop.is_running())
+
+    def _run(self):
+        if sys.platform == "win32":
+            self._loop = asyncio.ProactorEventLoop()
+        else:
+            self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        except OSError as e:
+            self._error = e
+            self._loop.close()
+            self._started.set()
+            return
+
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            servers = self._server if isinstance(self._server, list) else [self._server]
+            for server in servers:
+                server.close()
+            # Let open client connections unwind before the loop goes away
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+            self._loop.close()
+
+    async def _serve(self):
+        if sys.platform == "win32":
+
+            def factory():
+                reader = asyncio.StreamReader()
+                return asyncio.StreamReaderProtocol(reader, self._handle_client)
+
+            self._server = await self._loop.start_serving_pipe(factory, self.address)
+        else:
+            # Bound inside a 0700 directory, so the socket is never reachable
+            # by other users, not even between bind() and chmod()
+            private_dir(os.path.dirname(os.path.abspath(self.address)))
+            if os.path.exists(self.address):
+                if address_in_use(self.address):
+                    raise OSError(
+                        errno.EADDRINUSE, "Control socket in use", self.address
+                    )
+                # Left behind by an instance that did not shut down cleanly
+                os.unlink(self.address)
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path=self.address
+            )
+            os.chmod(self.address, 0o600)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self._handle_line(line)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_line(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {"ok": False, "error": f"Invalid JSON: {e}"}
+
+        # Commands may block on psutil or the timer thread, so they run on the
+        # default executor and the loop stays free for other clients.
+        def run(command):
+            return self._loop.run_in_executor(None, self.handler.handle, command)
+
+        if isinstance(request, list):
+            # A batch runs in order, so "start" then "pause" behaves as written
+            return [await run(command) for command in request]
+        return await run(request)
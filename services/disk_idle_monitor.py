@@ -0,0 +1,187 @@
+import os
+import time
+from services.trigger_watcher import TriggerWatcher
+
+# Virtual block devices that never carry a backup or download
+IGNORED_DEVICE_PREFIXES = ("loop", "ram", "zram")
+
+# Lists whole disks only, partitions are subdirectories of their disk
+SYS_BLOCK = "/sys/block"
+
+
+def whole_disks(names, sys_block=SYS_BLOCK):
+    """
+    Drops partitions and virtual devices from disk names. On Linux psutil
+    reports sda and sda1 alike, so I/O to a partition would be counted
+    twice; elsewhere it reports whole disks only.
+    """
+    try:
+        disks = set(os.listdir(sys_block))
+    except OSError:
+        disks = None
+    return [
+        name
+        for name in names
+        if (disks is None or name in disks)
+        and not name.startswith(IGNORED_DEVICE_PREFIXES)
+    ]
+
+
+def list_disk_devices():
+    """
+    Returns the names of the disks psutil reports I/O counters for.
+    """
+    # Imported here so the GUI can start without loading psutil
+    import psutil
+
+    try:
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+    except Exception:
+        return []
+    return sorted(whole_disks(counters))
+
+
+class PsutilDiskCounters:
+    """Reads the real disk counters through psutil."""
+
+    def __init__(self):
+        # Imported here so the GUI can start without loading psutil
+        import psutil
+
+        self.psutil = psutil
+
+    def read(self):
+        """
+        Returns:
+            dict: {device: (read_bytes, write_bytes)} for every whole disk.
+        """
+        counters = self.psutil.disk_io_counters(perdisk=True) or {}
+        return {
+            name: (counters[name].read_bytes, counters[name].write_bytes)
+            for name in whole_disks(counters)
+        }
+
+
+class FakeDiskCounters:
+    """Disk counters set by hand, with add() standing in for disk I/O."""
+
+    def __init__(self, **counters):
+        self.counters = dict(counters)
+
+    def add(self, name, read_bytes=0, write_bytes=0):
+        old_read, old_write = self.counters.get(name, (0, 0))
+        self.counters[name] = (old_read + read_bytes, old_write + write_bytes)
+
+    def read(self):
+        return dict(self.counters)
+
+
+class DiskIdleMonitor(TriggerWatcher):
+    """
+    Fires once the combined read and write throughput of the chosen disks has
+    stayed below a threshold for a sustained window.
+
+    Each poll compares the counters with the previous sample only, so memory
+    stays constant however long the trigger is armed, and the window starts
+    counting from the first quiet sample rather than from when it was armed.
+    """
+
+    def __init__(
+        self,
+        devices,
+        threshold,
+        duration_seconds,
+        interval=2.0,
+        counter_source=None,
+        time_func=time.monotonic,
+    ):
+        """
+        Args:
+            devices (list): Disk names to watch, or an empty list for all disks.
+            threshold (float): Bytes per second below which the disks count as idle.
+            duration_seconds (int): How long the disks must stay idle before firing.
+            interval (float): Seconds between samples.
+            counter_source: Object with a `read()` method, defaults to psutil.
+            time_func (callable): Monotonic clock in seconds.
+        """
+        super().__init__()
+        self.devices = list(devices)
+        self.threshold = threshold
+        self.duration_seconds = duration_seconds
+        self.interval = interval
+        self.counter_source = counter_source or PsutilDiskCounters()
+        self.time_func = time_func
+        self._last = None
+        self._last_time = None
+        self._idle_since = None
+
+    def reset(self):
+        self._last = None
+        self._last_time = None
+        self._idle_since = None
+
+    def read_counters(self):
+        """
+        Returns:
+            dict: {device: (read_bytes, write_bytes)} for the watched disks.
+        """
+        counters = self.counter_source.read()
+        devices = self.devices or counters
+        return {name: counters[name] for name in devices if name in counters}
+
+    def compute_rates(self, counters, now):
+        """
+        Turns the delta against the previous sample into bytes per second.
+
+        Returns:
+            tuple: (read_rate, write_rate), or None on the first sample.
+        """
+        last, last_time = self._last, self._last_time
+        self._last, self._last_time = counters, now
+        if last is None or now <= last_time:
+            return None
+
+        read_delta = 0
+        write_delta = 0
+        for name, (read_bytes, write_bytes) in counters.items():
+            previous = last.get(name)
+            if previous is None:
+                # Disk appeared since the last sample, no baseline yet
+                continue
+            # Counters can go backwards if a driver resets them; ignore that step
+            read_delta += max(0, read_bytes - previous[0])
+            write_delta += max(0, write_bytes - previous[1])
+
+        elapsed = now - last_time
+        return read_delta / elapsed, write_delta / elapsed
+
+    def poll(self):
+        now = self.time_func()
+        previous_time = self._last_time
+        rates = self.compute_rates(self.read_counters(), now)
+        if rates is None:
+            return self.interval
+
+        read_rate, write_rate = rates
+        if read_rate + write_rate < self.threshold:
+            if self._idle_since is None:
+                # The rate covers the whole step, so the disks have been
+                # quiet since the previous sample.
+                self._idle_since = previous_time
+            held = now - self._idle_since
+        else:
+            self._idle_since = None
+            held = 0
+
+        self.emit_update(
+            {
+                "read_rate": read_rate,
+                "write_rate": write_rate,
+                "held_seconds": held,
+                "duration_seconds": self.duration_seconds,
+            }
+        )
+
+        if held >= self.duration_seconds:
+            self.fire()
+        return self.interval
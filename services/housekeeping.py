@@ -0,0 +1,191 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+# Tasks due within this many seconds of each other run in the same wakeup
+COALESCE_WINDOW = 0.05
+
+
+class ScheduledTask:
+    __slots__ = ("func", "interval", "deadline", "name", "cancelled")
+
+    def __init__(self, func, deadline, interval=None, name=None):
+        self.func = func
+        self.deadline = deadline
+        self.interval = interval
+        self.name = name or getattr(func, "__name__", "task")
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Housekeeper:
+    """
+    Runs periodic and one-off background tasks from a single thread, so the
+    app wakes up once per batch of due work instead of once per polling loop.
+
+    Tasks are kept in a heap ordered by deadline. On each wakeup every task
+    due within `coalesce` seconds is run, which merges nearby deadlines into
+    one wakeup. Periodic tasks keep a fixed cadence from their first
+    deadline, so a late wakeup does not make them drift.
+
+    Tasks run on the housekeeping thread and should return quickly; slow
+    work belongs on its own worker.
+    """
+
+    def __init__(
+        self, coalesce=COALESCE_WINDOW, time_func=time.monotonic, autostart=True
+    ):
+        """
+        Args:
+            coalesce (float): Seconds of lateness or earliness merged into one wakeup.
+            time_func (callable): Clock used for deadlines, injectable for tests.
+            autostart (bool): Start the thread with the first task. Tests pass
+                False and drive the tasks with run_due() instead.
+        """
+        self.coalesce = coalesce
+        self.time_func = time_func
+        self.autostart = autostart
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread = None
+        self._running = False
+        self._wakeups = deque()
+
+    def call_at(self, deadline, func, interval=None, name=None):
+        """
+        Schedules `func()` at `deadline` (in time_func units), then every
+        `interval` seconds if given.
+
+        Returns:
+            ScheduledTask: Call its cancel() to unschedule it.
+        """
+        task = ScheduledTask(func, deadline, interval, name)
+        with self._lock:
+            heapq.heappush(self._heap, (deadline, next(self._counter), task))
+            is_first = self._heap[0][2] is task
+        if is_first:
+            # The thread may be sleeping towards a later deadline
+            self._wake_event.set()
+        self._ensure_thread()
+        return task
+
+    def call_later(self, delay, func, name=None):
+        return self.call_at(self.time_func() + delay, func, name=name)
+
+    def call_every(self, interval, func, first_delay=None, name=None):
+        delay = interval if first_delay is None else first_delay
+        return self.call_at(self.time_func() + delay, func, interval, name)
+
+    def next_deadline(self):
+        """
+        Returns:
+            float: Deadline of the earliest pending task, or None.
+        """
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None):
+        """
+        Runs every task due by `now` (plus the coalesce window) and
+        reschedules the periodic ones.
+
+        Returns:
+            int: Number of tasks run.
+        """
+        now = self.time_func() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now + self.coalesce:
+                _, _, task = heapq.heappop(self._heap)
+                if not task.cancelled:
+                    due.append(task)
+
+        for task in due:
+            try:
+                task.func()
+            except Exception as e:
+                print(f"Error in housekeeping task {task.name}: {e}")
+            if task.interval and not task.cancelled:
+                task.deadline += task.interval
+                if task.deadline <= now:
+                    # Fell behind (e.g. after a suspend), skip the missed runs
+                    task.deadline = now + task.interval
+                with self._lock:
+                    heapq.heappush(
+                        self._heap, (task.deadline, next(self._counter), task)
+                    )
+        return len(due)
+
+    def wakeups_per_minute(self, now=None):
+        """
+        Returns:
+            int: Wakeups of the housekeeping thread in the last 60 seconds.
+        """
+        now = self.time_func() if now is None else now
+        with self._lock:
+            self._prune_wakeups(now)
+            return len(self._wakeups)
+
+    def _record_wakeup(self, now):
+        # Pruned on every wakeup, so a timer ticking for days keeps at most
+        # a minute of entries
+        with self._lock:
+            self._wakeups.append(now)
+            self._prune_wakeups(now)
+
+    def _prune_wakeups(self, now):
+        while self._wakeups and self._wakeups[0] < now - 60:
+            self._wakeups.popleft()
+
+    def stats(self):
+        with self._lock:
+            pending = sum(1 for _, _, task in self._heap if not task.cancelled)
+        return {
+            "tasks": pending,
+            "wakeups_per_minute": self.wakeups_per_minute(),
+        }
+
+    def _ensure_thread(self):
+        if self._running or not self.autostart:
+            return
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._loop, name="housekeeping", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake_event.set()
+        # The thread is started under the lock, so it is never joined unstarted
+        with self._lock:
+            thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    def _loop(self):
+        while self._running:
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else deadline - self.time_func()
+            if timeout is None or timeout > 0:
+                self._wake_event.wait(timeout)
+            self._wake_event.clear()
+            if not self._running:
+                break
+            self._record_wakeup(self.time_func())
+            self.run_due()
+
+
+# Shared by the timer, the tray and the window-state check
+housekeeper = Housekeeper()
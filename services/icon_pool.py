@@ -0,0 +1,224 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future, as_completed
+from services.housekeeping import housekeeper as shared_housekeeper
+from services.telemetry import telemetry
+
+# Seconds one executable may take before it counts as failed
+DEFAULT_TIMEOUT = 2.0
+
+# Icon extraction is mostly file I/O, more workers than this do not help
+MAX_WORKERS = 8
+
+
+def _child_main(conn, extract):
+    """
+    Loop of an isolated worker process: reads a path, sends back its icon.
+    """
+    while True:
+        try:
+            path = conn.recv()
+        except EOFError:
+            return
+        if path is None:
+            return
+        try:
+            icon = extract(path)
+        except Exception:
+            icon = None
+        conn.send(icon)
+
+
+class IsolatedExtractor:
+    """
+    Runs the extract function in a child process, so an executable that
+    hangs or crashes the extractor can be dealt with by killing the child.
+    A new child is started on the next call.
+    """
+
+    def __init__(self, extract):
+        self.extract = extract
+        self._process = None
+        self._conn = None
+
+    def _start(self):
+        # Only paid for when isolation is turned on
+        import multiprocessing
+
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_child_main, args=(child_conn, self.extract), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+    def __call__(self, path, timeout):
+        """
+        Returns:
+            tuple: (finished, icon). finished is False if the child timed out
+                or died, in which case it has been killed.
+        """
+        if self._process is None or not self._process.is_alive():
+            self._start()
+        try:
+            self._conn.send(path)
+            if self._conn.poll(timeout):
+                return True, self._conn.recv()
+        except (OSError, EOFError):
+            pass
+        self.close()
+        return False, None
+
+    def close(self):
+        if self._process is None:
+            return
+        self._process.kill()
+        self._process.join(timeout=1.0)
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+
+class IconPool:
+    """
+    Extracts icons on a bounded set of worker threads.
+
+    Each executable gets `timeout` seconds from the moment a worker picks it
+    up. When it runs out, its future resolves to None, the path is not tried
+    again, and the stuck worker is retired and replaced, so one pathological
+    executable (e.g. on an unreachable network share) never holds up the
+    others. With `isolate`, each worker extracts in its own child process,
+    which is killed on timeout instead of being left behind.
+
+    Requests for a path that is already queued share one future.
+    """
+
+    def __init__(
+        self,
+        extract,
+        workers=None,
+        timeout=DEFAULT_TIMEOUT,
+        isolate=False,
+        housekeeper=None,
+    ):
+        """
+        Args:
+            extract (callable): Returns the base64 icon for a path, or None.
+                Must be a module-level function when `isolate` is set.
+            workers (int): Worker threads, from the CPU count by default.
+            timeout (float): Seconds per executable.
+            isolate (bool): Extract in child processes.
+            housekeeper (Housekeeper): Runs the timeouts of in-process
+                workers, the shared one by default.
+        """
+        self.extract = extract
+        self.workers = workers or min(MAX_WORKERS, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.isolate = isolate
+        self.housekeeper = housekeeper or shared_housekeeper
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._failed = set()
+        self._threads = 0
+
+    def submit(self, path):
+        """
+        Queues one executable.
+
+        Returns:
+            Future: Resolves to the base64 icon, or None on failure or timeout.
+        """
+        with self._lock:
+            future = self._pending.get(path)
+            if future is not None:
+                return future
+            future = Future()
+            if path in self._failed:
+                future.set_result(None)
+                return future
+            self._pending[path] = future
+            self._queue.put((path, future))
+            if self._threads < self.workers:
+                self._start_worker()
+        return future
+
+    def extract_many(self, paths):
+        """
+        Queues a batch and yields (path, icon) pairs as they finish, fastest
+        first. Every path is yielded once, with None if it failed.
+        """
+        futures = {self.submit(path): path for path in dict.fromkeys(paths)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def failed(self):
+        with self._lock:
+            return set(self._failed)
+
+    def shutdown(self):
+        with self._lock:
+            for _ in range(self._threads):
+                self._queue.put(None)
+            self._threads = 0
+
+    def _start_worker(self):
+        # Called with the lock held
+        self._threads += 1
+        threading.Thread(target=self._work, name="icon-worker", daemon=True).start()
+
+    def _resolve(self, path, future, icon, failed=False):
+        with self._lock:
+            if future.done():
+                return False
+            self._pending.pop(path, None)
+            if failed:
+                self._failed.add(path)
+            future.set_result(icon)
+        return True
+
+    def _expire(self, path, future, retired):
+        if not self._resolve(path, future, None, failed=True):
+            return
+        telemetry.count("icons.timeout")
+        print(f"Icon extraction timed out: {path}")
+        with self._lock:
+            # The stuck thread exits once the extractor returns, if ever
+            retired.set()
+            self._threads -= 1
+            self._start_worker()
+
+    def _work(self):
+        isolated = IsolatedExtractor(self.extract) if self.isolate else None
+        retired = threading.Event()
+        try:
+            while not retired.is_set():
+                item = self._queue.get()
+                if item is None:
+                    return
+                path, future = item
+                with telemetry.timer("icons.extract"):
+                    if isolated:
+                        finished, icon = isolated(path, self.timeout)
+                        if not finished:
+                            telemetry.count("icons.timeout")
+                        self._resolve(path, future, icon, failed=not finished)
+                        continue
+
+                    task = self.housekeeper.call_later(
+                        self.timeout,
+                        lambda p=path, f=future: self._expire(p, f, retired),
+                        name="icon timeout",
+                    )
+                    try:
+                        icon = self.extract(path)
+                    except Exception as e:
+                        print(f"Error extracting icon from {path}: {e}")
+                        icon = None
+                    task.cancel()
+                    self._resolve(path, future, icon)
+        finally:
+            if isolated:
+                isolated.close()
@@ -0,0 +1,187 @@
+import os
+import select
+import sys
+import threading
+from services.trigger_watcher import TriggerWatcher
+
+
+def pidfd_supported():
+    return sys.platform.startswith("linux") and hasattr(os, "pidfd_open")
+
+
+class ProcessExitWatcher(TriggerWatcher):
+    """
+    Fires once every watched process has exited.
+
+    On Linux each PID is opened as a pidfd and the watcher thread blocks in a
+    single poll() over all of them, so it uses no CPU until a process exits.
+    Elsewhere it checks the processes with psutil.wait_procs(), backing off
+    exponentially while nothing changes.
+
+    PIDs are pinned to the create_time seen when the processes were listed,
+    so a PID reused by an unrelated process since then counts as exited.
+    """
+
+    def __init__(self, processes, min_backoff=0.25, max_backoff=8.0):
+        """
+        Args:
+            processes (list): The ProcessGroups to watch.
+            min_backoff (float): First delay between checks without pidfd.
+            max_backoff (float): Longest delay between checks without pidfd.
+        """
+        super().__init__()
+        # Imported here so the GUI can start without loading psutil
+        import psutil
+
+        self.psutil = psutil
+        self.errors = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.use_pidfd = pidfd_supported()
+
+        self.watched = []
+        for proc in processes:
+            started = proc.start_times()
+            for pid in proc.pids:
+                create_time = started.get(pid)
+                if create_time is None:
+                    # Not from an enumeration, pinned to the process running now
+                    try:
+                        create_time = psutil.Process(pid).create_time()
+                    except self.errors:
+                        continue
+                self.watched.append((pid, create_time))
+        self.total = len(self.watched)
+
+        self._alive = []
+        self._backoff = min_backoff
+        self._pidfds = {}
+        self._poller = None
+        self._wake_r = None
+        self._wake_w = None
+        # wake() runs on other threads while cleanup() closes the pipe on
+        # the watcher thread; without it a write could hit a closed or
+        # reused descriptor.
+        self._wake_lock = threading.Lock()
+
+    def _is_same_process(self, pid, create_time):
+        try:
+            return self.psutil.Process(pid).create_time() == create_time
+        except self.errors:
+            return False
+
+    def reset(self):
+        self._close_pidfds()
+        self._backoff = self.min_backoff
+
+        if self.use_pidfd:
+            with self._wake_lock:
+                if self._wake_r is None:
+                    self._wake_r, self._wake_w = os.pipe()
+                    os.set_blocking(self._wake_w, False)
+                    os.set_blocking(self._wake_r, False)
+            self._poller = select.poll()
+            self._poller.register(self._wake_r, select.POLLIN)
+
+            for pid, create_time in self.watched:
+                try:
+                    fd = os.pidfd_open(pid)
+                except OSError:
+                    continue
+                # The PID may have been reused before the pidfd was opened;
+                # once open, the fd refers to that exact process.
+                if not self._is_same_process(pid, create_time):
+                    os.close(fd)
+                    continue
+                self._pidfds[fd] = pid
+                self._poller.register(fd, select.POLLIN)
+        else:
+            self._alive = []
+            for pid, create_time in self.watched:
+                # psutil.Process.is_running() compares create_time, which
+                # wait_procs relies on to detect reuse.
+                try:
+                    proc = self.psutil.Process(pid)
+                    if proc.create_time() == create_time:
+                        self._alive.append(proc)
+                except self.errors:
+                    continue
+
+    def alive_count(self):
+        if self.use_pidfd:
+            return len(self._pidfds)
+        return len(self._alive)
+
+    def poll(self):
+        if self.use_pidfd:
+            delay = self._poll_pidfds()
+        else:
+            delay = self._poll_psutil()
+
+        alive = self.alive_count()
+        self.emit_update({"alive": alive, "total": self.total})
+        if alive == 0:
+            self.fire()
+        return delay
+
+    def _poll_pidfds(self):
+        if not self._pidfds:
+            return 0
+
+        # Blocks until a watched process exits or wake() is called
+        for fd, _ in self._poller.poll():
+            if fd == self._wake_r:
+                try:
+                    while os.read(self._wake_r, 64):
+                        pass
+                except BlockingIOError:
+                    pass
+            elif fd in self._pidfds:
+                self._poller.unregister(fd)
+                os.close(fd)
+                del self._pidfds[fd]
+        return 0
+
+    def _poll_psutil(self):
+        if not self._alive:
+            return 0
+
+        gone, self._alive = self.psutil.wait_procs(self._alive, timeout=0)
+        if gone:
+            self._backoff = self.min_backoff
+            return 0
+
+        delay = self._backoff
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+        return delay
+
+    def wake(self):
+        super().wake()
+        with self._wake_lock:
+            if self._wake_w is not None:
+                try:
+                    os.write(self._wake_w, b"x")
+                except (BlockingIOError, OSError):
+                    pass
+
+    def _close_pidfds(self):
+        for fd in self._pidfds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._pidfds = {}
+        self._poller = None
+
+    def cleanup(self):
+        self._close_pidfds()
+        with self._wake_lock:
+            wake_fds = (self._wake_r, self._wake_w)
+            self._wake_r = None
+            self._wake_w = None
+        for fd in wake_fds:
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
@@ -0,0 +1,325 @@
+"""
+Opt-in profiling for reports of a sluggish app.
+
+    TIMETOSLEEP_PROFILE=sample python main.py
+    python main.py --profile cprofile --profile-seconds 120
+
+"sample" records the stacks of all threads every few milliseconds;
+"cprofile" runs the startup, process list refreshes and timer ticks under
+cProfile. Both trace allocations with tracemalloc. When the window ends,
+a top-N summary and a compact data file are written to the profiles
+folder next to the settings file.
+
+Nothing is installed while profiling is off: no sampling thread, no
+tracemalloc, and section() wrappers only check whether a session exists.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+PROFILE_ENV = "TIMETOSLEEP_PROFILE"
+PROFILE_SECONDS_ENV = "TIMETOSLEEP_PROFILE_SECONDS"
+MODES = ("sample", "cprofile")
+DEFAULT_SECONDS = 60
+SAMPLE_INTERVAL = 0.005
+TOP_N = 25
+# Frames kept per stack sample, from the innermost
+MAX_STACK_DEPTH = 48
+
+# cProfile, pstats and gzip are imported on first use, so importing this
+# module costs nothing measurable when profiling stays off.
+
+
+def default_profile_dir():
+    from services.settings_store import default_settings_path
+
+    return os.path.join(os.path.dirname(default_settings_path()), "profiles")
+
+
+def _frame_label(code):
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+class ProfileSession:
+    def __init__(self, mode, seconds, output_dir, interval, top):
+        self.mode = mode
+        self.seconds = seconds
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top = top
+        self.started = datetime.now()
+        self.paths = []
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._stacks = Counter()
+        self._sections = Counter()
+        self._profiling = False
+        self._skipped = 0
+        self._samples = 0
+        self._stats = None
+        self._sampler = None
+        self._own_tracemalloc = False
+        self._memory_start = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._own_tracemalloc = True
+        self._memory_start = tracemalloc.take_snapshot()
+        if self.mode == "sample":
+            self._sampler = threading.Thread(
+                target=self._sample_loop, name="profiler", daemon=True
+            )
+            self._sampler.start()
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self._stacks[tuple(reversed(stack))] += 1
+            self._samples += 1
+
+    def run_section(self, name, func, args, kwargs):
+        import cProfile
+        import pstats
+
+        # One profiler at a time for the whole session. Since Python 3.12
+        # cProfile is built on sys.monitoring and a second enabled profiler
+        # raises, so a section overlapping another one (nested, or on
+        # another thread) runs unprofiled.
+        with self._lock:
+            busy = self._profiling
+            self._profiling = True
+        if busy:
+            self._skipped += 1
+            return func(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool, such as a debugger or coverage
+            with self._lock:
+                self._profiling = False
+                self._skipped += 1
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiling = False
+                self._sections[name] += 1
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+
+    def stop(self):
+        """
+        Ends the session and writes the summary and data files.
+
+        Returns:
+            list: Paths of the written files.
+        """
+        self._stop_event.set()
+        if self._sampler:
+            self._sampler.join(timeout=1.0)
+        memory_end = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(
+            self.output_dir, f"profile-{self.started:%Y%m%d-%H%M%S}-{self.mode}"
+        )
+        summary = [
+            f"Time to Sleep profile ({self.mode}), {self.started:%Y-%m-%d %H:%M:%S},"
+            f" {(datetime.now() - self.started).total_seconds():.1f}s",
+            "",
+        ]
+
+        if self.mode == "sample":
+            import gzip
+
+            summary += self._sample_summary()
+            path = base + ".collapsed.gz"
+            # One "frame;frame;frame count" line per stack, as read by
+            # flamegraph tools
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                for stack, count in self._stacks.most_common():
+                    f.write(f"{';'.join(stack)} {count}\n")
+            self.paths.append(path)
+        elif self._stats is not None:
+            summary += self._cprofile_summary()
+            path = base + ".pstats"
+            self._stats.dump_stats(path)
+            self.paths.append(path)
+        else:
+            summary.append("No profiled sections ran during the window.")
+
+        summary += [
+            "",
+            f"Memory: {current / 1024**2:.1f} MB traced, peak {peak / 1024**2:.1f} MB",
+        ]
+        summary.append(f"Top {self.top} allocation changes:")
+        for stat in memory_end.compare_to(self._memory_start, "lineno")[: self.top]:
+            summary.append(f"  {stat}")
+
+        path = base + ".txt"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(summary) + "\n")
+        self.paths.insert(0, path)
+        return self.paths
+
+    def _sample_summary(self):
+        own = Counter()
+        total = Counter()
+        for stack, count in self._stacks.items():
+            own[stack[-1]] += count
+            # Recursion counts once per sample
+            for label in set(stack[1:]):
+                total[label] += count
+        lines = [f"{self._samples} samples every {self.interval * 1000:.0f} ms", ""]
+        for title, counter in (("Self", own), ("Total", total)):
+            lines.append(f"Top {self.top} by {title.lower()} samples:")
+            for label, count in counter.most_common(self.top):
+                share = 100 * count / max(self._samples, 1)
+                lines.append(f"  {count:7d} {share:5.1f}%  {label}")
+            lines.append("")
+        return lines
+
+    def _cprofile_summary(self):
+        import io
+
+        sections = ", ".join(f"{n} x{c}" for n, c in self._sections.most_common())
+        lines = [f"Sections: {sections}"]
+        if self._skipped:
+            lines.append(f"{self._skipped} overlapping section calls ran unprofiled")
+        lines.append("")
+        out = io.StringIO()
+        self._stats.stream = out
+        self._stats.sort_stats("cumulative").print_stats(self.top)
+        return lines + out.getvalue().strip().splitlines()
+
+
+class Profiler:
+    def __init__(self):
+        self.session = None
+        self._timer = None
+        self._done_listeners = []
+        self._lock = threading.Lock()
+
+    def add_done_listener(self, callback):
+        if callback not in self._done_listeners:
+            self._done_listeners.append(callback)
+
+    def remove_done_listener(self, callback):
+        if callback in self._done_listeners:
+            self._done_listeners.remove(callback)
+
+    def is_active(self):
+        return self.session is not None
+
+    def start(
+        self,
+        mode="sample",
+        seconds=DEFAULT_SECONDS,
+        output_dir=None,
+        interval=SAMPLE_INTERVAL,
+        top=TOP_N,
+    ):
+        """
+        Starts a profiling window that stops by itself after `seconds`.
+
+        Returns:
+            bool: False if a session is already running.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        with self._lock:
+            if self.session:
+                return False
+            session = ProfileSession(
+                mode, seconds, output_dir or default_profile_dir(), interval, top
+            )
+            session.start()
+            self.session = session
+            if seconds:
+                self._timer = threading.Timer(seconds, self.stop)
+                self._timer.daemon = True
+                self._timer.start()
+        return True
+
+    def start_from_env(self):
+        mode = os.environ.get(PROFILE_ENV)
+        if not mode:
+            return False
+        if mode == "1":
+            mode = "sample"
+        seconds = float(os.environ.get(PROFILE_SECONDS_ENV, DEFAULT_SECONDS))
+        return self.start(mode, seconds)
+
+    def stop(self):
+        """
+        Returns:
+            list: Paths of the written files, empty if nothing was running.
+        """
+        with self._lock:
+            session, self.session = self.session, None
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        if session is None:
+            return []
+        try:
+            paths = session.stop()
+        except OSError as e:
+            print(f"Failed to write profile: {e}")
+            paths = []
+        for listener in self._done_listeners:
+            try:
+                listener(paths)
+            except Exception as e:
+                print(f"Error in profile listener: {e}")
+        return paths
+
+    def section(self, name):
+        """
+        Decorator for code paths profiled in "cprofile" mode.
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                session = self.session
+                if session is None or session.mode != "cprofile":
+                    return func(*args, **kwargs)
+                return session.run_section(name, func, args, kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+profiler = Profiler()
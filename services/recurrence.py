@@ -0,0 +1,213 @@
+"""
+Recurrence rules for schedules, written either in a short form or as a
+five field cron line:
+
+    daily 01:00
+    weekdays 23:30
+    weekends 10:15
+    mon,wed,fri 22:00
+    30 23 * * 1-5          (minute hour day-of-month month day-of-week)
+
+Rules have minute resolution and use the local wall clock.
+"""
+
+import calendar
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from services.time_utils import parse_clock
+
+WEEKDAY_NAMES = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+MONTH_NAMES = (
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "may",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "oct",
+    "nov",
+    "dec",
+)
+
+# Day words of the short form, as cron day-of-week fields
+DAY_WORDS = {"daily": "*", "weekdays": "1-5", "weekends": "0,6"}
+
+# A rule that matches nothing within this many years never fires (Feb 29
+# needs up to 8)
+MAX_YEARS = 8
+
+
+def _parse_value(text, low, names):
+    text = text.lower()
+    if names and text in names:
+        return names.index(text) + low
+    if not text.isdigit():
+        raise ValueError(f"Invalid value: {text!r}")
+    return int(text)
+
+
+def parse_field(text, low, high, names=None):
+    """
+    Parses one cron field ("*", "5", "1-5", "*/15", "mon,fri", "9-17/2").
+
+    Returns:
+        tuple: The sorted values, all within low..high.
+    """
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Invalid step: {step_text!r}")
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (_parse_value(p, low, names) for p in part.split("-", 1))
+        else:
+            start = _parse_value(part, low, names)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Out of range {low}-{high}: {text!r}")
+        values.update(range(start, end + 1, step))
+    return tuple(sorted(values))
+
+
+def _next_value(values, current):
+    """
+    Returns the first of the sorted values that is >= current, or None.
+    """
+    index = bisect_left(values, current)
+    return values[index] if index < len(values) else None
+
+
+class CronRule:
+    """
+    A parsed cron line. next_after() jumps field by field to the next
+    matching minute (month, then day, then hour, then minute) instead of
+    stepping through time, so it costs a handful of operations however far
+    away the next fire is.
+    """
+
+    __slots__ = (
+        "text",
+        "minutes",
+        "hours",
+        "days",
+        "months",
+        "weekdays",
+        "any_day",
+        "any_weekday",
+    )
+
+    def __init__(self, text):
+        fields = text.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expected 5 cron fields, got {len(fields)}: {text!r}")
+        self.text = text
+        self.minutes = parse_field(fields[0], 0, 59)
+        self.hours = parse_field(fields[1], 0, 23)
+        self.days = parse_field(fields[2], 1, 31)
+        self.months = parse_field(fields[3], 1, 12, MONTH_NAMES)
+        # 7 is also Sunday
+        weekdays = parse_field(fields[4], 0, 7, WEEKDAY_NAMES)
+        self.weekdays = tuple(sorted({day % 7 for day in weekdays}))
+        # As in cron, a field starting with "*" ("*/2" too) counts as
+        # unrestricted when deciding whether days or weekdays apply
+        self.any_day = fields[2].startswith("*")
+        self.any_weekday = fields[4].startswith("*")
+
+    def matching_days(self, year, month):
+        """
+        Returns:
+            tuple: The days of the month the rule fires on, sorted.
+        """
+        first_weekday, length = calendar.monthrange(year, month)
+        # calendar counts from Monday, cron from Sunday
+        first_weekday = (first_weekday + 1) % 7
+        by_date = [day for day in self.days if day <= length]
+        by_weekday = [
+            day
+            for weekday in self.weekdays
+            for day in range((weekday - first_weekday) % 7 + 1, length + 1, 7)
+        ]
+        # As in cron, restricting both fields means either one may match
+        if self.any_weekday:
+            days = by_date
+        elif self.any_day:
+            days = by_weekday
+        else:
+            days = set(by_date) | set(by_weekday)
+        return tuple(sorted(days))
+
+    def next_after(self, after):
+        """
+        Returns the first datetime strictly after `after` that the rule
+        matches. Raises ValueError if the rule can never match.
+        """
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        year, month, day, hour, minute = t.year, t.month, t.day, t.hour, t.minute
+
+        while year <= after.year + MAX_YEARS:
+            if month not in self.months:
+                month = _next_value(self.months, month)
+                if month is None:
+                    year, month = year + 1, self.months[0]
+                day, hour, minute = 1, 0, 0
+                continue
+
+            next_day = _next_value(self.matching_days(year, month), day)
+            if next_day is None:
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                day, hour, minute = 1, 0, 0
+                continue
+            if next_day != day:
+                day, hour, minute = next_day, 0, 0
+
+            next_hour = _next_value(self.hours, hour)
+            if next_hour is None:
+                t = datetime(year, month, day) + timedelta(days=1)
+                year, month, day, hour, minute = t.year, t.month, t.day, 0, 0
+                continue
+            if next_hour != hour:
+                hour, minute = next_hour, 0
+
+            next_minute = _next_value(self.minutes, minute)
+            if next_minute is None:
+                t = datetime(year, month, day, hour) + timedelta(hours=1)
+                year, month, day, hour, minute = t.year, t.month, t.day, t.hour, 0
+                continue
+            return datetime(year, month, day, hour, next_minute)
+
+        raise ValueError(f"Rule never fires: {self.text!r}")
+
+    def __repr__(self):
+        return f"CronRule({self.text!r})"
+
+
+def parse_rule(text):
+    """
+    Parses a rule in the short form ("weekdays 23:30") or as a cron line.
+    Raises ValueError for anything else.
+
+    Returns:
+        CronRule: The rule; its `text` keeps what was written.
+    """
+    text = " ".join(text.split())
+    parts = text.split(" ")
+    if len(parts) == 2 and ":" in parts[1]:
+        days, clock = parts[0].lower(), parse_clock(parts[1])
+        if clock.second:
+            raise ValueError("Schedules have minute resolution")
+        weekdays = DAY_WORDS.get(days, days)
+        rule = CronRule(f"{clock.minute} {clock.hour} * * {weekdays}")
+    else:
+        rule = CronRule(text)
+    rule.text = text
+    # Fails now, rather than when the schedule is armed
+    rule.next_after(datetime.now())
+    return rule
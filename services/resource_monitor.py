@@ -0,0 +1,231 @@
+import os
+import sys
+import time
+from services.trigger_watcher import TriggerWatcher
+
+CPU_BELOW = "CPU Below"
+MEMORY_ABOVE = "Memory Above"
+
+
+def format_bytes(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            break
+        num_bytes /= 1024
+    if unit == "B":
+        return f"{int(num_bytes)} {unit}"
+    return f"{num_bytes:.1f} {unit}"
+
+
+class PsutilProcessSampler:
+    """
+    Reads process usage through psutil. Each PID is read inside
+    `Process.oneshot()`, and Process objects are kept between reads because
+    psutil measures CPU usage since the previous call on the same object.
+    """
+
+    def __init__(self):
+        # Imported here so the GUI can start without loading psutil
+        import psutil
+
+        self.psutil = psutil
+        self.errors = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+        self._cpu_count = psutil.cpu_count() or 1
+        self._procs = {}
+
+    def reset(self):
+        self._procs = {}
+
+    def read(self, pids):
+        """
+        Returns:
+            dict: {pid: (cpu_percent, rss)} for the live PIDs, with CPU as a
+                percent of the whole machine, 0 on a PID's first read.
+        """
+        usage = {}
+        for pid in pids:
+            proc = self._procs.get(pid)
+            try:
+                if proc is None:
+                    proc = self.psutil.Process(pid)
+                    self._procs[pid] = proc
+                with proc.oneshot():
+                    usage[pid] = (
+                        proc.cpu_percent(None) / self._cpu_count,
+                        proc.memory_info().rss,
+                    )
+            except self.errors:
+                self._procs.pop(pid, None)
+        # Forget PIDs that are gone or no longer watched
+        self._procs = {pid: proc for pid, proc in self._procs.items() if pid in usage}
+        return usage
+
+    def children(self, pid):
+        """
+        Returns:
+            list: PIDs of the direct children of `pid`. On Linux they are
+                read from /proc/<pid>/task/*/children, which costs the same
+                however many processes run; elsewhere psutil finds them.
+        """
+        if sys.platform.startswith("linux"):
+            try:
+                pids = []
+                for task in os.listdir(f"/proc/{pid}/task"):
+                    with open(f"/proc/{pid}/task/{task}/children") as f:
+                        pids.extend(int(child) for child in f.read().split())
+                return pids
+            except OSError:
+                # Gone, or a kernel without CONFIG_PROC_CHILDREN
+                pass
+        try:
+            return [child.pid for child in self.psutil.Process(pid).children()]
+        except self.errors:
+            return []
+
+
+class FakeProcessSampler:
+    """
+    Process usage set by hand: `usage` maps PIDs to (cpu_percent, rss) and
+    `tree` PIDs to the PIDs of their children.
+    """
+
+    def __init__(self, usage=None, tree=None):
+        self.usage = dict(usage or {})
+        self.tree = dict(tree or {})
+        self.reads = []
+
+    def reset(self):
+        pass
+
+    def read(self, pids):
+        self.reads.append(list(pids))
+        return {pid: self.usage[pid] for pid in pids if pid in self.usage}
+
+    def children(self, pid):
+        return list(self.tree.get(pid, ()))
+
+
+class ResourceMonitor(TriggerWatcher):
+    """
+    Fires when the aggregate usage of the selected process groups crosses a
+    threshold and stays there for a sustained duration.
+
+    Only the PIDs of the selected groups are sampled, so the cost of a poll
+    depends on the size of the selection rather than on the number of
+    processes on the system. Every `children_interval` seconds the watched
+    processes are checked for new children, so the workers an app starts
+    later count as well, at a cost that also depends on the selection only.
+    """
+
+    def __init__(
+        self,
+        processes,
+        metric,
+        threshold,
+        duration_seconds,
+        interval=2.0,
+        sampler=None,
+        time_func=time.monotonic,
+        children_interval=10.0,
+    ):
+        """
+        Args:
+            processes (list): The ProcessGroups to sample.
+            metric (str): CPU_BELOW or MEMORY_ABOVE.
+            threshold (float): CPU percent of the whole machine, or bytes of RSS.
+            duration_seconds (int): How long the condition must hold before firing.
+            interval (float): Seconds between samples.
+            sampler: Object with `read(pids)`, `children(pid)` and `reset()`,
+                defaults to psutil.
+            time_func (callable): Monotonic clock in seconds.
+            children_interval (float): Seconds between checks for new children.
+        """
+        super().__init__()
+        self.processes = list(processes)
+        self.pids = [pid for proc in self.processes for pid in proc.pids]
+        self.metric = metric
+        self.threshold = threshold
+        self.duration_seconds = duration_seconds
+        self.interval = interval
+        self.sampler = sampler or PsutilProcessSampler()
+        self.time_func = time_func
+        self.children_interval = children_interval
+        self._children_checked_at = time_func()
+        self._primed = False
+        self._condition_since = None
+
+    def reset(self):
+        self.sampler.reset()
+        self._primed = False
+        self._condition_since = None
+
+    def add_children(self):
+        """
+        Starts watching the processes the watched ones started since the
+        last check, and their children in turn.
+        """
+        known = set(self.pids)
+        pending = list(self.pids)
+        while pending:
+            for child in self.sampler.children(pending.pop()):
+                if child not in known:
+                    known.add(child)
+                    self.pids.append(child)
+                    pending.append(child)
+        self._children_checked_at = self.time_func()
+
+    def sample(self):
+        """
+        Reads CPU and memory for every live PID of the selection.
+
+        Returns:
+            dict: {'cpu_percent': float, 'rss': int, 'alive': int}
+        """
+        if self.time_func() - self._children_checked_at >= self.children_interval:
+            self.add_children()
+        usage = self.sampler.read(self.pids)
+
+        # Drop PIDs that are gone so later polls skip them
+        self.pids = [pid for pid in self.pids if pid in usage]
+
+        return {
+            "cpu_percent": sum(cpu for cpu, _ in usage.values()),
+            "rss": sum(rss for _, rss in usage.values()),
+            "alive": len(usage),
+        }
+
+    def condition_met(self, stats):
+        if self.metric == CPU_BELOW:
+            return stats["cpu_percent"] < self.threshold
+        if self.metric == MEMORY_ABOVE:
+            return stats["rss"] > self.threshold
+        return False
+
+    def poll(self):
+        stats = self.sample()
+
+        # psutil needs two samples to compute CPU usage, so the first poll only
+        # establishes the baseline.
+        if not self._primed:
+            self._primed = True
+            stats["held_seconds"] = 0
+            stats["duration_seconds"] = self.duration_seconds
+            self.emit_update(stats)
+            return self.interval
+
+        now = self.time_func()
+        if self.condition_met(stats):
+            if self._condition_since is None:
+                self._condition_since = now
+            held = now - self._condition_since
+        else:
+            self._condition_since = None
+            held = 0
+
+        stats["held_seconds"] = held
+        stats["duration_seconds"] = self.duration_seconds
+        self.emit_update(stats)
+
+        if held >= self.duration_seconds:
+            self.fire()
+        return self.interval
@@ -0,0 +1,312 @@
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from datetime import datetime
+import process_manager
+from services.action_executor import ActionExecutor
+from services.housekeeping import housekeeper as shared_housekeeper
+from services.recurrence import parse_rule
+
+# Longest single sleep. Wall clock jumps (suspend, manual changes) are
+# noticed within this many seconds.
+MAX_SLEEP = 60.0
+
+# A fire found late by more than this (the machine was asleep or the app
+# was busy) is skipped rather than run, so resuming a laptop in the
+# morning does not shut it down for last night's schedule.
+MISSED_GRACE = 300.0
+
+# Actions a schedule can run
+SCHEDULE_ACTIONS = ["Terminate Process", "Shutdown", "Restart", "Lock", "Sleep"]
+
+
+class Schedule:
+    """
+    A recurring action: what to run, on which processes, and when.
+    """
+
+    __slots__ = ("id", "rule", "action", "processes", "enabled", "next_fire")
+
+    def __init__(self, rule, action, processes=(), enabled=True, schedule_id=None):
+        """
+        Args:
+            rule (str): Recurrence rule, see services.recurrence.
+            action (str): One of SCHEDULE_ACTIONS.
+            processes (list): Process names for "Terminate Process", matched
+                when the schedule fires.
+            enabled (bool): Disabled schedules are kept but never fire.
+            schedule_id (str): Stable identifier, generated when not given.
+        """
+        if action not in SCHEDULE_ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        # A blank form field arrives as [""]
+        processes = [name.strip() for name in processes if name.strip()]
+        if action == "Terminate Process" and not processes:
+            raise ValueError("Pass the processes to terminate")
+        self.rule = parse_rule(rule)
+        self.action = action
+        self.processes = processes
+        self.enabled = enabled
+        self.id = schedule_id or uuid.uuid4().hex[:8]
+        # Wall clock timestamp of the next fire, None while disabled
+        self.next_fire = None
+
+    def next_after(self, timestamp):
+        return self.rule.next_after(datetime.fromtimestamp(timestamp)).timestamp()
+
+    def describe(self):
+        if self.action == "Terminate Process":
+            return f"Terminate {', '.join(self.processes)}"
+        return self.action
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "rule": self.rule.text,
+            "action": self.action,
+            "processes": list(self.processes),
+            "enabled": self.enabled,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["rule"],
+            data["action"],
+            data.get("processes", []),
+            data.get("enabled", True),
+            data.get("id"),
+        )
+
+
+def run_schedule(schedule):
+    """
+    Default fire handler: runs the action on the action workers. The
+    processes are matched by name there, as PIDs change between fires and
+    enumerating them would hold up the housekeeping thread.
+
+    Returns:
+        ActionHandle: Handle of the submitted action.
+    """
+
+    def find_processes():
+        if not schedule.processes:
+            return []
+        groups = process_manager.get_running_processes(show_all=True, with_icons=False)
+        selected, _ = process_manager.find_process_groups(schedule.processes, groups)
+        if not selected:
+            print(f"Schedule {schedule.id}: no running process matches")
+        return selected
+
+    return ActionExecutor.submit(schedule.action, find_processes)
+
+
+class Scheduler:
+    """
+    Runs recurring schedules.
+
+    The next fire of each schedule is computed from its rule rather than by
+    polling, and the pending fires are kept in a heap. Only the earliest one
+    is handed to the housekeeper, so any number of schedules costs a single
+    pending task on the shared housekeeping thread and at most one wakeup
+    per MAX_SLEEP while idle.
+
+    Heap entries are not removed when a schedule changes; an entry whose
+    time no longer matches its schedule's next_fire is dropped when popped.
+    """
+
+    def __init__(
+        self,
+        housekeeper=None,
+        on_fire=run_schedule,
+        time_func=time.time,
+        max_sleep=MAX_SLEEP,
+        missed_grace=MISSED_GRACE,
+    ):
+        """
+        Args:
+            housekeeper (Housekeeper): Where the wakeup is scheduled, the
+                shared one by default.
+            on_fire (callable): Called with the Schedule when it fires.
+            time_func (callable): Wall clock, injectable for tests.
+            max_sleep (float): Longest delay before the heap is checked again.
+            missed_grace (float): Seconds a fire may be late and still run.
+        """
+        self.housekeeper = housekeeper or shared_housekeeper
+        self.on_fire = on_fire
+        self.time_func = time_func
+        self.max_sleep = max_sleep
+        self.missed_grace = missed_grace
+        self.store = None
+        self._schedules = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        self._task = None
+        self._change_listeners = []
+
+    def add_change_listener(self, callback):
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _notify_change(self):
+        for listener in self._change_listeners:
+            try:
+                listener()
+            except Exception as e:
+                print(f"Error in schedule listener: {e}")
+
+    def load(self, store):
+        """
+        Restores the schedules saved in a SettingsStore and saves every
+        change to it from then on. Entries that no longer parse are dropped.
+        """
+        self.store = store
+        with self._lock:
+            for data in store.get("schedules", []):
+                try:
+                    self._insert(Schedule.from_dict(data))
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"Skipping saved schedule {data!r}: {e}")
+        self._arm()
+        self._notify_change()
+        return self
+
+    def add(self, schedule):
+        with self._lock:
+            self._insert(schedule)
+        self._changed()
+        return schedule
+
+    def remove(self, schedule_id):
+        with self._lock:
+            schedule = self._schedules.pop(schedule_id, None)
+        if schedule is None:
+            return False
+        self._changed()
+        return True
+
+    def set_enabled(self, schedule_id, enabled):
+        with self._lock:
+            schedule = self._schedules[schedule_id]
+            if schedule.enabled == enabled:
+                return schedule
+            schedule.enabled = enabled
+            self._push(schedule, self.time_func())
+        self._changed()
+        return schedule
+
+    def get(self, schedule_id):
+        return self._schedules.get(schedule_id)
+
+    def schedules(self):
+        """
+        Returns:
+            list: The schedules, enabled ones first by next fire.
+        """
+        with self._lock:
+            return sorted(
+                self._schedules.values(),
+                key=lambda s: (s.next_fire is None, s.next_fire or 0, s.id),
+            )
+
+    def next_fire(self):
+        """
+        Returns:
+            float: Wall clock timestamp of the earliest pending fire, or None.
+        """
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None):
+        """
+        Fires every schedule due by `now` and computes its next fire.
+
+        Returns:
+            int: Number of schedules fired.
+        """
+        now = self.time_func() if now is None else now
+        due = []
+        with self._lock:
+            self._drop_stale()
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, _, schedule = heapq.heappop(self._heap)
+                if now - fire_at <= self.missed_grace:
+                    due.append(schedule)
+                # The next fire is after now, never a backlog of missed ones
+                self._push(schedule, now)
+                self._drop_stale()
+
+        for schedule in due:
+            try:
+                self.on_fire(schedule)
+            except Exception as e:
+                print(f"Error running schedule {schedule.id}: {e}")
+        if due:
+            self._notify_change()
+        return len(due)
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _insert(self, schedule):
+        self._schedules[schedule.id] = schedule
+        self._push(schedule, self.time_func())
+
+    def _push(self, schedule, after):
+        if not schedule.enabled:
+            schedule.next_fire = None
+            return
+        schedule.next_fire = schedule.next_after(after)
+        heapq.heappush(self._heap, (schedule.next_fire, next(self._counter), schedule))
+
+    def _drop_stale(self):
+        while self._heap:
+            fire_at, _, schedule = self._heap[0]
+            if (
+                self._schedules.get(schedule.id) is schedule
+                and schedule.next_fire == fire_at
+            ):
+                break
+            heapq.heappop(self._heap)
+
+    def _changed(self):
+        self._arm()
+        if self.store is not None:
+            with self._lock:
+                saved = [s.to_dict() for s in self._schedules.values()]
+            self.store.set("schedules", saved)
+        self._notify_change()
+
+    def _arm(self):
+        """
+        Replaces the pending housekeeper wakeup with one for the earliest fire.
+        """
+        with self._lock:
+            if self._task:
+                self._task.cancel()
+                self._task = None
+            fire_at = self.next_fire()
+            if fire_at is None:
+                return
+            delay = min(max(fire_at - self.time_func(), 0), self.max_sleep)
+            self._task = self.housekeeper.call_later(
+                delay, self._on_wake, name="schedules"
+            )
+
+    def _on_wake(self):
+        self._task = None
+        self.run_due()
+        self._arm()
+
+
+scheduler = Scheduler()
@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+
+# AppState fields that are saved between launches
+PERSISTED_FIELDS = (
+    "dark_mode",
+    "show_system_processes",
+    "process_grouping",
+    "minimize_to_tray",
+)
+
+
+def default_settings_path():
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+            os.path.expanduser("~"), ".config"
+        )
+    return os.path.join(base, "TimetoSleep", "settings.json")
+
+
+class SettingsStore:
+    """
+    Settings kept in a small JSON file. The file is read once by load();
+    after that, reads come from memory and changes are written back on a
+    background thread, `delay` seconds after the last change, so a burst
+    of toggles costs a single write.
+
+    Writes go to a temporary file that replaces the settings file, so a
+    crash mid-write never leaves a truncated file behind.
+    """
+
+    def __init__(self, path=None, delay=0.5):
+        self.path = path or default_settings_path()
+        self.delay = delay
+        self._values = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def load(self):
+        """
+        Reads the settings file. A missing or unreadable file gives empty
+        settings, so every caller falls back to its own defaults.
+
+        Returns:
+            SettingsStore: self, for chaining.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                values = json.loads(f.read())
+        except (OSError, ValueError):
+            values = {}
+        with self._lock:
+            self._values = values if isinstance(values, dict) else {}
+        return self
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, values):
+        """
+        Changes several settings at once and schedules a write if any of
+        them differ from the stored values.
+        """
+        with self._lock:
+            changed = {k: v for k, v in values.items() if self._values.get(k) != v}
+            if not changed:
+                return
+            self._values.update(changed)
+            self._dirty = True
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def bind(self, state, fields=PERSISTED_FIELDS):
+        """
+        Applies the stored values to an AppState and saves the fields
+        whenever they change from then on.
+        """
+        with state.batch():
+            for field in fields:
+                if field in self._values:
+                    setattr(state, field, self._values[field])
+        for field in fields:
+            state.subscribe(field, lambda value, f=field: self.set(f, value))
+
+    def flush(self):
+        """
+        Writes pending changes now. Called by the write timer, and on exit
+        so the last changes are not lost.
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            data = json.dumps(self._values, separators=(",", ":"))
+            self._dirty = False
+
+        try:
+            folder = os.path.dirname(self.path)
+            os.makedirs(folder, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temp_path, self.path)
+            except OSError:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            print(f"Failed to save settings: {e}")
+
+
+settings = SettingsStore()
@@ -0,0 +1,242 @@
+import functools
+import os
+from collections import Counter
+import json
+import threading
+import time
+
+# Histogram buckets are powers of two in nanoseconds, so the bucket of a
+# sample is its bit length, with no search. Bucket 0 holds samples up to
+# 2**FIRST_BUCKET_BITS ns (~1 µs); the last one holds everything from
+# 2**(FIRST_BUCKET_BITS + BUCKET_COUNT - 2) ns (~17 s) up.
+FIRST_BUCKET_BITS = 10
+BUCKET_COUNT = 26
+BUCKET_BOUNDS_NS = tuple(2 ** (FIRST_BUCKET_BITS + i) for i in range(BUCKET_COUNT - 1))
+
+
+def bucket_index(ns):
+    return min(max(ns.bit_length() - FIRST_BUCKET_BITS, 0), BUCKET_COUNT - 1)
+
+
+def _format_bound(ns):
+    if ns >= 10**9:
+        return f"{ns / 10**9:.3g}s"
+    if ns >= 10**6:
+        return f"{ns / 10**6:.3g}ms"
+    return f"{ns / 10**3:.3g}us"
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Samples are appended to a list and folded into the buckets in chunks
+    (or when read), so recording costs one list append on the hot path.
+    """
+
+    __slots__ = ("count", "total", "max", "buckets", "pending")
+
+    # Pending samples folded into the buckets at once
+    FOLD_AT = 1024
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * BUCKET_COUNT
+        self.pending = []
+
+    def record(self, ns):
+        self.pending.append(ns)
+        if len(self.pending) >= self.FOLD_AT:
+            self.fold()
+
+    def fold(self):
+        pending = self.pending
+        n = len(pending)
+        # Sliced in place, so appends racing with the fold are kept
+        samples = pending[:n]
+        del pending[:n]
+        # Counted by bit length in C, then mapped onto the few buckets
+        for bits, hits in Counter(map(int.bit_length, samples)).items():
+            self.buckets[bucket_index(1 << bits >> 1)] += hits
+        if samples:
+            self.count += n
+            self.total += sum(samples)
+            self.max = max(self.max, max(samples))
+
+    def clear(self):
+        self.count = self.total = self.max = 0
+        self.buckets[:] = [0] * BUCKET_COUNT
+        del self.pending[:]
+
+    def percentile(self, q):
+        """
+        Call fold() first to include pending samples.
+
+        Returns:
+            int: Upper bound in ns of the bucket holding the q-th quantile
+                (the observed maximum for the overflow bucket).
+        """
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                if index < len(BUCKET_BOUNDS_NS):
+                    return min(BUCKET_BOUNDS_NS[index], self.max)
+                break
+        return self.max
+
+    def to_dict(self):
+        self.fold()
+        buckets = {
+            f"<={_format_bound(bound)}": n
+            for bound, n in zip(BUCKET_BOUNDS_NS, self.buckets)
+            if n
+        }
+        if self.buckets[-1]:
+            buckets[f">{_format_bound(BUCKET_BOUNDS_NS[-1])}"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "total_ms": self.total / 1e6,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0,
+            "max_us": self.max / 1e3,
+            "p50_us": self.percentile(0.5) / 1e3,
+            "p95_us": self.percentile(0.95) / 1e3,
+            "buckets": buckets,
+        }
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter_ns() - self.start)
+        return False
+
+
+class Telemetry:
+    """
+    Named counters and latency histograms for the app's hot paths.
+
+    Disabled by default; while disabled, instrumented calls only check a
+    flag. Updates are not locked: under the GIL a concurrent increment can
+    occasionally be lost, which is acceptable for diagnostics and keeps the
+    recording cost low.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.time()
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram())
+        return histogram
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def record(self, name, ns):
+        if self.enabled:
+            self.histogram(name).record(ns)
+
+    def timer(self, name):
+        """
+        Context manager that records the time spent in its block.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name))
+
+    def timed(self, name):
+        """
+        Decorator that records the duration of every call.
+        """
+
+        def decorator(func):
+            histogram = self.histogram(name)
+            clock = time.perf_counter_ns
+
+            pending = histogram.pending
+            append = pending.append
+            fold_at = Histogram.FOLD_AT
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    # Histogram.record(), inlined to keep the wrapper cheap
+                    append(clock() - start)
+                    if len(pending) >= fold_at:
+                        histogram.fold()
+
+            return wrapper
+
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            for histogram in self._histograms.values():
+                # Cleared in place, timed() wrappers hold on to these objects
+                histogram.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: { 'enabled': bool, 'since': float (epoch), 'counters': dict,
+                    'histograms': {name: dict} } for histograms with samples.
+        """
+        return {
+            "enabled": self.enabled,
+            "since": self.started,
+            "counters": dict(self._counters),
+            "histograms": {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self._histograms.items())
+                if histogram.count or histogram.pending
+            },
+        }
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+
+# Also switched on from the Diagnostics settings; the variable is for
+# headless runs and measuring startup
+telemetry = Telemetry(enabled=os.environ.get("TIMETOSLEEP_TELEMETRY") == "1")
@@ -0,0 +1,71 @@
+import re
+from datetime import datetime, time, timedelta
+
+_DURATION_RE = re.compile(r"(\d+)\s*([hms])", re.IGNORECASE)
+
+
+def countdown_seconds(hours=0, minutes=0, seconds=0):
+    """
+    Converts a countdown into seconds. Raises ValueError for negative parts.
+    """
+    hours, minutes, seconds = int(hours or 0), int(minutes or 0), int(seconds or 0)
+    if hours < 0 or minutes < 0 or seconds < 0:
+        raise ValueError("Time parts cannot be negative")
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def next_occurrence(target_time, now=None):
+    """
+    Returns the next datetime at which the wall clock shows target_time,
+    today if it is still ahead, otherwise tomorrow.
+    """
+    now = now or datetime.now()
+    target = datetime.combine(now.date(), target_time)
+    if target <= now:
+        target += timedelta(days=1)
+    return target
+
+
+def seconds_until(target_time, now=None):
+    """
+    Returns the whole seconds from now until the next occurrence of target_time.
+    """
+    now = now or datetime.now()
+    return int((next_occurrence(target_time, now) - now).total_seconds())
+
+
+def parse_duration(text):
+    """
+    Parses durations such as "2h30m", "45m", "90s" or a plain number of
+    minutes ("20"). Raises ValueError for anything else.
+    """
+    text = text.strip()
+    if text.isdigit():
+        return int(text) * 60
+
+    matches = _DURATION_RE.findall(text)
+    if not matches or _DURATION_RE.sub("", text).strip():
+        raise ValueError(f"Invalid duration: {text!r}")
+
+    parts = {"h": 0, "m": 0, "s": 0}
+    for value, unit in matches:
+        parts[unit.lower()] += int(value)
+    return countdown_seconds(parts["h"], parts["m"], parts["s"])
+
+
+def parse_clock(text):
+    """
+    Parses a wall clock time such as "23:30" or "07:05:30".
+    """
+    for fmt in ("%H:%M", "%H:%M:%S"):
+        try:
+            return datetime.strptime(text.strip(), fmt).time()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time: {text!r}")
+
+
+def format_duration(seconds):
+    mins, secs = divmod(int(seconds), 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours:02d}:{mins:02d}:{secs:02d}"
@@ -1,13 +1,35 @@
 import threading
-import time
+from services.housekeeping import housekeeper as default_housekeeper
+from services.profiler import profiler
+from services.telemetry import telemetry
 
 
 class TimerService:
-    def __init__(self):
-        self._timer_thread = None
+    """
+    Counts down towards a deadline on the housekeeper's clock. Each tick
+    works out the remaining time from the deadline instead of subtracting
+    one per tick, so late or skipped ticks (a busy thread, a suspended
+    machine, a VirtualClock jump) never make the timer drift.
+    """
+
+    def __init__(self, housekeeper=None):
+        """
+        Args:
+            housekeeper (Housekeeper): Runs the once-a-second ticks and
+                provides the clock (its time_func). Defaults to the shared
+                one, so ticks share wakeups with other work.
+        """
+        self.housekeeper = housekeeper or default_housekeeper
+        self._deadline = 0.0
+        self._task = None
+        self._first_task = None
+        self._lock = threading.Lock()
         self._running = False
         self._paused = False
-        self._stop_event = threading.Event()
+        self._remaining = 0
+        self._total = 0
+        self._on_tick = None
+        self._on_finish = None
         self._tick_listeners = []
         self._finish_listeners = []
         self._pause_listeners = []
@@ -38,82 +60,110 @@ class TimerService:
 
     def start_timer(self, total_seconds, on_tick, on_finish):
         """
-        Starts a countdown timer in a separate thread.
+        Starts a countdown timer on the housekeeping thread.
 
         Args:
             total_seconds (int): Duration of the timer in seconds.
             on_tick (callable): Callback function called every second with (remaining_seconds, total_seconds).
             on_finish (callable): Callback function called when the timer reaches 0.
         """
-        if self._running:
-            return
+        with self._lock:
+            if self._running:
+                return
 
-        self._running = True
-        self._paused = False
-        self._stop_event.clear()
-
-        def run():
-            remaining_seconds = total_seconds
-            while remaining_seconds > 0 and not self._stop_event.is_set():
-                if self._paused:
-                    time.sleep(0.1)
-                    continue
-
-                if on_tick:
-                    on_tick(remaining_seconds, total_seconds)
-
-                for listener in self._tick_listeners:
-                    try:
-                        listener(remaining_seconds, total_seconds)
-                    except Exception as e:
-                        print(f"Error in tick listener: {e}")
-
-                # Sleep in small chunks to allow faster cancellation response
-                for _ in range(10):
-                    if self._stop_event.is_set():
-                        break
-                    time.sleep(0.1)
-
-                if not self._stop_event.is_set():
-                    remaining_seconds -= 1
-
-            self._running = False
+            self._running = True
             self._paused = False
+            self._remaining = total_seconds
+            self._total = total_seconds
+            self._deadline = self.housekeeper.time_func() + total_seconds
+            self._on_tick = on_tick
+            self._on_finish = on_finish
+            self._schedule()
+
+    def _schedule(self):
+        # First tick right away, then one per second
+        self._task = self.housekeeper.call_every(
+            1.0, self._advance, first_delay=1.0, name="timer"
+        )
+        self._first_task = self.housekeeper.call_later(
+            0, self._first_tick, name="timer"
+        )
+
+    def _unschedule(self):
+        for task in (self._task, self._first_task):
+            if task:
+                task.cancel()
+        self._task = None
+        self._first_task = None
+
+    def _first_tick(self):
+        with self._lock:
+            if not self._running or self._paused:
+                return
+            remaining = self._remaining
+        self._notify_tick(remaining)
+
+    def _advance(self):
+        with self._lock:
+            if not self._running or self._paused:
+                return
+            remaining = max(0, round(self._deadline - self.housekeeper.time_func()))
+            if remaining == self._remaining:
+                return
+            self._remaining = remaining
+            if remaining <= 0:
+                self._unschedule()
+                self._running = False
+                self._paused = False
+
+        self._notify_tick(remaining)
+        if remaining <= 0:
+            # Timer finished naturally
+            if self._on_finish:
+                self._on_finish()
+            for listener in self._finish_listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    print(f"Error in finish listener: {e}")
+
+    @telemetry.timed("timer.tick_dispatch")
+    @profiler.section("timer_tick")
+    def _notify_tick(self, remaining):
+        if self._on_tick:
+            try:
+                self._on_tick(remaining, self._total)
+            except Exception as e:
+                print(f"Error in tick callback: {e}")
 
-            if not self._stop_event.is_set():
-                # Timer finished naturally
-                if on_tick:
-                    on_tick(0, total_seconds)
-                for listener in self._tick_listeners:
-                    try:
-                        listener(0, total_seconds)
-                    except Exception:
-                        pass
-
-                if on_finish:
-                    on_finish()
-                for listener in self._finish_listeners:
-                    try:
-                        listener()
-                    except Exception as e:
-                        print(f"Error in finish listener: {e}")
-
-        self._timer_thread = threading.Thread(target=run, daemon=True)
-        self._timer_thread.start()
+        for listener in self._tick_listeners:
+            try:
+                listener(remaining, self._total)
+            except Exception as e:
+                print(f"Error in tick listener: {e}")
 
     def pause_timer(self):
-        self._paused = True
-        self._notify_pause_listeners()
+        self._set_paused(True)
 
     def resume_timer(self):
-        self._paused = False
-        self._notify_pause_listeners()
+        self._set_paused(False)
 
     def toggle_pause(self):
-        self._paused = not self._paused
-        self._notify_pause_listeners()
+        self._set_paused(not self._paused)
         return self._paused
 
+    def _set_paused(self, paused):
+        with self._lock:
+            if self._running and paused != self._paused:
+                # A paused timer has nothing to do, so it costs no wakeups
+                self._unschedule()
+                if not paused:
+                    # Resumes with the whole seconds shown when it was paused
+                    self._deadline = self.housekeeper.time_func() + self._remaining
+                    self._schedule()
+            self._paused = paused
+        self._notify_pause_listeners()
+
     def is_paused(self):
         return self._paused
 
@@ -121,16 +171,27 @@ class TimerService:
         """
         Cancels the currently running timer.
         """
-        if self._running:
-            self._stop_event.set()
-            if self._timer_thread:
-                self._timer_thread.join(timeout=1.0)
-            self._running = False
-            self._paused = False
+        with self._lock:
+            if self._running:
+                self._unschedule()
+                self._running = False
+                self._paused = False
 
     def is_running(self):
         return self._running
 
+    def get_status(self):
+        """
+        Returns:
+            dict: { 'running': bool, 'paused': bool, 'remaining_seconds': int, 'total_seconds': int }
+        """
+        return {
+            "running": self._running,
+            "paused": self._paused,
+            "remaining_seconds": self._remaining if self._running else 0,
+            "total_seconds": self._total if self._running else 0,
+        }
+
     def _notify_pause_listeners(self):
         for listener in self._pause_listeners:
             try:
@@ -0,0 +1,67 @@
+from PIL import Image, ImageDraw
+
+ICON_SIZE = 64
+# Frames per ring, i.e. the ring moves in 5% steps
+FRAME_STEPS = 20
+
+RING_COLOR = (66, 165, 245, 255)  # blue400
+PAUSED_COLOR = (255, 167, 38, 255)  # orange400
+TRACK_COLOR = (97, 97, 97, 255)  # grey700
+
+
+def render_ring(fraction, base=None, color=RING_COLOR, size=ICON_SIZE):
+    """
+    Draws a progress ring that starts at 12 o'clock and runs clockwise,
+    with the app icon shrunk in the middle.
+
+    Args:
+        fraction (float): Part of the ring to fill, 0 to 1.
+        base (PIL.Image): Optional, the icon drawn inside the ring.
+    """
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    width = max(2, size // 8)
+    box = (width // 2, width // 2, size - 1 - width // 2, size - 1 - width // 2)
+
+    draw.ellipse(box, outline=TRACK_COLOR, width=width)
+    if fraction > 0:
+        draw.arc(box, start=-90, end=-90 + 360 * fraction, fill=color, width=width)
+
+    if base is not None:
+        inner = size - 3 * width
+        icon = base.convert("RGBA").resize((inner, inner), Image.LANCZOS)
+        offset = (size - inner) // 2
+        image.alpha_composite(icon, (offset, offset))
+    return image
+
+
+class ProgressIcons:
+    """
+    Every ring frame rendered once up front, so showing progress is a
+    lookup instead of drawing an image on each tick.
+    """
+
+    def __init__(self, base=None, steps=FRAME_STEPS, size=ICON_SIZE):
+        self.steps = steps
+        self._frames = {
+            paused: [
+                render_ring(
+                    i / steps,
+                    base,
+                    PAUSED_COLOR if paused else RING_COLOR,
+                    size,
+                )
+                for i in range(steps + 1)
+            ]
+            for paused in (False, True)
+        }
+
+    def step(self, fraction):
+        """
+        Returns:
+            int: Index of the frame that shows `fraction`, 0 to `steps`.
+        """
+        return min(self.steps, max(0, round(fraction * self.steps)))
+
+    def frame(self, fraction, paused=False):
+        return self._frames[paused][self.step(fraction)]
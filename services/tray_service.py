@@ -2,6 +2,8 @@ import pystray
 from PIL import Image
 import threading
 from state import app_state
+from services.action_executor import ActionExecutor
+from services.tray_icons import ProgressIcons
 import os
 import sys
 
@@ -21,7 +23,17 @@ class TrayService:
     def __init__(self, icon_path="assets/icon.ico"):
         self.icon_path = resource_path(icon_path)
         self.icon = None
+        self.idle_image = None
+        self.progress_icons = None
         self._thread = None
+        # Last values seen, so the tooltip can be rebuilt without polling
+        self._timer = app_state.timer
+        self._remaining = 0
+        self._total = 0
+        self._paused = False
+        # What the tray currently shows, to skip assignments that change nothing
+        self._shown_title = None
+        self._shown_image = None
         # Bind handlers
         self.on_open_handler = self._default_on_open
         self.on_exit_handler = self._default_on_exit
@@ -66,6 +78,9 @@ class TrayService:
 
         try:
             image = Image.open(self.icon_path)
+            self.idle_image = image
+            # Built once here, so a tick only swaps in a ready-made frame
+            self.progress_icons = ProgressIcons(image)
 
             # Define menu
             menu = pystray.Menu(
@@ -79,6 +94,8 @@ class TrayService:
             )
 
             self.icon = pystray.Icon("TimeToSleep", image, "Time to Sleep", menu)
+            self._shown_title = "Time to Sleep"
+            self._shown_image = image
         except Exception as e:
             print(f"Failed to setup tray icon: {e}")
 
@@ -101,32 +118,81 @@ class TrayService:
                 app_state.timer_service.add_tick_listener(self.update_tooltip)
                 app_state.timer_service.add_finish_listener(self.on_timer_finish)
                 app_state.timer_service.add_pause_listener(self.on_pause_change)
+            app_state.subscribe("timer", self.on_timer_info_change)
+            ActionExecutor.add_completion_listener(self.on_action_complete)
 
     def on_pause_change(self, is_paused):
+        self._paused = is_paused
         if self.icon:
             # This triggers re-evaluation of menu items (checked state)
             self.icon.update_menu()
+            if self._total:
+                self.render_progress()
+
+    def on_timer_info_change(self, timer):
+        self._timer = timer
+        if not self._total:
+            return
+        if timer:
+            self.render_progress()
+        else:
+            # Cancelled from the window or the control API
+            self.show_idle("Time to Sleep")
 
     def update_tooltip(self, remaining, total):
+        self._remaining = remaining
+        self._total = total
+        self.render_progress()
+
+    def set_title(self, title):
+        if self.icon and title != self._shown_title:
+            self._shown_title = title
+            self.icon.title = title
+
+    def set_image(self, image):
+        # Frames are cached, so an unchanged frame is the very same object
+        if self.icon and image is not None and image is not self._shown_image:
+            self._shown_image = image
+            self.icon.icon = image
+
+    def show_idle(self, title):
+        self._total = 0
+        self._paused = False
+        self.set_title(title)
+        self.set_image(self.idle_image)
+
+    def render_progress(self):
         if self.icon:
+            remaining, total = self._remaining, self._total
             percent = int((remaining / total) * 100) if total > 0 else 0
             time_str = self.format_time(remaining)
 
             # Construct detailed tooltip
-            status = app_state.timer_config.get("status", "Running")
-            action = app_state.timer_config.get("action", "")
-            target = app_state.timer_config.get("target", "")
+            timer = self._timer
+            status = timer.status if timer else "Running"
+            action = timer.action if timer else ""
+            target = timer.target if timer else ""
 
             tooltip = f"Percentage: {percent}%\nTime Left: {time_str}\nStatus: {status}\nAction: {action}"
             if target and target != "System":
                 tooltip += f" ({target})"
 
-            self.icon.title = tooltip
+            self.set_title(tooltip)
+            if self.progress_icons and total > 0:
+                self.set_image(
+                    self.progress_icons.frame(remaining / total, self._paused)
+                )
 
     def on_timer_finish(self):
+        self.show_idle("Time to Sleep - Finished")
+
+    def on_action_complete(self, result):
         if self.icon:
-            self.icon.title = "Time to Sleep - Finished"
-            self.show_notification("Timer Finished", "Your timer has finished.")
+            title = "Action Finished" if result.get("success") else "Action Failed"
+            message = result.get("message")
+            if not message and result.get("type") == "termination":
+                message = f"Terminated {result.get('count', 0)}/{result.get('total', 0)} apps."
+            self.show_notification(title, message or "Your timer has finished.")
 
     def format_time(self, seconds):
         mins, secs = divmod(seconds, 60)
@@ -139,13 +205,7 @@ class TrayService:
         return app_state.timer_service.is_paused() if app_state.timer_service else False
 
     def on_open_click(self, icon, item):
-        if app_state.page:
-            app_state.page.window.visible = True
-            app_state.page.update()
-            # Restore window if minimized (though we handle visibility)
-            app_state.page.window.minimized = False
-            app_state.page.window.center()
-            app_state.page.window.to_front()  # Bring to front
+        app_state.show_window()
 
     def on_pause_click(self, icon, item):
         if app_state.timer_service and app_state.timer_service.is_running():
@@ -154,8 +214,8 @@ class TrayService:
     def on_cancel_click(self, icon, item):
         if app_state.timer_service and app_state.timer_service.is_running():
             app_state.timer_service.cancel_timer()
-            if self.icon:
-                self.icon.title = "Time to Sleep"
+            app_state.timer = None
+            self.show_idle("Time to Sleep")
 
     def on_exit_click(self, icon, item):
         self.stop()
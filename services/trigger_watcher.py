@@ -0,0 +1,213 @@
+import threading
+
+
+class TriggerWatcher:
+    """
+    Base class for triggers that fire once a system condition is met.
+
+    Subclasses implement `poll()`, which samples whatever they watch and returns
+    the number of seconds to wait before the next poll. Calling `self.fire()`
+    from `poll()` ends the watch and notifies the fire listeners, the same way
+    TimerService notifies its finish listeners. Watchers with `one_shot = False`
+    keep running after firing, so they can re-arm themselves.
+    """
+
+    one_shot = True
+
+    def __init__(self):
+        self._thread = None
+        self._running = False
+        self._paused = False
+        self._fired = False
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._on_update = None
+        self._on_fire = None
+        self._update_listeners = []
+        self._fire_listeners = []
+        self._pause_listeners = []
+
+    def add_update_listener(self, callback):
+        if callback not in self._update_listeners:
+            self._update_listeners.append(callback)
+
+    def remove_update_listener(self, callback):
+        if callback in self._update_listeners:
+            self._update_listeners.remove(callback)
+
+    def add_fire_listener(self, callback):
+        if callback not in self._fire_listeners:
+            self._fire_listeners.append(callback)
+
+    def remove_fire_listener(self, callback):
+        if callback in self._fire_listeners:
+            self._fire_listeners.remove(callback)
+
+    def add_pause_listener(self, callback):
+        if callback not in self._pause_listeners:
+            self._pause_listeners.append(callback)
+
+    def remove_pause_listener(self, callback):
+        if callback in self._pause_listeners:
+            self._pause_listeners.remove(callback)
+
+    def start(self, on_update=None, on_fire=None):
+        """
+        Starts watching in a separate thread.
+
+        Args:
+            on_update (callable): Called with a status dict after every poll.
+            on_fire (callable): Called when the condition is met.
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._paused = False
+        self._fired = False
+        self._on_update = on_update
+        self._on_fire = on_fire
+        self._stop_event.clear()
+        self._wake_event.clear()
+        self.reset()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops watching without firing.
+        """
+        if self._running:
+            self._stop_event.set()
+            self.wake()
+            if self._thread and self._thread is not threading.current_thread():
+                self._thread.join(timeout=1.0)
+            self._running = False
+            self._paused = False
+
+    def pause(self):
+        self._paused = True
+        self.wake()
+        self._notify_pause_listeners()
+
+    def resume(self):
+        self._paused = False
+        self.wake()
+        self._notify_pause_listeners()
+
+    def toggle_pause(self):
+        if self._paused:
+            self.resume()
+        else:
+            self.pause()
+        return self._paused
+
+    def is_paused(self):
+        return self._paused
+
+    def is_running(self):
+        return self._running
+
+    def reset(self):
+        """
+        Clears sampling state. Called on start and again after a resume, so
+        time spent paused never counts towards a sustained condition.
+        """
+
+    def poll(self):
+        """
+        Samples the watched condition once.
+
+        Returns:
+            float: Seconds to wait before the next poll.
+        """
+        raise NotImplementedError
+
+    def cleanup(self):
+        """
+        Releases resources held by the watcher. Called from the watcher thread
+        when it exits, whether the watcher fired or was stopped.
+        """
+
+    def wake(self):
+        """
+        Interrupts the wait between polls. Subclasses that block inside
+        `poll()` override this to interrupt that wait as well.
+        """
+        self._wake_event.set()
+
+    def fire(self):
+        self._fired = True
+
+    def step(self):
+        """
+        Polls once, then notifies the fire listeners if a re-arming watcher
+        fired. This is one turn of the watcher thread, also usable to drive
+        a watcher without it; a one-shot watcher that fired stays fired.
+
+        Returns:
+            float: Seconds to wait before the next poll.
+        """
+        delay = self.poll()
+        if self._fired and not self.one_shot and not self._stop_event.is_set():
+            self._fired = False
+            self._notify_fire_listeners()
+        return delay
+
+    def emit_update(self, status):
+        if self._on_update:
+            self._on_update(status)
+        for listener in self._update_listeners:
+            try:
+                listener(status)
+            except Exception as e:
+                print(f"Error in update listener: {e}")
+
+    def _run(self):
+        while not self._stop_event.is_set() and not self._fired:
+            if self._paused:
+                self._wake_event.wait()
+                self._wake_event.clear()
+                if not self._paused:
+                    self.reset()
+                continue
+
+            try:
+                delay = self.step()
+            except Exception as e:
+                print(f"Error in {self.__class__.__name__}: {e}")
+                delay = 1.0
+
+            if self._stop_event.is_set() or self._fired:
+                break
+
+            self._wake_event.wait(delay)
+            self._wake_event.clear()
+
+        try:
+            self.cleanup()
+        except Exception as e:
+            print(f"Error cleaning up {self.__class__.__name__}: {e}")
+
+        self._running = False
+        self._paused = False
+
+        if self._fired and not self._stop_event.is_set():
+            self._notify_fire_listeners()
+
+    def _notify_fire_listeners(self):
+        if self._on_fire:
+            self._on_fire()
+        for listener in self._fire_listeners:
+            try:
+                listener()
+            except Exception as e:
+                print(f"Error in fire listener: {e}")
+
+    def _notify_pause_listeners(self):
+        for listener in self._pause_listeners:
+            try:
+                listener(self._paused)
+            except Exception as e:
+                print(f"Error in pause listener: {e}")
@@ -0,0 +1,179 @@
+"""
+Keeps a single Time to Sleep app per user.
+
+The first launch takes a lock file and serves the control API. A later launch
+finds the lock held, hands its arguments to the running app over the control
+channel (show the window, start a timer) and exits, before flet or the tray
+are imported.
+
+    python main.py                              # shows the running window
+    python main.py --after 45m --action sleep
+    python main.py --at 23:30 --terminate chrome,steam
+"""
+
+import argparse
+import os
+import sys
+import time
+from services.control_address import default_lock_path
+
+SYSTEM_ACTIONS = ("shutdown", "restart", "lock", "sleep")
+
+
+class InstanceLock:
+    """
+    An exclusive, non-blocking lock on a file. The OS drops it when the
+    process exits, so a crashed instance never leaves a stale lock behind.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_lock_path()
+        self._file = None
+
+    def acquire(self):
+        """
+        Returns:
+            bool: True if this process now holds the lock, False if another does.
+        """
+        lock_file = open(self.path, "a+")
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        # The PID is only informational, the lock itself is what counts
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def is_held(self):
+        return self._file is not None
+
+    def held_elsewhere(self):
+        """
+        Returns:
+            bool: True if another process holds the lock right now.
+        """
+        if self._file is not None:
+            return False
+        if self.acquire():
+            self.release()
+            return False
+        return True
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Time to Sleep, an app-aware sleep timer."
+    )
+    when = parser.add_mutually_exclusive_group()
+    when.add_argument("--after", metavar="DURATION", help="e.g. 2h30m, 45m, 90s")
+    when.add_argument("--at", metavar="HH:MM", help="next time the clock shows this")
+    what = parser.add_mutually_exclusive_group()
+    what.add_argument(
+        "--terminate", metavar="NAMES", help="comma separated process names"
+    )
+    what.add_argument("--action", choices=SYSTEM_ACTIONS, help="system action to run")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=("sample", "cprofile"),
+        help="record a profile from startup (see services/profiler.py)",
+    )
+    parser.add_argument(
+        "--profile-seconds",
+        type=float,
+        default=60,
+        metavar="SECONDS",
+        help="length of the profiling window",
+    )
+    return parser
+
+
+def launch_commands(argv):
+    """
+    Translates launch arguments into control API commands.
+
+    Returns:
+        list: Command dicts, starting with "app.show".
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    commands = [{"cmd": "app.show"}]
+
+    if not (args.after or args.at):
+        if args.terminate or args.action:
+            parser.error("--terminate and --action need --after or --at")
+        return commands
+    if not (args.terminate or args.action):
+        parser.error("--after and --at need --terminate or --action")
+
+    timer = {"after": args.after} if args.after else {"at": args.at}
+    if args.terminate:
+        timer.update(action="Terminate Process", processes=args.terminate)
+    else:
+        timer["action"] = args.action.capitalize()
+    commands.append({"cmd": "timer.start", "args": timer})
+    return commands
+
+
+def hand_off(commands, address=None, lock_path=None, timeout=60.0, delay=0.1):
+    """
+    Sends commands to the running instance. The lock is taken before the
+    control server is up, so a launch racing a starting instance keeps
+    retrying the connection for as long as that instance holds the lock.
+
+    Args:
+        lock_path (str): The instance lock, the per-user one by default.
+        timeout (float): Seconds after which a running but silent instance
+            counts as hung.
+
+    Returns:
+        int: Process exit code.
+    """
+    from control_client import ControlClient
+
+    client = ControlClient(address, timeout=2.0)
+    lock = InstanceLock(lock_path)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client.connect()
+            break
+        except OSError:
+            pass
+        if not lock.held_elsewhere():
+            print("Time to Sleep exited before taking the commands.", file=sys.stderr)
+            return 1
+        if time.monotonic() >= deadline:
+            print(
+                "Time to Sleep is already running but not responding.",
+                file=sys.stderr,
+            )
+            return 1
+        time.sleep(delay)
+
+    with client:
+        replies = client.request(commands)
+    failed = [r for r in replies if not r.get("ok")]
+    for reply in failed:
+        print(f"error: {reply.get('error')}", file=sys.stderr)
+    return 1 if failed else 0
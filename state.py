@@ -1,24 +1,168 @@
-import flet as ft
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    # Only for annotations, so headless code can use the state without flet
+    import flet as ft
+    from services.control_server import ControlServer
+    from services.timer_service import TimerService
+
+
+class TimerInfo:
+    """
+    Describes the running timer for the tray and the control API. Instances
+    are not changed in place; use replace() and assign the copy to
+    AppState.timer so subscribers are notified.
+    """
+
+    __slots__ = ("action", "target", "status", "total_seconds")
+
+    def __init__(self, action="", target="", status="Running", total_seconds=0):
+        self.action = action
+        self.target = target
+        self.status = status
+        self.total_seconds = total_seconds
+
+    def replace(self, **changes):
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return TimerInfo(**values)
+
+    def __eq__(self, other):
+        if not isinstance(other, TimerInfo):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __repr__(self):
+        return f"TimerInfo({self.action!r}, {self.target!r}, {self.status!r}, {self.total_seconds})"
 
 
 class AppState:
+    """
+    Shared application state. Assigning a field notifies the callbacks
+    subscribed to that field, only if the value actually changed.
+
+    Writes are serialized by a lock. Inside `with app_state.batch():` the
+    writes are applied together and each changed field notifies once, after
+    the batch, with its final value.
+    """
+
+    FIELDS = (
+        "page",
+        "dark_mode",
+        "show_system_processes",
+        "process_grouping",
+        "minimize_to_tray",
+        "timer_service",
+        "timer",
+        "control_server",
+    )
+    __slots__ = FIELDS + ("_lock", "_subscribers", "_batch_depth", "_pending")
+
+    page: Optional["ft.Page"]
+    dark_mode: bool
+    show_system_processes: bool
+    process_grouping: str
+    minimize_to_tray: bool
+    timer_service: Optional["TimerService"]
+    timer: Optional[TimerInfo]
+    control_server: Optional["ControlServer"]
+
     def __init__(self):
-        self.page: ft.Page = None
+        self._lock = threading.RLock()
+        self._subscribers = {name: [] for name in self.FIELDS}
+        self._batch_depth = 0
+        self._pending = {}
+
+        self.page = None
+        self.dark_mode = True
         self.show_system_processes = False
+        # One of process_manager.GROUPINGS
+        self.process_grouping = "name"
         self.minimize_to_tray = True
         self.timer_service = None
-        self.minimize_to_tray = True
-        self.timer_service = None
-        self.refresh_processes_callback = None
-        self.timer_config = {}
+        self.timer = None
+        self.control_server = None
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        if name not in self.FIELDS:
+            raise AttributeError(f"AppState has no field {name!r}")
+
+        with self._lock:
+            old = getattr(self, name, None)
+            object.__setattr__(self, name, value)
+            if old is value or (type(old) is type(value) and old == value):
+                return
+            if self._batch_depth:
+                self._pending[name] = value
+                return
+        # Outside the lock, so a callback can write to the state again
+        self._notify({name: value})
+
+    def subscribe(self, field, callback: Callable):
+        """
+        Calls `callback(value)` whenever `field` changes.
+
+        Returns:
+            callable: Removes the subscription when called.
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"Unknown state field: {field}")
+        with self._lock:
+            if callback not in self._subscribers[field]:
+                self._subscribers[field].append(callback)
+        return lambda: self.unsubscribe(field, callback)
+
+    def unsubscribe(self, field, callback):
+        with self._lock:
+            if callback in self._subscribers[field]:
+                self._subscribers[field].remove(callback)
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                pending = {}
+                if not self._batch_depth:
+                    pending, self._pending = self._pending, {}
+        if pending:
+            self._notify(pending)
+
+    def _notify(self, changes):
+        for name, value in changes.items():
+            with self._lock:
+                callbacks = list(self._subscribers[name])
+            for callback in callbacks:
+                try:
+                    callback(value)
+                except Exception as e:
+                    print(f"Error in state subscriber for {name}: {e}")
 
-    def set_page(self, page: ft.Page):
+    def set_page(self, page: "ft.Page"):
         self.page = page
 
-    def toggle_system_processes(self, value):
-        self.show_system_processes = value
-        if self.refresh_processes_callback:
-            self.refresh_processes_callback()
+    def show_window(self):
+        """
+        Shows the window and brings it to the front, e.g. from the tray or
+        when the app is launched again.
+        """
+        if not self.page:
+            return False
+        self.page.window.visible = True
+        self.page.update()
+        # Restore window if minimized (though we handle visibility)
+        self.page.window.minimized = False
+        self.page.window.center()
+        self.page.window.to_front()  # Bring to front
+        return True
 
 
 app_state = AppState()
@@ -0,0 +1,263 @@
+import unittest
+import threading
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import load_harness
+import process_manager
+from backends.processes import FakeProcessBackend, set_process_backend
+from backends.system import SystemBackend, set_system_backend
+from services.action_executor import ActionExecutor, ActionHandle
+from state import TimerInfo, app_state
+
+
+class BlockingSystemBackend(SystemBackend):
+    """
+    Records the actions run; "Lock" blocks until `release` is set.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def lock(self):
+        self.started.set()
+        self.release.wait(30)
+        self.calls.append("lock")
+
+    def sleep(self):
+        self.calls.append("sleep")
+
+    def shutdown(self):
+        self.calls.append("shutdown")
+
+    def restart(self):
+        self.calls.append("restart")
+
+
+class TestActionHandle(unittest.TestCase):
+    def test_done_resolves_once(self):
+        handle = ActionHandle("Lock")
+        results = []
+        handle.add_done_callback(results.append)
+        self.assertFalse(handle.done())
+
+        self.assertTrue(handle.resolve({"success": True}))
+        self.assertFalse(handle.resolve({"success": False}))
+        self.assertTrue(handle.done())
+        self.assertEqual(results, [{"success": True}])
+
+        # Added after the fact, runs at once
+        handle.add_done_callback(results.append)
+        self.assertEqual(len(results), 2)
+
+    def test_cancel(self):
+        handle = ActionHandle("Lock")
+        self.assertTrue(handle.cancel())
+        self.assertTrue(handle.is_cancelled())
+        self.assertTrue(handle.result(0)["cancelled"])
+        # Already finished
+        self.assertFalse(handle.cancel())
+
+    def test_timeout(self):
+        handle = ActionHandle("Lock")
+        handle.start_timeout(0.01)
+        result = handle.result(5)
+        self.assertTrue(result["timed_out"])
+        self.assertTrue(handle.is_cancelled())
+
+    def test_resolving_stops_the_timeout(self):
+        handle = ActionHandle("Lock")
+        handle.start_timeout(0.05)
+        handle.resolve({"success": True})
+        handle._timeout_timer.join(5)
+        self.assertEqual(handle.result(0), {"success": True})
+        self.assertFalse(handle.is_cancelled())
+
+
+class TestSubmit(unittest.TestCase):
+    def setUp(self):
+        self.system = BlockingSystemBackend()
+        set_system_backend(self.system)
+
+    def tearDown(self):
+        self.system.release.set()
+        set_system_backend(None)
+
+    def test_listeners_are_in_place_before_the_action_runs(self):
+        results = []
+        done = threading.Event()
+        # Finishes at once, perhaps before submit() returns
+        handle = ActionExecutor.submit(
+            "Sleep", on_done=lambda result: (results.append(result), done.set())
+        )
+        self.assertTrue(done.wait(5))
+        self.assertEqual(results, [handle.result()])
+        self.assertEqual(self.system.calls, ["sleep"])
+
+    def test_progress(self):
+        backend = FakeProcessBackend()
+        set_process_backend(backend)
+        self.addCleanup(set_process_backend, None)
+        backend.spawn("a.exe", "C:\\a.exe")
+        backend.spawn("b.exe", "C:\\b.exe")
+        groups = process_manager.get_running_processes(with_icons=False)
+
+        reports = []
+        handle = ActionExecutor.submit(
+            "Terminate Process", groups, on_progress=lambda *a: reports.append(a)
+        )
+        self.assertEqual(handle.result(5)["count"], 2)
+        self.assertEqual(
+            reports, [(0.5, "Terminated a.exe"), (1.0, "Terminated b.exe")]
+        )
+
+    def test_cancel_resolves_before_the_action_ends(self):
+        results = []
+        handle = ActionExecutor.submit("Lock", on_done=results.append)
+        self.assertTrue(self.system.started.wait(5))
+        handle.cancel()
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]["cancelled"])
+
+        # The action finishing later does not change the result
+        self.system.release.set()
+        self.assertTrue(handle.cancel_event.is_set())
+        self.assertTrue(handle.result(0)["cancelled"])
+
+    def test_timeout(self):
+        handle = ActionExecutor.submit("Lock", timeout=0.05)
+        self.assertTrue(handle.result(5)["timed_out"])
+        self.assertEqual(self.system.calls, [])
+
+
+def stage(*actions, timeout=5, on_failure="continue"):
+    return {"actions": list(actions), "timeout": timeout, "on_failure": on_failure}
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.system = BlockingSystemBackend()
+        set_system_backend(self.system)
+        self.addCleanup(set_system_backend, None)
+        self.addCleanup(self.system.release.set)
+        self.backend = FakeProcessBackend()
+        set_process_backend(self.backend)
+        self.addCleanup(set_process_backend, None)
+
+    def run_pipeline(self, stages, groups=None):
+        return ActionExecutor.execute_pipeline(stages, groups)
+
+    def test_stages_run_in_order(self):
+        result = self.run_pipeline(
+            [stage("Sleep"), stage("Restart"), stage("Shutdown")]
+        )
+        self.assertTrue(result["success"])
+        self.assertEqual(self.system.calls, ["sleep", "restart", "shutdown"])
+        self.assertEqual([r["index"] for r in result["stages"]], [0, 1, 2])
+
+    def test_timeout_then_continue(self):
+        result = self.run_pipeline([stage("Lock", timeout=0.05), stage("Sleep")])
+        locked, slept = result["stages"]
+        self.assertTrue(locked["timed_out"])
+        self.assertFalse(locked["success"])
+        self.assertEqual(
+            locked["branches"], [{"label": "Lock", "success": False, "timed_out": True}]
+        )
+        self.assertTrue(slept["success"])
+        self.assertTrue(result["success"])
+
+    def test_abort_skips_the_rest(self):
+        result = self.run_pipeline(
+            [
+                stage("Lock", timeout=0.05, on_failure="abort"),
+                stage("Sleep"),
+                stage("Shutdown"),
+            ]
+        )
+        self.assertFalse(result["success"])
+        self.assertTrue(all(r.get("skipped") for r in result["stages"][1:]))
+        self.assertNotIn("sleep", self.system.calls)
+
+    def test_cancel_skips_the_rest(self):
+        cancel = threading.Event()
+        cancel.set()
+        result = ActionExecutor.execute_pipeline([stage("Sleep")], cancel_event=cancel)
+        self.assertFalse(result["success"])
+        self.assertTrue(result["stages"][0]["skipped"])
+        self.assertEqual(self.system.calls, [])
+
+    def test_many_branches_share_the_pool(self):
+        for i in range(60):
+            self.backend.spawn(f"app-{i}.exe", f"C:\\app-{i}.exe")
+        groups = process_manager.get_running_processes(with_icons=False)
+        threads = threading.active_count()
+
+        result = self.run_pipeline(
+            [stage("Terminate Process"), stage("Wait For Exit")], groups
+        )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(result["stages"][0]["branches"]), 60)
+        self.assertEqual(len(self.backend.terminated), 60)
+        self.assertLessEqual(threading.active_count() - threads, 16)
+
+
+class TestHomeViewActions(unittest.TestCase):
+    def setUp(self):
+        self.system = BlockingSystemBackend()
+        set_system_backend(self.system)
+        self.addCleanup(set_system_backend, None)
+        self.addCleanup(self.system.release.set)
+
+        harness = self.enterContext(load_harness.LoadHarness(10, view="home"))
+        harness.mount()
+        saved_page = app_state.page
+        app_state.page = harness.page
+        self.addCleanup(setattr, app_state, "page", saved_page)
+
+        self.view = harness.view
+        self.view.timer_setup.get_configuration = lambda: {
+            "action": "Lock",
+            "pipeline": None,
+        }
+
+    def test_finishing_clears_the_timer_info(self):
+        self.addCleanup(setattr, app_state, "timer", None)
+        app_state.timer = TimerInfo("Lock", "System", total_seconds=60)
+        self.view.on_timer_finish()
+        self.assertIsNone(app_state.timer)
+
+    def test_cancel_after_the_timer_finished(self):
+        self.view.on_timer_finish()
+        handle = self.view.action_handle
+        self.assertIsNotNone(handle)
+        self.assertTrue(self.view.action_status.visible)
+
+        self.view.on_cancel_action_click(None)
+        self.assertTrue(handle.result(0)["cancelled"])
+        self.assertIsNone(self.view.action_handle)
+        self.assertFalse(self.view.action_status.visible)
+
+    def test_second_fire_owns_the_status(self):
+        self.view.run_action()
+        first = self.view.action_handle
+        self.view.run_action()
+        second = self.view.action_handle
+        self.assertIsNot(first, second)
+
+        first.cancel()
+        self.assertIs(self.view.action_handle, second)
+        self.assertTrue(self.view.action_status.visible)
+
+        self.view.on_cancel_action_click(None)
+        self.assertTrue(second.result(0)["cancelled"])
+        self.assertFalse(self.view.action_status.visible)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import threading
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from state import AppState, TimerInfo
+
+
+class TestAppState(unittest.TestCase):
+    def setUp(self):
+        self.state = AppState()
+        self.changes = []
+
+    def test_subscriber_notified_only_on_change(self):
+        self.state.subscribe("minimize_to_tray", self.changes.append)
+        self.state.minimize_to_tray = True  # Already the default
+        self.state.minimize_to_tray = False
+        self.state.show_system_processes = True  # Other field
+        self.assertEqual(self.changes, [False])
+
+    def test_unsubscribe(self):
+        unsubscribe = self.state.subscribe("timer", self.changes.append)
+        unsubscribe()
+        self.state.timer = TimerInfo("Sleep")
+        self.assertEqual(self.changes, [])
+
+    def test_equal_timer_info_does_not_notify(self):
+        self.state.timer = TimerInfo("Sleep", "System", total_seconds=60)
+        self.state.subscribe("timer", self.changes.append)
+        self.state.timer = self.state.timer.replace()
+        self.state.timer = self.state.timer.replace(status="Paused")
+        self.assertEqual(len(self.changes), 1)
+        self.assertEqual(self.changes[0].status, "Paused")
+
+    def test_batch_notifies_once_with_final_value(self):
+        self.state.subscribe("show_system_processes", self.changes.append)
+        with self.state.batch():
+            self.state.show_system_processes = True
+            self.state.show_system_processes = False
+            self.state.show_system_processes = True
+            self.assertEqual(self.changes, [])
+        self.assertEqual(self.changes, [True])
+
+    def test_unknown_field_rejected(self):
+        with self.assertRaises(AttributeError):
+            self.state.timer_config = {}
+        with self.assertRaises(ValueError):
+            self.state.subscribe("timer_config", print)
+
+    def test_concurrent_writes(self):
+        self.state.subscribe("timer", self.changes.append)
+
+        def writer(n):
+            for i in range(200):
+                self.state.timer = TimerInfo(total_seconds=n * 1000 + i)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.changes), 800)
+
+
+if __name__ == "__main__":
+    unittest.main()
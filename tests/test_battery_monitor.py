@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.battery_monitor import BatteryMonitor, FakePowerSource
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBatteryMonitor(unittest.TestCase):
+    def setUp(self):
+        self.power = FakePowerSource(percent=80, plugged=False)
+        self.clock = FakeTime()
+        self.monitor = BatteryMonitor(
+            20, power_source=self.power, time_func=self.clock
+        )
+        self.fired = 0
+        self.monitor.add_fire_listener(self._on_fire)
+
+    def _on_fire(self):
+        self.fired += 1
+
+    def poll(self):
+        return self.monitor.step()
+
+    def test_long_interval_on_ac(self):
+        self.power.plugged = True
+        self.assertEqual(self.poll(), self.monitor.max_interval)
+
+    def test_interval_shrinks_near_threshold(self):
+        self.power.percent = 60
+        far = self.poll()
+        self.clock.now += 600
+        self.power.percent = 50
+        mid = self.poll()
+        self.clock.now += 600
+        self.power.percent = 22
+        near = self.poll()
+        self.assertGreaterEqual(far, mid)
+        self.assertGreater(mid, near)
+        self.assertGreaterEqual(near, self.monitor.min_interval)
+
+    def test_interval_follows_discharge_rate(self):
+        self.poll()
+        # 10% in 10 minutes -> 60 s per percent, 60% margin left
+        self.clock.now += 600
+        self.power.percent = 70
+        self.poll()
+        self.assertAlmostEqual(self.monitor.discharge_rate(), 10 / 600)
+        self.assertEqual(self.monitor.next_interval(70, False), 300.0)
+        self.assertEqual(self.monitor.next_interval(25, False), 150.0)
+
+    def test_fires_once_and_rearms_on_power(self):
+        self.power.percent = 19
+        self.poll()
+        self.poll()
+        self.assertEqual(self.fired, 1)
+
+        # Plugged in: re-armed but must not fire while charging
+        self.power.plugged = True
+        self.poll()
+        self.assertTrue(self.monitor.armed)
+        self.assertEqual(self.fired, 1)
+
+        self.power.plugged = False
+        self.poll()
+        self.assertEqual(self.fired, 2)
+
+    def test_no_battery(self):
+        self.power.percent = None
+        self.assertEqual(self.poll(), self.monitor.max_interval)
+        self.assertEqual(self.fired, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
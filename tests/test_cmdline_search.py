@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import load_harness
+import process_manager
+from backends.processes import FakeProcessBackend, set_process_backend
+from process_manager import CmdlineCache
+from services.action_executor import ActionExecutor
+from services.clock import VirtualClock
+
+NODE = "C:\\Program Files\\nodejs\\node.exe"
+
+
+class TestCmdlineCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.backend = FakeProcessBackend(self.clock)
+        set_process_backend(self.backend)
+        CmdlineCache._cache = {}
+        [self.pid] = self.backend.spawn("node.exe", NODE, cmdline=["node", "A.js"])
+        process_manager.enumerate_processes()
+
+    def tearDown(self):
+        set_process_backend(None)
+
+    def test_read_once(self):
+        self.assertEqual(CmdlineCache.get(self.pid), "node a.js")
+        self.assertEqual(CmdlineCache.get(self.pid), "node a.js")
+        self.assertEqual(self.backend.cmdline_reads, 1)
+
+    def test_reused_pid_is_read_again(self):
+        CmdlineCache.get(self.pid)
+        self.backend.terminate(self.pid)
+        self.clock.advance(1)
+        self.backend.spawn("node.exe", NODE, cmdline=["node", "b.js"], pid=self.pid)
+        process_manager.enumerate_processes()
+        self.assertEqual(CmdlineCache.get(self.pid), "node b.js")
+        self.assertEqual(self.backend.cmdline_reads, 2)
+
+    def test_exited_processes_are_dropped(self):
+        CmdlineCache.get(self.pid)
+        self.backend.terminate(self.pid)
+        process_manager.enumerate_processes()
+        self.assertEqual(CmdlineCache._cache, {})
+
+
+class TestSelectorCmdlineSearch(unittest.TestCase):
+    def setUp(self):
+        self.harness = self.enterContext(load_harness.LoadHarness(300))
+        self.backend = self.harness.backend
+        self.servers = self.backend.spawn(
+            "node.exe", NODE, count=2, cmdline=["node", "server.js", "--port=80"]
+        )
+        self.tools = self.backend.spawn(
+            "node.exe", NODE, count=3, cmdline=["node", "build.js"]
+        )
+        self.total = len(self.backend.processes)
+        self.harness.mount()
+        self.selector = self.harness.selector
+
+    def search(self, query):
+        self.selector.search_field.value = query
+        self.selector.filter_processes(query)
+        return list(self.selector._rows.values())
+
+    def test_name_search_reads_no_cmdlines(self):
+        self.assertEqual(self.search("server.js"), [])
+        self.assertEqual(self.backend.cmdline_reads, 0)
+
+    def test_read_once_per_process(self):
+        self.selector.set_cmdline_search(True)
+        # Nothing to match yet
+        self.assertEqual(self.backend.cmdline_reads, 0)
+        for i in range(1, len("server.js") + 1):
+            rows = self.search("server.js"[:i])
+        [node] = rows
+        self.assertEqual(node.name, "node.exe")
+        self.assertEqual(sorted(node.pids), self.servers)
+        self.assertEqual(node.label, "node.exe (server.js)")
+        self.assertEqual(self.backend.cmdline_reads, self.total)
+
+        # A refresh only reads what started since
+        self.backend.spawn("node.exe", NODE, cmdline=["node", "server.js"])
+        self.selector.refresh_processes()
+        self.assertEqual(len(self.selector._rows[node.id].pids), 3)
+        self.assertEqual(self.backend.cmdline_reads, self.total + 1)
+
+    def test_name_matches_keep_the_whole_group(self):
+        self.selector.set_cmdline_search(True)
+        [node] = self.search("node.exe")
+        self.assertEqual(node.match, "")
+        self.assertEqual(len(node.pids), 5)
+
+    def test_selection_targets_matching_processes(self):
+        self.selector.set_cmdline_search(True)
+        [node] = self.search("server")
+        self.selector.select_process(node)
+        self.assertEqual(self.selector.process_list_view.controls[0].bgcolor, "blue900")
+
+        [later] = self.backend.spawn("node.exe", NODE, cmdline=["node", "server.js"])
+        ActionExecutor.execute("Terminate Process", self.selector.selected_processes)
+        self.assertEqual(sorted(self.backend.terminated), self.servers + [later])
+
+    def test_restore_narrowed_selection(self):
+        self.selector.restore_selection([f"{NODE}\nbuild.js", "node.exe\nbuild.js"])
+        self.selector.refresh_processes()
+        [node] = self.selector.selected_processes
+        self.assertEqual(sorted(node.pids), self.tools)
+
+
+if __name__ == "__main__":
+    unittest.main()
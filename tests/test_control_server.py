@@ -0,0 +1,152 @@
+import unittest
+import tempfile
+import threading
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import load_harness
+from services.timer_service import TimerService
+from services.control_address import private_dir
+from services.control_server import ControlHandler, ControlServer
+from control_client import ControlClient
+from state import app_state
+
+
+@unittest.skipIf(sys.platform == "win32", "uses a Unix domain socket")
+class TestControlServer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmpdir.name, "control.sock")
+        self.timer_service = TimerService()
+        self.server = ControlServer(
+            ControlHandler(self.timer_service), address=self.address
+        )
+        self.server.start()
+
+    def tearDown(self):
+        self.timer_service.cancel_timer()
+        self.server.stop()
+        self.tmpdir.cleanup()
+
+    def client(self):
+        return ControlClient(address=self.address).connect()
+
+    def test_timer_lifecycle(self):
+        with self.client() as client:
+            self.assertEqual(client.call("timer.list"), [])
+            timer = client.call("timer.start", after="2h", action="Sleep")
+            self.assertEqual(timer["total_seconds"], 7200)
+            self.assertEqual(timer["action"], "Sleep")
+
+            self.assertTrue(client.call("timer.pause")["paused"])
+            self.assertFalse(client.call("timer.resume")["paused"])
+            self.assertEqual(len(client.call("timer.list")), 1)
+            client.call("timer.cancel")
+            self.assertEqual(client.call("timer.list"), [])
+
+    def test_errors_are_reported(self):
+        with self.client() as client:
+            with self.assertRaises(RuntimeError):
+                client.call("timer.cancel")
+            with self.assertRaises(RuntimeError):
+                client.call("timer.start", after="soon", action="Sleep")
+            with self.assertRaises(RuntimeError):
+                client.call("no.such.command")
+            self.assertFalse(client.request("not json")["ok"])
+
+    def test_batch_in_one_round_trip(self):
+        with self.client() as client:
+            replies = client.request(
+                [
+                    {
+                        "id": 1,
+                        "cmd": "timer.start",
+                        "args": {"seconds": 60, "action": "Lock"},
+                    },
+                    {"id": 2, "cmd": "timer.pause"},
+                    {"id": 3, "cmd": "timer.list"},
+                ]
+            )
+        self.assertEqual([r["id"] for r in replies], [1, 2, 3])
+        self.assertTrue(all(r["ok"] for r in replies))
+        self.assertTrue(replies[2]["result"][0]["paused"])
+
+    def test_concurrent_clients(self):
+        results = []
+
+        def worker():
+            with self.client() as client:
+                for _ in range(20):
+                    results.append(client.call("ping"))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["pong"] * 100)
+
+    def test_second_server_refuses_live_socket(self):
+        other = ControlServer(ControlHandler(TimerService()), address=self.address)
+        with self.assertRaises(OSError):
+            other.start()
+
+    def test_socket_is_private(self):
+        self.assertEqual(os.stat(self.tmpdir.name).st_mode & 0o777, 0o700)
+        self.assertEqual(os.stat(self.address).st_mode & 0o777, 0o600)
+
+
+@unittest.skipIf(sys.platform == "win32", "Unix permissions")
+class TestPrivateDir(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = self.enterContext(tempfile.TemporaryDirectory())
+
+    def test_created_and_tightened(self):
+        path = private_dir(os.path.join(self.tmpdir, "new"))
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o700)
+        os.chmod(path, 0o777)
+        private_dir(path)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o700)
+
+    def test_symlinks_are_refused(self):
+        link = os.path.join(self.tmpdir, "link")
+        os.symlink(private_dir(os.path.join(self.tmpdir, "real")), link)
+        with self.assertRaises(PermissionError):
+            private_dir(link)
+
+
+class TestHomeViewFollowsApi(unittest.TestCase):
+    def setUp(self):
+        harness = self.enterContext(load_harness.LoadHarness(10, view="home"))
+        harness.mount()
+        saved_page = app_state.page
+        app_state.page = harness.page
+        self.addCleanup(setattr, app_state, "page", saved_page)
+        self.addCleanup(setattr, app_state, "timer", None)
+
+        self.view = harness.view
+        self.addCleanup(self.view.will_unmount)
+        self.handler = ControlHandler(self.view.timer_service, state=app_state)
+        self.addCleanup(self.view.timer_service.cancel_timer)
+
+    def call(self, cmd, **args):
+        reply = self.handler.handle({"cmd": cmd, "args": args})
+        self.assertTrue(reply["ok"], reply)
+        return reply["result"]
+
+    def test_start_and_cancel(self):
+        self.assertFalse(self.view.timer_container.visible)
+        self.call("timer.start", after="2h", action="Sleep")
+        self.assertTrue(self.view.timer_container.visible)
+        self.assertTrue(self.view.cancel_button.visible)
+
+        self.call("timer.cancel")
+        self.assertFalse(self.view.timer_container.visible)
+        self.assertTrue(self.view.start_button.visible)
+
+
+if __name__ == "__main__":
+    unittest.main()
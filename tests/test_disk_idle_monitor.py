@@ -0,0 +1,114 @@
+import unittest
+import tempfile
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.disk_idle_monitor import DiskIdleMonitor, FakeDiskCounters, whole_disks
+
+MB = 1024 * 1024
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDiskIdleMonitor(unittest.TestCase):
+    def setUp(self):
+        self.disks = FakeDiskCounters(sda=(0, 0), nvme0n1=(0, 0))
+        self.clock = FakeTime()
+        self.updates = []
+        self.monitor = self.make_monitor([])
+
+    def make_monitor(self, devices):
+        monitor = DiskIdleMonitor(
+            devices,
+            threshold=1 * MB,
+            duration_seconds=10,
+            counter_source=self.disks,
+            time_func=self.clock,
+        )
+        monitor._on_update = self.updates.append
+        return monitor
+
+    def step(self, seconds=2, **written):
+        for name, amount in written.items():
+            self.disks.add(name, write_bytes=amount)
+        self.clock.now += seconds
+        self.monitor.poll()
+        return self.updates[-1] if self.updates else None
+
+    def test_first_sample_is_the_baseline(self):
+        self.monitor.poll()
+        self.assertEqual(self.updates, [])
+
+    def test_rate_covers_all_disks(self):
+        self.monitor.poll()
+        status = self.step(2, sda=4 * MB, nvme0n1=2 * MB)
+        self.assertEqual(status["write_rate"], 3 * MB)
+        self.assertEqual(status["read_rate"], 0)
+        self.assertEqual(status["held_seconds"], 0)
+
+    def test_only_chosen_devices(self):
+        self.monitor = self.make_monitor(["nvme0n1"])
+        self.monitor.poll()
+        status = self.step(2, sda=40 * MB)
+        self.assertEqual(status["write_rate"], 0)
+        self.assertEqual(status["held_seconds"], 2)
+
+    def test_fires_after_the_hold_window(self):
+        self.monitor.poll()
+        for _ in range(4):
+            self.step(2, sda=4 * MB)
+        self.assertFalse(self.monitor._fired)
+        # Quiet from the previous sample on, not from this one
+        self.assertEqual(self.step(2)["held_seconds"], 2)
+        self.step(6)
+        self.assertFalse(self.monitor._fired)
+        self.assertEqual(self.step(2)["held_seconds"], 10)
+        self.assertTrue(self.monitor._fired)
+
+    def test_burst_restarts_the_window(self):
+        self.monitor.poll()
+        self.step(8)
+        self.assertEqual(self.step(2, sda=10 * MB)["held_seconds"], 0)
+        self.assertEqual(self.step(2)["held_seconds"], 2)
+        self.assertFalse(self.monitor._fired)
+
+    def test_counter_reset_and_new_disk(self):
+        self.monitor.poll()
+        self.disks.counters["sda"] = (0, 0)
+        self.disks.add("sdb", write_bytes=100 * MB)
+        self.assertEqual(self.step(2)["write_rate"], 0)
+
+    def test_reset_drops_the_baseline(self):
+        self.monitor.poll()
+        self.step(8)
+        self.monitor.reset()
+        self.monitor.poll()
+        self.assertEqual(self.step(2)["held_seconds"], 2)
+
+
+class TestWholeDisks(unittest.TestCase):
+    def test_partitions_are_dropped(self):
+        with tempfile.TemporaryDirectory() as sys_block:
+            for disk in ("sda", "nvme0n1", "loop0"):
+                os.mkdir(os.path.join(sys_block, disk))
+            names = ["sda", "sda1", "sda2", "nvme0n1", "nvme0n1p1", "loop0"]
+            self.assertEqual(whole_disks(names, sys_block), ["sda", "nvme0n1"])
+
+    def test_without_sys_block(self):
+        names = ["PhysicalDrive0", "PhysicalDrive1", "ram0"]
+        self.assertEqual(
+            whole_disks(names, "/no/such/dir"), ["PhysicalDrive0", "PhysicalDrive1"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
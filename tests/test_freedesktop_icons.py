@@ -0,0 +1,150 @@
+import unittest
+import tempfile
+import base64
+import sys
+import os
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image
+from backends import freedesktop_icons
+from backends.freedesktop_icons import FreedesktopIconBackend, exec_program
+
+
+def write(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def write_png(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.new("RGBA", (size, size), (255, 0, 0, 255)).save(path)
+
+
+THEME = """[Icon Theme]
+Name={name}
+Inherits={inherits}
+Directories=16x16/apps,32x32/apps,48x48/apps
+
+[16x16/apps]
+Size=16
+Type=Fixed
+
+[32x32/apps]
+Size=32
+Type=Fixed
+
+[48x48/apps]
+Size=48
+Type=Threshold
+Threshold=16
+"""
+
+
+class TestFreedesktopIcons(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        share = os.path.join(self.tmpdir.name, "share")
+        icons = os.path.join(share, "icons")
+        write(
+            os.path.join(icons, "hicolor", "index.theme"),
+            THEME.format(name="hicolor", inherits=""),
+        )
+        write(
+            os.path.join(icons, "Papirus", "index.theme"),
+            THEME.format(name="Papirus", inherits="hicolor"),
+        )
+        write_png(os.path.join(icons, "hicolor", "48x48", "apps", "firefox.png"), 48)
+        write_png(os.path.join(icons, "hicolor", "16x16", "apps", "firefox.png"), 16)
+        write_png(os.path.join(icons, "hicolor", "32x32", "apps", "steam.png"), 32)
+        write_png(os.path.join(icons, "Papirus", "32x32", "apps", "steam.png"), 32)
+        write_png(os.path.join(share, "pixmaps", "vim.png"), 32)
+
+        apps = os.path.join(share, "applications")
+        write(
+            os.path.join(apps, "firefox.desktop"),
+            "[Desktop Entry]\nName=Firefox\nName[de]=Feuerfuchs\n"
+            "Exec=env MOZ_X11=1 /usr/lib/firefox/firefox %u\nIcon=firefox\n",
+        )
+        write(
+            os.path.join(apps, "steam.desktop"),
+            "[Desktop Entry]\nExec=/usr/bin/steam %U\nIcon=steam\n"
+            "[Desktop Action Big]\nExec=steam -bigpicture\nIcon=other\n",
+        )
+        write(
+            os.path.join(apps, "org.gimp.GIMP.desktop"),
+            "[Desktop Entry]\nExec=flatpak run org.gimp.GIMP\nIcon=gimp\n",
+        )
+        write(
+            os.path.join(apps, "meld.desktop"),
+            "[Desktop Entry]\nExec=/usr/bin/python3.12 /usr/bin/meld %F\n"
+            "Icon=steam\nStartupWMClass=Meld\n",
+        )
+        self.share = share
+        self.backend = FreedesktopIconBackend(theme="Papirus", dirs=[share])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_exec_program(self):
+        self.assertEqual(exec_program("env A=1 B=2 /opt/app --x %f"), "/opt/app")
+        self.assertEqual(exec_program('"/opt/My App/app" %U'), "/opt/My App/app")
+        self.assertIsNone(exec_program("%u"))
+
+    def test_resolves_through_theme_chain(self):
+        path = self.backend.find_icon_path("/usr/lib/firefox/firefox")
+        # Inherited from hicolor; the 48px folder covers 32px by its threshold
+        self.assertEqual(
+            path,
+            os.path.join(
+                self.share, "icons", "hicolor", "48x48", "apps", "firefox.png"
+            ),
+        )
+        steam = self.backend.find_icon_path("/usr/bin/steam")
+        self.assertIn("Papirus", steam)
+        # Named after the executable, found in pixmaps
+        self.assertTrue(self.backend.find_icon_path("/usr/bin/vim").endswith("vim.png"))
+        self.assertIsNone(self.backend.find_icon_path("/usr/bin/flatpak"))
+
+    def test_interpreters_are_not_indexed(self):
+        self.assertIsNone(self.backend.find_icon_path("/usr/bin/python3.12"))
+        # The entry id and StartupWMClass still match
+        self.assertIn("Papirus", self.backend.find_icon_path("/usr/bin/meld"))
+
+    def test_icon_is_a_32px_png(self):
+        data = base64.b64decode(
+            self.backend.get_icon_base64("/usr/lib/firefox/firefox")
+        )
+        self.assertEqual(data[:4], b"\x89PNG")
+        self.assertEqual(data[16:24], (32).to_bytes(4, "big") * 2)
+
+    def test_lookups_use_the_index(self):
+        self.backend.build_index()
+        with mock.patch.object(
+            freedesktop_icons.os, "scandir", side_effect=AssertionError("scanned")
+        ):
+            for _ in range(3):
+                self.assertIsNotNone(self.backend.find_icon_path("/usr/bin/steam"))
+
+    def test_benchmark(self):
+        # Nothing from the real home folder or desktop settings
+        home = os.path.join(self.tmpdir.name, "home")
+        environ = {
+            "HOME": home,
+            "XDG_DATA_HOME": os.path.join(home, ".local", "share"),
+            "XDG_DATA_DIRS": self.share,
+            "XDG_CONFIG_HOME": os.path.join(home, ".config"),
+            "TIMETOSLEEP_ICON_THEME": "Papirus",
+        }
+        with mock.patch.dict(os.environ, environ):
+            result = freedesktop_icons.benchmark(["/usr/bin/steam"], repeat=10)
+        self.assertEqual(result["resolved"], 1)
+        self.assertEqual(result["theme"], "Papirus")
+        self.assertGreater(result["cold_index_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.housekeeping import Housekeeper
+from services.timer_service import TimerService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHousekeeper(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.keeper = Housekeeper(coalesce=0.05, time_func=self.clock, autostart=False)
+        self.calls = []
+
+    def test_nearby_deadlines_run_in_one_wakeup(self):
+        self.keeper.call_later(1.0, lambda: self.calls.append("a"))
+        self.keeper.call_later(1.04, lambda: self.calls.append("b"))
+        self.keeper.call_later(1.5, lambda: self.calls.append("c"))
+
+        self.assertEqual(self.keeper.next_deadline(), 1.0)
+        self.assertEqual(self.keeper.run_due(1.0), 2)
+        self.assertEqual(self.calls, ["a", "b"])
+        self.assertEqual(self.keeper.next_deadline(), 1.5)
+
+    def test_periodic_task_keeps_cadence(self):
+        self.keeper.call_every(1.0, lambda: self.calls.append(self.clock.now))
+        for now in (1.0, 2.03, 3.0):
+            self.clock.now = now
+            self.keeper.run_due()
+        self.assertEqual(self.calls, [1.0, 2.03, 3.0])
+        # Late by 0.03s, but the next deadline is still on the whole second
+        self.assertEqual(self.keeper.next_deadline(), 4.0)
+
+    def test_missed_runs_are_skipped(self):
+        self.keeper.call_every(1.0, lambda: self.calls.append(self.clock.now))
+        self.clock.now = 10.0
+        self.keeper.run_due()
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.keeper.next_deadline(), 11.0)
+
+    def test_cancel(self):
+        task = self.keeper.call_every(1.0, lambda: self.calls.append(1))
+        task.cancel()
+        self.assertIsNone(self.keeper.next_deadline())
+        self.assertEqual(self.keeper.run_due(5.0), 0)
+
+    def test_wakeups_per_minute_window(self):
+        for t in (0, 10, 50, 70):
+            self.keeper._wakeups.append(t)
+        self.assertEqual(self.keeper.wakeups_per_minute(now=80), 2)
+
+    def test_wakeup_log_stays_bounded(self):
+        # Two hours of one tick a second, with nobody reading the stats
+        for t in range(7200):
+            self.keeper._record_wakeup(float(t))
+        self.assertLessEqual(len(self.keeper._wakeups), 61)
+        self.assertEqual(self.keeper.wakeups_per_minute(now=7199.0), 61)
+
+
+class TestTimerServiceTicks(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.keeper = Housekeeper(time_func=self.clock, autostart=False)
+        self.timer = TimerService(housekeeper=self.keeper)
+        self.ticks = []
+        self.finished = []
+
+    def advance(self, seconds):
+        for _ in range(seconds):
+            self.clock.now += 1.0
+            self.keeper.run_due()
+
+    def start(self, total):
+        self.timer.start_timer(
+            total,
+            on_tick=lambda remaining, total: self.ticks.append(remaining),
+            on_finish=lambda: self.finished.append(True),
+        )
+        self.keeper.run_due()
+
+    def test_countdown_ticks_and_finishes(self):
+        self.start(3)
+        self.advance(3)
+        self.assertEqual(self.ticks, [3, 2, 1, 0])
+        self.assertEqual(self.finished, [True])
+        self.assertFalse(self.timer.is_running())
+        self.assertIsNone(self.keeper.next_deadline())
+
+    def test_paused_timer_schedules_nothing(self):
+        self.start(5)
+        self.advance(1)
+        self.timer.pause_timer()
+        self.assertIsNone(self.keeper.next_deadline())
+        self.advance(10)
+        self.assertEqual(self.timer.get_status()["remaining_seconds"], 4)
+
+        self.timer.resume_timer()
+        self.keeper.run_due()
+        self.advance(4)
+        self.assertEqual(self.ticks, [5, 4, 4, 3, 2, 1, 0])
+        self.assertEqual(self.finished, [True])
+
+    def test_late_wakeup_does_not_drift(self):
+        self.start(300)
+        # Nothing ran for 100 seconds, e.g. the machine was suspended
+        self.clock.now = 100.0
+        self.keeper.run_due()
+        self.assertEqual(self.ticks, [300, 200])
+        self.advance(1)
+        self.assertEqual(self.ticks[-1], 199)
+
+    def test_cancel_stops_ticks(self):
+        self.start(5)
+        self.timer.cancel_timer()
+        self.advance(10)
+        self.assertEqual(self.ticks, [5])
+        self.assertEqual(self.finished, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.housekeeping import Housekeeper
+from services.icon_pool import IconPool
+
+release = threading.Event()
+
+
+def fake_extract(path):
+    # "hang" stands in for an exe on an unreachable network share
+    if path == "hang":
+        release.wait(30)
+    elif path == "crash":
+        raise OSError("bad exe")
+    elif path.startswith("slow"):
+        time.sleep(0.1)
+    return f"icon:{path}"
+
+
+class TestIconPool(unittest.TestCase):
+    def setUp(self):
+        release.clear()
+        self.keeper = Housekeeper()
+
+    def tearDown(self):
+        release.set()
+        self.keeper.stop()
+
+    def make_pool(self, **kwargs):
+        pool = IconPool(fake_extract, housekeeper=self.keeper, **kwargs)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_batch_runs_in_parallel(self):
+        pool = self.make_pool(workers=8)
+        paths = [f"slow{i}" for i in range(8)]
+        start = time.monotonic()
+        results = dict(pool.extract_many(paths))
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(results, {p: f"icon:{p}" for p in paths})
+
+    def test_hanging_exe_does_not_block_the_others(self):
+        # A single worker, so the others can only finish if it is replaced
+        pool = self.make_pool(workers=1, timeout=0.2)
+        results = list(pool.extract_many(["hang", "a", "b", "crash"]))
+
+        self.assertEqual(
+            dict(results), {"hang": None, "a": "icon:a", "b": "icon:b", "crash": None}
+        )
+        self.assertEqual(pool.failed(), {"hang"})
+        # Not tried again
+        self.assertIsNone(pool.submit("hang").result(timeout=0))
+
+    def test_results_stream_in_completion_order(self):
+        pool = self.make_pool(workers=2)
+        order = [path for path, _ in pool.extract_many(["slow", "fast"])]
+        self.assertEqual(order, ["fast", "slow"])
+
+    def test_duplicate_requests_share_a_future(self):
+        pool = self.make_pool(workers=1)
+        self.assertIs(pool.submit("slow"), pool.submit("slow"))
+
+    def test_isolated_worker_is_killed_on_timeout(self):
+        pool = self.make_pool(workers=1, timeout=0.5, isolate=True)
+        results = dict(pool.extract_many(["hang", "a"]))
+        self.assertEqual(results, {"hang": None, "a": "icon:a"})
+        self.assertEqual(pool.failed(), {"hang"})
+
+
+if __name__ == "__main__":
+    unittest.main()
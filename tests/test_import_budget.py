@@ -0,0 +1,29 @@
+import unittest
+import importlib.util
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import import_report
+
+
+class TestImportBudget(unittest.TestCase):
+    def test_main_does_not_load_ui(self):
+        loaded = import_report.summarize(import_report.measure(["main"]))["loaded"]
+        self.assertNotIn("flet", loaded)
+        self.assertNotIn("psutil", loaded)
+
+    @unittest.skipUnless(importlib.util.find_spec("flet"), "flet not installed")
+    def test_startup_within_budget(self):
+        entries = import_report.measure()
+        summary = import_report.summarize(entries)
+
+        self.assertEqual(import_report.deferred_loaded(entries), [])
+        self.assertLess(summary["app_ms"], import_report.BUDGET_MS["app"])
+        self.assertLess(summary["total_ms"], import_report.BUDGET_MS["total"])
+
+
+if __name__ == "__main__":
+    unittest.main()
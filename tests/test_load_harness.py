@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import load_harness
+from views.components.process_selector import MAX_ROWS, SELECTED_COLOR
+
+# Times depend on the machine, they are checked by running load_harness.py
+DETERMINISTIC = ("bytes", "controls")
+
+
+class TestLoadHarness(unittest.TestCase):
+    def run_harness(self, groups, view="selector"):
+        with load_harness.LoadHarness(groups, view) as harness:
+            return harness, harness.run()
+
+    def test_selector_within_budget(self):
+        _, results = self.run_harness(10000)
+        self.assertEqual(load_harness.check(results, keys=DETERMINISTIC), [])
+
+    def test_home_view_within_budget(self):
+        _, results = self.run_harness(10000, view="home")
+        self.assertEqual(load_harness.check(results, keys=DETERMINISTIC), [])
+
+    def test_page_size_does_not_grow_with_the_table(self):
+        # Both fill the list when nothing is searched for
+        _, small = self.run_harness(1000)
+        _, large = self.run_harness(10000)
+        for a, b in zip(small, large):
+            if a["name"] in ("mount", "select_200"):
+                self.assertEqual(a["controls"], b["controls"], a["name"])
+
+    def test_check_reports_regressions(self):
+        results = [{"name": "select_200", "ms": 5, "bytes": 10**6, "controls": 10}]
+        problems = load_harness.check(results)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("bytes", problems[0])
+
+        results[0]["ms"] = 10**6
+        self.assertEqual(len(load_harness.check(results)), 2)
+        self.assertEqual(load_harness.check(results, keys=DETERMINISTIC), problems)
+
+
+class TestSelectorAtScale(unittest.TestCase):
+    def setUp(self):
+        self.harness = self.enterContext(load_harness.LoadHarness(2000))
+        self.harness.mount()
+        self.selector = self.harness.selector
+
+    def shown(self):
+        return [tile.data for tile in self.selector.process_list_view.controls]
+
+    def test_rows_are_capped(self):
+        self.assertEqual(len(self.shown()), MAX_ROWS)
+        self.assertTrue(self.selector.more_label.visible)
+        self.assertTrue(self.selector.more_label.value.startswith("1900 more"))
+
+    def test_narrowing_and_widening_search(self):
+        expected = lambda q: [
+            p.name for p in self.selector.all_processes if q in p.name.lower()
+        ][:MAX_ROWS]
+        for query in ("node", "node-01", "NODE", "node-012"):
+            self.selector.filter_processes(query)
+            self.assertEqual(self.shown(), expected(query.lower()), query)
+        self.assertFalse(self.selector.more_label.visible)
+
+    def test_selection_survives_filtering(self):
+        group = self.selector.all_processes[0]
+        self.selector.select_process(group)
+        self.selector.filter_processes("zzz")
+        self.selector.filter_processes("")
+        tile = self.selector.process_list_view.controls[0]
+        self.assertEqual(tile.data, group.name)
+        self.assertEqual(tile.bgcolor, SELECTED_COLOR)
+
+        self.selector.select_process(group)
+        self.assertIsNone(tile.bgcolor)
+        self.assertEqual(self.selector.selected_processes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import subprocess
+import threading
+import sys
+import os
+import psutil
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.process_exit_watcher import ProcessExitWatcher, pidfd_supported
+from process_manager import ProcessGroup
+
+
+def spawn():
+    return subprocess.Popen(
+        [sys.executable, "-c", "import sys; sys.stdin.read()"], stdin=subprocess.PIPE
+    )
+
+
+class TestProcessExitWatcher(unittest.TestCase):
+    def run_watcher(self, use_pidfd):
+        children = [spawn() for _ in range(3)]
+        watcher = ProcessExitWatcher(
+            [ProcessGroup("python", [c.pid for c in children])], min_backoff=0.01
+        )
+        watcher.use_pidfd = use_pidfd
+        fired = threading.Event()
+        updates = []
+        watcher.start(on_update=updates.append, on_fire=fired.set)
+
+        try:
+            for child in children[:2]:
+                child.stdin.close()
+                child.wait()
+            self.assertFalse(fired.wait(0.3))
+
+            children[2].stdin.close()
+            children[2].wait()
+            self.assertTrue(fired.wait(5))
+            self.assertEqual(updates[-1], {"alive": 0, "total": 3})
+        finally:
+            watcher.stop()
+            for child in children:
+                child.kill()
+                child.wait()
+
+    @unittest.skipUnless(pidfd_supported(), "pidfd not available")
+    def test_fires_when_all_exit_pidfd(self):
+        self.run_watcher(use_pidfd=True)
+
+    def test_fires_when_all_exit_psutil(self):
+        self.run_watcher(use_pidfd=False)
+
+    def test_reused_pid_counts_as_exited(self):
+        child = spawn()
+        try:
+            watcher = ProcessExitWatcher([ProcessGroup("python", [child.pid])])
+            # Pretend the PID belonged to an older process
+            watcher.watched = [(child.pid, watcher.watched[0][1] - 100)]
+            watcher.reset()
+            self.assertEqual(watcher.alive_count(), 0)
+            watcher.cleanup()
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_pid_reused_since_the_listing_counts_as_exited(self):
+        child = spawn()
+        try:
+            started = psutil.Process(child.pid).create_time()
+            for use_pidfd in (True, False):
+                # Listed while an older process had the PID
+                group = ProcessGroup("python", [child.pid], started=[started - 100])
+                watcher = ProcessExitWatcher([group])
+                watcher.use_pidfd = use_pidfd and pidfd_supported()
+                watcher.reset()
+                self.assertEqual(watcher.total, 1)
+                self.assertEqual(watcher.alive_count(), 0)
+                watcher.cleanup()
+
+            group = ProcessGroup("python", [child.pid], started=[started])
+            watcher = ProcessExitWatcher([group])
+            watcher.reset()
+            self.assertEqual(watcher.alive_count(), 1)
+            watcher.cleanup()
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_stop_interrupts_blocking_wait(self):
+        child = spawn()
+        try:
+            watcher = ProcessExitWatcher([ProcessGroup("python", [child.pid])])
+            watcher.start()
+            watcher.stop()
+            self.assertFalse(watcher.is_running())
+            self.assertFalse(watcher._thread.is_alive())
+        finally:
+            child.kill()
+            child.wait()
+
+    @unittest.skipUnless(pidfd_supported(), "pidfd not available")
+    def test_wake_during_cleanup(self):
+        child = spawn()
+        try:
+            watcher = ProcessExitWatcher([ProcessGroup("python", [child.pid])])
+            done = threading.Event()
+            errors = []
+
+            def hammer():
+                while not done.is_set():
+                    try:
+                        watcher.wake()
+                    except Exception as e:
+                        errors.append(e)
+
+            thread = threading.Thread(target=hammer)
+            thread.start()
+            for _ in range(20):
+                watcher.start()
+                watcher.stop()
+            done.set()
+            thread.join()
+            self.assertEqual(errors, [])
+            self.assertIsNone(watcher._wake_w)
+        finally:
+            child.kill()
+            child.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import tracemalloc
+import json
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import process_manager
+from process_manager import IconCache, ProcessGroup
+
+
+def fake_table(groups, pids_per_group):
+    # Fresh strings per row, as psutil returns them
+    pid = 1000
+    for index in range(groups):
+        name = "".join(["app", str(index), ".exe"])
+        path = "".join(["C:\\Program Files\\App", str(index), "\\", name])
+        pids = list(range(pid, pid + pids_per_group))
+        pid += pids_per_group
+        yield name, path, pids
+
+
+def allocated(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - before, kept
+    finally:
+        tracemalloc.stop()
+
+
+class TestProcessGroup(unittest.TestCase):
+    def test_fields_and_dict(self):
+        IconCache._cache["/usr/bin/app"] = "aWNvbg=="
+        try:
+            group = ProcessGroup("app", [3, 4], "/usr/bin/app")
+            group.pids.append(5)
+            self.assertEqual(list(group.pids), [3, 4, 5])
+            self.assertEqual(group.icon, "aWNvbg==")
+            self.assertIs(group.name, sys.intern("app"))
+            data = group.to_dict(with_icon=False)
+            self.assertEqual(json.loads(json.dumps(data))["pids"], [3, 4, 5])
+            self.assertNotIn("icon", data)
+        finally:
+            del IconCache._cache["/usr/bin/app"]
+        self.assertIsNone(ProcessGroup("kthreadd").icon)
+        with self.assertRaises(AttributeError):
+            group.extra = 1
+
+    def test_find_process_groups(self):
+        groups = [ProcessGroup("Chrome.exe", [1]), ProcessGroup("steam", [2])]
+        matched, missing = process_manager.find_process_groups(
+            ["chrome", "discord"], groups
+        )
+        self.assertEqual(matched, groups[:1])
+        self.assertEqual(missing, ["discord"])
+
+    def test_running_processes(self):
+        groups = process_manager.get_running_processes(show_all=True, with_icons=False)
+        self.assertTrue(groups)
+        self.assertTrue(all(isinstance(g, ProcessGroup) for g in groups))
+        self.assertIn(os.getpid(), [pid for g in groups for pid in g.pids])
+
+    def test_memory_against_dicts(self):
+        # Built the way get_running_processes builds them, one PID at a time
+        def as_dicts():
+            groups = []
+            for name, path, pids in fake_table(5000, 3):
+                group = {"name": name, "pids": [], "path": path, "icon": None}
+                for pid in pids:
+                    group["pids"].append(pid)
+                groups.append(group)
+            return groups
+
+        def as_groups():
+            groups = []
+            for name, path, pids in fake_table(5000, 3):
+                group = ProcessGroup(name, path=path)
+                for pid in pids:
+                    group.pids.append(pid)
+                groups.append(group)
+            return groups
+
+        # Names are interned by the previous refresh in the running app
+        previous = as_groups()
+        dict_bytes, _ = allocated(as_dicts)
+        group_bytes, _ = allocated(as_groups)
+        self.assertLess(group_bytes, dict_bytes * 0.6)
+        self.assertIs(previous[0].name, as_groups()[0].name)
+
+
+if __name__ == "__main__":
+    unittest.main()
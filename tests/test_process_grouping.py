@@ -0,0 +1,150 @@
+import unittest
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import process_manager
+from backends.processes import FakeProcessBackend, set_process_backend
+from services.action_executor import ActionExecutor
+
+CHROME = "C:\\Program Files\\Google\\Chrome\\chrome.exe"
+PYTHON = "C:\\Python311\\python.exe"
+VENV_PYTHON = "C:\\Work\\venv\\Scripts\\python.exe"
+
+
+class TestProcessGrouping(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeProcessBackend()
+        set_process_backend(self.backend)
+        spawn = self.backend.spawn
+        [self.explorer] = spawn("explorer.exe", "C:\\Windows\\explorer.exe")
+        [self.chrome] = spawn("chrome.exe", CHROME, parent=self.explorer)
+        self.tabs = spawn("chrome.exe", CHROME, count=3, parent=self.chrome)
+        [self.crashpad] = spawn(
+            "crashpad_handler.exe", "C:\\Chrome\\crashpad.exe", parent=self.tabs[0]
+        )
+        [self.shell] = spawn("cmd.exe", "C:\\Windows\\cmd.exe", parent=self.explorer)
+        [self.script] = spawn("python.exe", PYTHON, parent=self.shell)
+        [self.tool] = spawn("python.exe", VENV_PYTHON, parent=self.explorer)
+        [self.kernel] = spawn("System")
+        [self.child] = spawn("conhost.exe", None, parent=self.kernel)
+
+    def tearDown(self):
+        set_process_backend(None)
+
+    def groups(self, grouping, show_all=False):
+        return {
+            g.key: g
+            for g in process_manager.get_running_processes(
+                show_all=show_all, with_icons=False, grouping=grouping
+            )
+        }
+
+    def test_by_name_merges_programs_sharing_a_name(self):
+        groups = self.groups("name")
+        self.assertEqual(sorted(groups["python.exe"].pids), [self.script, self.tool])
+        self.assertNotIn("System", groups)
+
+    def test_by_exe_splits_them(self):
+        groups = self.groups("exe")
+        self.assertEqual(list(groups[PYTHON].pids), [self.script])
+        self.assertEqual(list(groups[VENV_PYTHON].pids), [self.tool])
+        self.assertEqual(groups[PYTHON].name, "python.exe")
+        self.assertEqual(groups[PYTHON].grouping, "exe")
+
+    def test_by_app_follows_the_tree_up_to_a_launcher(self):
+        groups = self.groups("app")
+        chrome = groups[CHROME]
+        # The top process first, then its helpers whatever their name
+        self.assertEqual(chrome.pids[0], self.chrome)
+        self.assertEqual(
+            sorted(chrome.pids), sorted([self.chrome, *self.tabs, self.crashpad])
+        )
+        self.assertEqual(list(groups[PYTHON].pids), [self.script])
+        self.assertIn("C:\\Windows\\explorer.exe", groups)
+        self.assertNotIn("crashpad_handler.exe", [g.name for g in groups.values()])
+
+    def test_by_app_keeps_every_instance(self):
+        explorer = self.explorer
+        roots = self.backend.spawn("notepad.exe", "C:\\notepad.exe", 3, parent=explorer)
+        [helper] = self.backend.spawn("notepad.exe", "C:\\notepad.exe", parent=roots[2])
+        notepad = self.groups("app")["C:\\notepad.exe"]
+        self.assertEqual(list(notepad.pids), roots + [helper])
+
+        [current] = process_manager.current_groups([notepad])
+        self.assertEqual(sorted(current.pids), sorted(roots + [helper]))
+
+    def test_start_times_follow_the_pids(self):
+        started = {
+            pid: info["create_time"] for pid, info in self.backend.processes.items()
+        }
+        for grouping in ("name", "app"):
+            for group in self.groups(grouping).values():
+                self.assertEqual(
+                    group.start_times(), {pid: started[pid] for pid in group.pids}
+                )
+
+        chrome = self.groups("app")[CHROME].narrowed("chrome")
+        self.assertEqual(chrome.start_times()[self.chrome], started[self.chrome])
+
+    def test_by_app_with_system_processes(self):
+        self.assertNotIn("System", self.groups("app"))
+        groups = self.groups("app", show_all=True)
+        self.assertEqual(list(groups["System"].pids), [self.kernel])
+        # Has no executable, so it is a root of its own
+        self.assertEqual(list(groups["conhost.exe"].pids), [self.child])
+
+    def test_cycles_and_missing_parents(self):
+        table = {
+            1: {"pid": 1, "name": "a", "exe": "/a", "ppid": 2},
+            2: {"pid": 2, "name": "b", "exe": "/b", "ppid": 1},
+            3: {"pid": 3, "name": "c", "exe": "/c", "ppid": 99},
+        }
+        roots = process_manager.app_roots(table)
+        self.assertEqual(roots[1], roots[2])
+        self.assertEqual(roots[3], 3)
+
+    def test_deep_tree_in_one_pass(self):
+        table = {}
+        for pid in range(1, 50001):
+            table[pid] = {"pid": pid, "name": "w", "exe": "/w", "ppid": pid - 1}
+        start = time.perf_counter()
+        roots = process_manager.app_roots(table)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(set(roots.values()), {1})
+
+    def test_unknown_grouping(self):
+        with self.assertRaises(ValueError):
+            self.groups("color")
+
+    def test_terminate_follows_the_grouping(self):
+        chrome = self.groups("app")[CHROME]
+        # Started after the selection, still part of the app
+        [late_tab] = self.backend.spawn("chrome.exe", CHROME, parent=self.chrome)
+
+        result = ActionExecutor.execute("Terminate Process", [chrome])
+
+        self.assertEqual(result["count"], 1)
+        self.assertEqual(self.backend.terminated[0], self.chrome)
+        self.assertEqual(
+            sorted(self.backend.terminated),
+            sorted([self.chrome, *self.tabs, self.crashpad, late_tab]),
+        )
+        self.assertTrue(self.backend.is_alive(self.script))
+
+    def test_groups_that_are_gone_have_no_pids(self):
+        python = self.groups("exe")[PYTHON]
+        self.backend.terminate(self.script)
+        [current] = process_manager.current_groups([python])
+        self.assertEqual(current.key, PYTHON)
+        self.assertEqual(list(current.pids), [])
+
+        result = ActionExecutor.execute("Terminate Process", [python])
+        self.assertEqual((result["count"], result["total"]), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
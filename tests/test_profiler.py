@@ -0,0 +1,104 @@
+import unittest
+import tempfile
+import gzip
+import threading
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from unittest import mock
+from services.profiler import Profiler
+
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.profiler = Profiler()
+
+    def tearDown(self):
+        self.profiler.stop()
+        self.tmpdir.cleanup()
+
+    def test_section_without_session_calls_through(self):
+        section = self.profiler.section("work")(lambda x: x + 1)
+        self.assertEqual(section(1), 2)
+        self.assertFalse(self.profiler.is_active())
+
+    def test_sample_mode_writes_summary_and_stacks(self):
+        self.profiler.start("sample", seconds=0, output_dir=self.tmpdir.name)
+        busy_loop(0.2)
+        summary_path, stacks_path = self.profiler.stop()
+
+        with open(summary_path) as f:
+            summary = f.read()
+        self.assertIn("busy_loop", summary)
+        self.assertIn("Top 25 allocation changes", summary)
+        with gzip.open(stacks_path, "rt") as f:
+            self.assertTrue(any("busy_loop" in line for line in f))
+
+    def test_cprofile_mode_profiles_sections(self):
+        done = []
+        self.profiler.add_done_listener(done.append)
+        work = self.profiler.section("work")(busy_loop)
+
+        self.profiler.start("cprofile", seconds=0, output_dir=self.tmpdir.name)
+        work(0.01)
+        work(0.01)
+        paths = self.profiler.stop()
+
+        self.assertEqual(done, [paths])
+        self.assertTrue(paths[1].endswith(".pstats"))
+        with open(paths[0]) as f:
+            self.assertIn("Sections: work x2", f.read())
+
+    def test_overlapping_sections_run_unprofiled(self):
+        results = []
+        inner = self.profiler.section("tick")(lambda: results.append("tick"))
+
+        def outer():
+            # A section on another thread while this one is profiled
+            thread = threading.Thread(target=inner)
+            thread.start()
+            thread.join()
+            inner()
+
+        self.profiler.start("cprofile", seconds=0, output_dir=self.tmpdir.name)
+        self.profiler.section("refresh")(outer)()
+        paths = self.profiler.stop()
+
+        self.assertEqual(results, ["tick", "tick"])
+        with open(paths[0]) as f:
+            summary = f.read()
+        self.assertIn("Sections: refresh x1", summary)
+        self.assertIn("2 overlapping section calls ran unprofiled", summary)
+
+    def test_section_runs_when_profiling_is_taken(self):
+        work = self.profiler.section("work")(lambda x: x * 2)
+        self.profiler.start("cprofile", seconds=0, output_dir=self.tmpdir.name)
+        with mock.patch(
+            "cProfile.Profile.enable",
+            side_effect=ValueError("Another profiling tool is already active"),
+        ):
+            self.assertEqual(work(21), 42)
+
+    def test_window_stops_by_itself(self):
+        done = []
+        self.profiler.add_done_listener(done.append)
+        self.profiler.start("sample", seconds=0.1, output_dir=self.tmpdir.name)
+        self.assertFalse(self.profiler.start("sample"))
+        time.sleep(0.5)
+        self.assertFalse(self.profiler.is_active())
+        self.assertEqual(len(done), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import flet as ft
+from services.housekeeping import Housekeeper
+from views.render_batcher import RenderBatcher
+from views.components.timer_control import TimerControl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePage:
+    def __init__(self):
+        self.updates = []
+
+    def update(self, *controls):
+        self.updates.append(controls)
+
+
+class TestRenderBatcher(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.keeper = Housekeeper(time_func=self.clock, autostart=False)
+        self.page = FakePage()
+        self.batcher = RenderBatcher(self.page, max_fps=10, housekeeper=self.keeper)
+
+    def mounted(self, control):
+        control.page = self.page
+        return control
+
+    def test_batch_flushes_once_with_changed_controls_only(self):
+        a = self.mounted(ft.Text("a"))
+        b = self.mounted(ft.Text("b"))
+        with self.batcher.batch():
+            self.batcher.set(a, value="a2")
+            self.batcher.set(b, value="b")  # unchanged
+            self.batcher.set(a, value="a3")
+        self.assertEqual(self.page.updates, [(a,)])
+        self.assertEqual(a.value, "a3")
+
+    def test_unchanged_values_send_nothing(self):
+        a = self.mounted(ft.Text("a"))
+        self.assertFalse(self.batcher.set(a, value="a"))
+        self.batcher.flush()
+        self.assertEqual(self.page.updates, [])
+
+    def test_frame_rate_cap_defers_flush(self):
+        a = self.mounted(ft.Text("a"))
+        self.batcher.set(a, value="1")
+        self.clock.now += 0.02
+        self.batcher.set(a, value="2")
+        self.batcher.set(a, value="3")
+        self.assertEqual(len(self.page.updates), 1)
+        self.assertEqual(self.keeper.next_deadline(), 100.1)
+
+        self.clock.now = 100.1
+        self.keeper.run_due()
+        self.assertEqual(len(self.page.updates), 2)
+        self.assertEqual(a.value, "3")
+
+    def test_timer_tick_is_one_update(self):
+        timer = TimerControl(renderer=self.batcher)
+        for control in (
+            timer.countdown_text,
+            timer.progress_ring,
+            timer.percentage_text,
+        ):
+            self.mounted(control)
+
+        with self.batcher.batch():
+            timer.update_timer(3599, 3600)
+        # Ring (rounded) and percentage are unchanged, only the text is sent
+        self.assertEqual(self.page.updates, [(timer.countdown_text,)])
+
+        self.clock.now += 1
+        with self.batcher.batch():
+            timer.update_timer(3240, 3600)
+        self.assertEqual(len(self.page.updates), 2)
+        self.assertEqual(len(self.page.updates[1]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
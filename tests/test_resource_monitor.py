@@ -0,0 +1,134 @@
+import unittest
+import subprocess
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from process_manager import ProcessGroup
+from services.resource_monitor import (
+    CPU_BELOW,
+    MEMORY_ABOVE,
+    FakeProcessSampler,
+    PsutilProcessSampler,
+    ResourceMonitor,
+)
+
+APP, WORKER, CHILD, GRANDCHILD = 1001, 1002, 1003, 1004
+MB = 1024 * 1024
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResourceMonitor(unittest.TestCase):
+    def setUp(self):
+        self.sampler = FakeProcessSampler(
+            {APP: (30.0, 100 * MB), WORKER: (20.0, 50 * MB)}, tree={APP: [WORKER]}
+        )
+        self.clock = FakeTime()
+        self.updates = []
+
+    def make_monitor(self, metric, threshold):
+        monitor = ResourceMonitor(
+            [ProcessGroup("render.exe", [APP, WORKER])],
+            metric,
+            threshold,
+            duration_seconds=10,
+            sampler=self.sampler,
+            time_func=self.clock,
+        )
+        monitor._on_update = self.updates.append
+        return monitor
+
+    def step(self, monitor, seconds=2):
+        self.clock.now += seconds
+        monitor.poll()
+        return self.updates[-1]
+
+    def test_first_poll_is_the_baseline(self):
+        monitor = self.make_monitor(CPU_BELOW, 100)
+        status = self.step(monitor, 0)
+        self.assertEqual(status["held_seconds"], 0)
+        self.assertEqual(status["cpu_percent"], 50.0)
+        self.assertEqual(status["alive"], 2)
+        self.assertFalse(monitor._fired)
+
+    def test_fires_after_the_hold_window(self):
+        monitor = self.make_monitor(MEMORY_ABOVE, 120 * MB)
+        self.step(monitor, 0)
+        self.assertEqual(self.step(monitor)["held_seconds"], 0)
+        self.assertEqual(self.step(monitor, 8)["held_seconds"], 8)
+        self.assertFalse(monitor._fired)
+        self.assertEqual(self.step(monitor)["held_seconds"], 10)
+        self.assertTrue(monitor._fired)
+
+    def test_condition_lapsing_restarts_the_window(self):
+        monitor = self.make_monitor(CPU_BELOW, 60)
+        self.step(monitor, 0)
+        self.step(monitor)
+        self.step(monitor, 6)
+        self.sampler.usage[APP] = (70.0, 100 * MB)
+        self.assertEqual(self.step(monitor)["held_seconds"], 0)
+        self.sampler.usage[APP] = (10.0, 100 * MB)
+        self.step(monitor)
+        self.assertEqual(self.step(monitor)["held_seconds"], 2)
+        self.assertFalse(monitor._fired)
+
+    def test_reset_needs_a_new_baseline(self):
+        monitor = self.make_monitor(CPU_BELOW, 60)
+        self.step(monitor, 0)
+        self.step(monitor)
+        self.step(monitor, 6)
+        monitor.reset()
+        self.assertEqual(self.step(monitor)["held_seconds"], 0)
+        self.assertEqual(self.step(monitor)["held_seconds"], 0)
+        self.assertEqual(self.step(monitor)["held_seconds"], 2)
+
+    def test_later_children_are_counted(self):
+        monitor = self.make_monitor(MEMORY_ABOVE, 500 * MB)
+        self.step(monitor, 0)
+        self.sampler.tree[APP].append(CHILD)
+        self.sampler.tree[CHILD] = [GRANDCHILD]
+        self.sampler.usage[CHILD] = (5.0, 400 * MB)
+        self.sampler.usage[GRANDCHILD] = (1.0, 10 * MB)
+        self.assertEqual(self.step(monitor)["alive"], 2)
+
+        status = self.step(monitor, monitor.children_interval)
+        self.assertEqual(status["alive"], 4)
+        self.assertEqual(status["rss"], 560 * MB)
+        self.assertEqual(self.sampler.reads[-1], [APP, WORKER, CHILD, GRANDCHILD])
+
+    def test_exited_processes_are_skipped(self):
+        monitor = self.make_monitor(CPU_BELOW, 60)
+        self.step(monitor, 0)
+        del self.sampler.usage[WORKER]
+        self.assertEqual(self.step(monitor)["alive"], 1)
+        self.assertEqual(self.sampler.reads[-1], [APP, WORKER])
+        self.step(monitor)
+        self.assertEqual(self.sampler.reads[-1], [APP])
+
+
+class TestPsutilProcessSampler(unittest.TestCase):
+    def test_children(self):
+        child = subprocess.Popen(
+            [sys.executable, "-c", "import sys; sys.stdin.read()"],
+            stdin=subprocess.PIPE,
+        )
+        try:
+            sampler = PsutilProcessSampler()
+            self.assertIn(child.pid, sampler.children(os.getpid()))
+            self.assertIn(child.pid, sampler.read([child.pid]))
+        finally:
+            child.kill()
+            child.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
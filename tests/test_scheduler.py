@@ -0,0 +1,208 @@
+import unittest
+import tempfile
+import threading
+import sys
+import os
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backends.processes import FakeProcessBackend, set_process_backend
+from services.housekeeping import Housekeeper
+from services.recurrence import parse_rule
+from services.scheduler import Schedule, Scheduler, run_schedule
+from services.settings_store import SettingsStore
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def at(*parts):
+    return datetime(*parts).timestamp()
+
+
+class ThreadRecordingBackend(FakeProcessBackend):
+    """Records the threads that enumerate processes."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def iter_processes(self):
+        self.threads.append(threading.current_thread())
+        return super().iter_processes()
+
+
+class TestRecurrence(unittest.TestCase):
+    def next_after(self, rule, *parts):
+        return parse_rule(rule).next_after(datetime(*parts))
+
+    def test_short_forms(self):
+        # 2026-10-16 is a Friday
+        self.assertEqual(
+            self.next_after("weekdays 23:30", 2026, 10, 16, 23, 30),
+            datetime(2026, 10, 19, 23, 30),
+        )
+        self.assertEqual(
+            self.next_after("weekends 10:15", 2026, 10, 19),
+            datetime(2026, 10, 24, 10, 15),
+        )
+        self.assertEqual(
+            self.next_after("daily 01:00", 2026, 12, 31, 1, 0),
+            datetime(2027, 1, 1, 1, 0),
+        )
+        self.assertEqual(
+            self.next_after("Mon,Fri 22:00", 2026, 10, 19, 22, 1),
+            datetime(2026, 10, 23, 22, 0),
+        )
+
+    def test_cron_lines(self):
+        self.assertEqual(
+            self.next_after("*/15 9-17 * * mon", 2026, 10, 19, 17, 50),
+            datetime(2026, 10, 26, 9, 0),
+        )
+        self.assertEqual(
+            self.next_after("0 12 29 2 *", 2026, 3, 1),
+            datetime(2028, 2, 29, 12, 0),
+        )
+        # Day of month and day of week both restricted: either one matches
+        self.assertEqual(
+            self.next_after("0 0 13 * fri", 2026, 1, 1),
+            datetime(2026, 1, 2, 0, 0),
+        )
+        self.assertEqual(
+            self.next_after("0 0 * * 7", 2026, 10, 19),
+            datetime(2026, 10, 25, 0, 0),
+        )
+        # A stepped "*" is still unrestricted, so only Fridays match
+        self.assertEqual(
+            self.next_after("0 0 */2 * fri", 2026, 1, 3, 12),
+            datetime(2026, 1, 9, 0, 0),
+        )
+        self.assertEqual(
+            self.next_after("0 0 13 * */3", 2026, 1, 1),
+            datetime(2026, 1, 13, 0, 0),
+        )
+
+    def test_invalid_rules(self):
+        for text in (
+            "0 0 30 2 *",
+            "61 * * * *",
+            "* * * *",
+            "daily 25:00",
+            "someday 10:00",
+            "*/0 * * * *",
+        ):
+            with self.assertRaises(ValueError, msg=text):
+                parse_rule(text)
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        # Monday 2026-10-19 12:00
+        self.clock = FakeClock(at(2026, 10, 19, 12, 0))
+        self.keeper = Housekeeper(time_func=self.clock, autostart=False)
+        self.fired = []
+        self.scheduler = Scheduler(
+            housekeeper=self.keeper, on_fire=self.fired.append, time_func=self.clock
+        )
+
+    def test_fires_and_rearms(self):
+        schedule = self.scheduler.add(Schedule("weekdays 23:30", "Lock"))
+        self.assertEqual(schedule.next_fire, at(2026, 10, 19, 23, 30))
+        self.assertEqual(self.scheduler.run_due(), 0)
+
+        self.clock.now = at(2026, 10, 19, 23, 30, 5)
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.fired, [schedule])
+        self.assertEqual(schedule.next_fire, at(2026, 10, 20, 23, 30))
+
+    def test_hundreds_of_schedules_share_one_wakeup(self):
+        for minute in range(300):
+            self.scheduler.add(
+                Schedule(f"{minute % 60} {13 + minute // 60} * * *", "Lock")
+            )
+        self.assertEqual(self.keeper.stats()["tasks"], 1)
+        self.assertEqual(self.scheduler.next_fire(), at(2026, 10, 19, 13, 0))
+
+        self.clock.now = at(2026, 10, 19, 13, 2)
+        self.assertEqual(self.scheduler.run_due(), 3)
+        self.assertEqual(self.scheduler.next_fire(), at(2026, 10, 19, 13, 3))
+
+    def test_wakeup_is_capped_and_follows_the_wall_clock(self):
+        self.scheduler.add(Schedule("daily 13:00", "Lock"))
+        self.assertEqual(self.keeper.next_deadline(), self.clock.now + 60)
+
+        # The wall clock moved on without the monotonic clock (suspend)
+        self.clock.now = at(2026, 10, 19, 13, 0, 30)
+        self.keeper.run_due(self.keeper.next_deadline())
+        self.assertEqual(len(self.fired), 1)
+
+    def test_missed_fires_are_skipped(self):
+        self.scheduler.add(Schedule("daily 13:00", "Lock"))
+        self.clock.now = at(2026, 10, 20, 8, 0)
+        self.assertEqual(self.scheduler.run_due(), 0)
+        self.assertEqual(self.scheduler.next_fire(), at(2026, 10, 20, 13, 0))
+
+    def test_disable_and_remove(self):
+        first = self.scheduler.add(Schedule("daily 13:00", "Lock"))
+        second = self.scheduler.add(Schedule("daily 14:00", "Sleep"))
+        self.scheduler.set_enabled(first.id, False)
+        self.assertEqual(self.scheduler.next_fire(), second.next_fire)
+        self.scheduler.remove(second.id)
+        self.assertIsNone(self.scheduler.next_fire())
+        self.assertEqual(self.keeper.stats()["tasks"], 0)
+
+        self.scheduler.set_enabled(first.id, True)
+        self.clock.now = at(2026, 10, 19, 13, 0)
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.scheduler.run_due(), 0)
+
+    def test_terminate_needs_processes(self):
+        with self.assertRaises(ValueError):
+            Schedule("daily 13:00", "Terminate Process")
+        with self.assertRaises(ValueError):
+            Schedule("daily 13:00", "Terminate Process", [" "])
+        schedule = Schedule("daily 13:00", "Terminate Process", [" a.exe ", ""])
+        self.assertEqual(schedule.processes, ["a.exe"])
+
+    def test_processes_are_found_on_the_action_worker(self):
+        backend = ThreadRecordingBackend()
+        set_process_backend(backend)
+        self.addCleanup(set_process_backend, None)
+        backend.spawn("game.exe", "C:\\game.exe")
+
+        handle = run_schedule(Schedule("daily 23:00", "Terminate Process", ["game"]))
+        self.assertEqual(handle.result(5)["count"], 1)
+        self.assertTrue(backend.threads)
+        self.assertNotIn(threading.current_thread(), backend.threads)
+
+        # Nothing matches now, which the action reports
+        handle = run_schedule(Schedule("daily 23:00", "Terminate Process", ["game"]))
+        self.assertFalse(handle.result(5)["success"])
+
+    def test_schedules_survive_restart(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SettingsStore(os.path.join(tmpdir, "settings.json"))
+            self.scheduler.load(store)
+            self.scheduler.add(
+                Schedule("30 23 * * 1-5", "Terminate Process", ["chrome", "steam"])
+            )
+            store.flush()
+
+            restored = Scheduler(
+                housekeeper=self.keeper, on_fire=self.fired.append, time_func=self.clock
+            ).load(SettingsStore(store.path).load())
+            [schedule] = restored.schedules()
+            self.assertEqual(schedule.processes, ["chrome", "steam"])
+            self.assertEqual(schedule.next_fire, at(2026, 10, 19, 23, 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.settings_store import SettingsStore
+from state import AppState
+
+
+class CountingStore(SettingsStore):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writes = 0
+
+    def flush(self):
+        if self._dirty:
+            self.writes += 1
+        super().flush()
+
+
+class TestSettingsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "nested", "settings.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_missing_or_corrupt_file_loads_empty(self):
+        store = SettingsStore(self.path).load()
+        self.assertEqual(store.get("dark_mode", True), True)
+
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(SettingsStore(self.path).load().get("dark_mode"))
+
+    def test_round_trip(self):
+        store = SettingsStore(self.path)
+        store.update({"dark_mode": False, "selected_processes": ["chrome"]})
+        store.flush()
+
+        loaded = SettingsStore(self.path).load()
+        self.assertFalse(loaded.get("dark_mode"))
+        self.assertEqual(loaded.get("selected_processes"), ["chrome"])
+        # Only the settings file is left, no temporary files
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["settings.json"])
+
+    def test_rapid_changes_coalesce_into_one_write(self):
+        store = CountingStore(self.path, delay=60)
+        for i in range(20):
+            store.set("minimize_to_tray", i % 2 == 0)
+        # Still waiting for the delay
+        self.assertEqual(store.writes, 0)
+        store.flush()
+        store.flush()
+        self.assertEqual(store.writes, 1)
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"minimize_to_tray": False})
+
+    def test_unchanged_value_does_not_write(self):
+        store = CountingStore(self.path)
+        store.set("dark_mode", True)
+        store.flush()
+        store.set("dark_mode", True)
+        store.flush()
+        self.assertEqual(store.writes, 1)
+
+    def test_bind_applies_and_saves_state(self):
+        store = SettingsStore(self.path)
+        store.update({"show_system_processes": True})
+        state = AppState()
+        store.bind(state)
+        self.assertTrue(state.show_system_processes)
+
+        state.minimize_to_tray = False
+        self.assertFalse(store.get("minimize_to_tray"))
+        store.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
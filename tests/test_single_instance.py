@@ -0,0 +1,131 @@
+import unittest
+import tempfile
+import threading
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.timer_service import TimerService
+from services.control_server import ControlHandler, ControlServer
+import single_instance
+
+
+class TestInstanceLock(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "app.lock")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_second_lock_fails_until_released(self):
+        first = single_instance.InstanceLock(self.path)
+        second = single_instance.InstanceLock(self.path)
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        first.release()
+        self.assertTrue(second.acquire())
+        second.release()
+
+    def test_held_elsewhere(self):
+        first = single_instance.InstanceLock(self.path)
+        probe = single_instance.InstanceLock(self.path)
+        self.assertFalse(probe.held_elsewhere())
+        self.assertTrue(first.acquire())
+        self.assertTrue(probe.held_elsewhere())
+        first.release()
+        self.assertFalse(probe.held_elsewhere())
+        self.assertFalse(probe.is_held())
+
+
+class TestLaunchCommands(unittest.TestCase):
+    def test_no_arguments_only_shows_window(self):
+        self.assertEqual(single_instance.launch_commands([]), [{"cmd": "app.show"}])
+
+    def test_timer_arguments(self):
+        commands = single_instance.launch_commands(
+            ["--after", "45m", "--terminate", "chrome,steam"]
+        )
+        self.assertEqual(
+            commands[1],
+            {
+                "cmd": "timer.start",
+                "args": {
+                    "after": "45m",
+                    "action": "Terminate Process",
+                    "processes": "chrome,steam",
+                },
+            },
+        )
+        commands = single_instance.launch_commands(
+            ["--at", "23:30", "--action", "sleep"]
+        )
+        self.assertEqual(commands[1]["args"], {"at": "23:30", "action": "Sleep"})
+
+
+@unittest.skipIf(sys.platform == "win32", "uses a Unix domain socket")
+class TestHandOff(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmpdir.name, "control.sock")
+        self.lock_path = os.path.join(self.tmpdir.name, "app.lock")
+        self.timer_service = TimerService()
+        self.shown = []
+        handler = ControlHandler(self.timer_service)
+        handler.register("app.show", lambda args: self.shown.append(True))
+        self.server = ControlServer(handler, address=self.address)
+        self.server.start()
+
+    def tearDown(self):
+        self.timer_service.cancel_timer()
+        self.server.stop()
+        self.tmpdir.cleanup()
+
+    def test_hand_off_starts_timer_in_running_instance(self):
+        commands = single_instance.launch_commands(
+            ["--after", "1h", "--action", "lock"]
+        )
+        self.assertEqual(single_instance.hand_off(commands, self.address), 0)
+        self.assertEqual(self.shown, [True])
+        self.assertTrue(self.timer_service.is_running())
+
+    def test_hand_off_without_instance_fails(self):
+        missing = os.path.join(self.tmpdir.name, "missing.sock")
+        code = single_instance.hand_off(
+            [{"cmd": "app.show"}], missing, self.lock_path, delay=0
+        )
+        self.assertEqual(code, 1)
+
+    def test_hand_off_waits_for_a_slow_start(self):
+        lock = single_instance.InstanceLock(self.lock_path)
+        self.assertTrue(lock.acquire())
+        self.addCleanup(lock.release)
+        late = os.path.join(self.tmpdir.name, "late.sock")
+        handler = ControlHandler(self.timer_service)
+        handler.register("app.show", lambda args: self.shown.append(True))
+        server = ControlServer(handler, address=late)
+        self.addCleanup(server.stop)
+        # Longer than the old fixed number of attempts allowed
+        starter = threading.Timer(2.5, server.start)
+        starter.start()
+        self.addCleanup(starter.cancel)
+
+        code = single_instance.hand_off([{"cmd": "app.show"}], late, self.lock_path)
+        self.assertEqual(code, 0)
+        self.assertEqual(self.shown, [True])
+
+    def test_hand_off_gives_up_on_a_hung_instance(self):
+        lock = single_instance.InstanceLock(self.lock_path)
+        self.assertTrue(lock.acquire())
+        self.addCleanup(lock.release)
+        missing = os.path.join(self.tmpdir.name, "missing.sock")
+        code = single_instance.hand_off(
+            [{"cmd": "app.show"}], missing, self.lock_path, timeout=0.2, delay=0.05
+        )
+        self.assertEqual(code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.telemetry import BUCKET_COUNT, Histogram, Telemetry, bucket_index
+
+
+class TestHistogram(unittest.TestCase):
+    def test_bucket_index(self):
+        self.assertEqual(bucket_index(0), 0)
+        self.assertEqual(bucket_index(1023), 0)
+        self.assertEqual(bucket_index(1024), 1)
+        self.assertEqual(bucket_index(2047), 1)
+        self.assertEqual(bucket_index(10**15), BUCKET_COUNT - 1)
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for _ in range(90):
+            histogram.record(500)  # bucket 0, up to 1024 ns
+        for _ in range(10):
+            histogram.record(3_000_000)
+        histogram.fold()
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(0.5), 1024)
+        self.assertEqual(histogram.percentile(0.95), 3_000_000)
+        self.assertEqual(histogram.max, 3_000_000)
+
+    def test_pending_samples_fold_automatically(self):
+        histogram = Histogram()
+        for _ in range(Histogram.FOLD_AT):
+            histogram.record(100)
+        self.assertEqual(histogram.pending, [])
+        self.assertEqual(histogram.count, Histogram.FOLD_AT)
+
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.telemetry = Telemetry()
+
+    def test_disabled_records_nothing(self):
+        work = self.telemetry.timed("work")(lambda x: x * 2)
+        self.assertEqual(work(2), 4)
+        self.telemetry.count("calls")
+        with self.telemetry.timer("block"):
+            pass
+        snapshot = self.telemetry.snapshot()
+        self.assertEqual(snapshot["histograms"], {})
+        self.assertEqual(snapshot["counters"], {})
+
+    def test_timed_records_calls_and_failures(self):
+        self.telemetry.enabled = True
+
+        @self.telemetry.timed("work")
+        def work(fail=False):
+            if fail:
+                raise ValueError("boom")
+
+        work()
+        with self.assertRaises(ValueError):
+            work(fail=True)
+        self.assertEqual(self.telemetry.snapshot()["histograms"]["work"]["count"], 2)
+
+        # Reset clears in place, the existing wrapper keeps recording
+        self.telemetry.reset()
+        work()
+        self.assertEqual(self.telemetry.snapshot()["histograms"]["work"]["count"], 1)
+
+    def test_export_json(self):
+        self.telemetry.enabled = True
+        self.telemetry.count("icons.cache_miss", 3)
+        with self.telemetry.timer("icons.extract"):
+            pass
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = self.telemetry.export_json(os.path.join(tmpdir, "t.json"))
+            with open(path) as f:
+                data = json.load(f)
+        self.assertEqual(data["counters"], {"icons.cache_miss": 3})
+        self.assertEqual(data["histograms"]["icons.extract"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
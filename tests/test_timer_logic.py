@@ -6,6 +6,14 @@ import os
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from services.time_utils import (
+    countdown_seconds,
+    next_occurrence,
+    parse_clock,
+    parse_duration,
+    seconds_until,
+)
+
 class TestTimerLogic(unittest.TestCase):
     def test_specific_time_calculation_same_day(self):
         now = datetime.now()
@@ -33,5 +41,31 @@ class TestTimerLogic(unittest.TestCase):
         # Should be 23 hours from now
         self.assertAlmostEqual(total_seconds, 23 * 3600, delta=1)
 
+    def test_seconds_until_matches_manual_calculation(self):
+        now = datetime(2024, 5, 1, 22, 0, 0)
+        self.assertEqual(seconds_until(time(23, 30), now), 90 * 60)
+        # Already passed today, so it is tomorrow
+        self.assertEqual(seconds_until(time(21, 0), now), 23 * 3600)
+        self.assertEqual(next_occurrence(time(21, 0), now).day, 2)
+
+    def test_countdown_seconds(self):
+        self.assertEqual(countdown_seconds("1", "", "5"), 3605)
+        with self.assertRaises(ValueError):
+            countdown_seconds("x", 0, 0)
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("2h30m"), 9000)
+        self.assertEqual(parse_duration("90s"), 90)
+        self.assertEqual(parse_duration("1h 5s"), 3605)
+        self.assertEqual(parse_duration("20"), 1200)
+        for bad in ("", "2x", "h", "3h later"):
+            with self.assertRaises(ValueError):
+                parse_duration(bad)
+
+    def test_parse_clock(self):
+        self.assertEqual(parse_clock("23:30"), time(23, 30))
+        with self.assertRaises(ValueError):
+            parse_clock("24:00")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.resource_monitor import CPU_BELOW
+from views.components.timer_setup import TimerSetup
+
+
+class TestTimerSetup(unittest.TestCase):
+    def setUp(self):
+        self.setup = TimerSetup()
+
+    def resource_config(self, minutes):
+        self.setup.trigger_type_dropdown.value = "Resource Usage"
+        self.setup.resource_metric_dropdown.value = CPU_BELOW
+        self.setup.resource_threshold_input.value = "5"
+        self.setup.resource_duration_input.value = minutes
+        return self.setup.get_configuration()
+
+    def test_resource_usage_needs_a_duration(self):
+        for minutes in ("0", "", "-2"):
+            config = self.resource_config(minutes)
+            self.assertEqual(config["error"], "Duration must be greater than 0!")
+
+        config = self.resource_config("3")
+        self.assertIsNone(config["error"])
+        self.assertEqual(config["trigger_options"]["duration_seconds"], 180)
+
+    def test_disk_idle_needs_a_duration(self):
+        self.setup.trigger_type_dropdown.value = "Disk Idle"
+        self.setup.disk_threshold_input.value = "1"
+        self.setup.disk_duration_input.value = "0"
+        self.assertIsNotNone(self.setup.get_configuration()["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image
+from services.tray_icons import ICON_SIZE, ProgressIcons, render_ring
+
+
+class TestProgressIcons(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.base = Image.new("RGBA", (32, 32), (255, 255, 255, 255))
+        cls.icons = ProgressIcons(cls.base, steps=20)
+
+    def test_step_rounds_and_clamps(self):
+        self.assertEqual(self.icons.step(0), 0)
+        self.assertEqual(self.icons.step(0.5), 10)
+        self.assertEqual(self.icons.step(0.51), 10)
+        self.assertEqual(self.icons.step(1.5), 20)
+        self.assertEqual(self.icons.step(-1), 0)
+
+    def test_same_step_returns_same_frame(self):
+        # Identity is what lets the tray skip redundant icon updates
+        self.assertIs(self.icons.frame(0.50), self.icons.frame(0.52))
+        self.assertIsNot(self.icons.frame(0.5), self.icons.frame(0.6))
+        self.assertIsNot(self.icons.frame(0.5), self.icons.frame(0.5, paused=True))
+
+    def test_frame_size(self):
+        self.assertEqual(self.icons.frame(0.3).size, (ICON_SIZE, ICON_SIZE))
+
+    def test_ring_fill_changes_pixels(self):
+        empty = render_ring(0)
+        full = render_ring(1)
+        self.assertNotEqual(empty.tobytes(), full.tobytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import time
+import sys
+import os
+from datetime import datetime, time as clock_time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import process_manager
+from backends.processes import FakeProcessBackend, set_process_backend
+from services.action_executor import ActionExecutor
+from services.clock import VirtualClock, system_clock
+from services.housekeeping import Housekeeper
+from services.timer_service import TimerService
+from views.components.timer_setup import TimerSetup
+
+
+class TestVirtualClockScenario(unittest.TestCase):
+    def setUp(self):
+        self.started = time.perf_counter()
+        # Monday 13:30
+        self.clock = VirtualClock(datetime(2024, 1, 1, 13, 30))
+        self.keeper = self.clock.attach(
+            Housekeeper(time_func=self.clock.monotonic, autostart=False)
+        )
+        self.timer = TimerService(housekeeper=self.keeper)
+        self.processes = FakeProcessBackend(self.clock)
+        set_process_backend(self.processes)
+        ActionExecutor.clock = self.clock
+        self.ticks = []
+        self.results = []
+
+    def tearDown(self):
+        set_process_backend(None)
+        ActionExecutor.clock = system_clock
+        # Ten hours of simulated time, in well under a second
+        self.assertLess(time.perf_counter() - self.started, 1.0)
+
+    def start(self, total_seconds, names):
+        def on_finish():
+            groups = process_manager.get_running_processes(with_icons=False)
+            selected, _ = process_manager.find_process_groups(names, groups)
+            self.results.append(
+                ActionExecutor.execute_pipeline(
+                    [
+                        {"actions": ["Terminate Process"], "on_failure": "abort"},
+                        {"actions": ["Wait For Exit"], "timeout": 30},
+                    ],
+                    selected,
+                )
+            )
+
+        self.timer.start_timer(
+            total_seconds,
+            on_tick=lambda remaining, total: self.ticks.append(remaining),
+            on_finish=on_finish,
+        )
+        self.clock.advance(0)
+
+    def remaining(self):
+        return self.timer.get_status()["remaining_seconds"]
+
+    def test_specific_time_uses_the_clock(self):
+        setup = TimerSetup(clock=self.clock)
+        setup.trigger_type_dropdown.value = "Specific Time"
+        setup.selected_time = clock_time(23, 30)
+        config = setup.get_configuration()
+        self.assertIsNone(config["error"])
+        self.assertEqual(config["total_seconds"], 10 * 3600)
+
+    def test_ten_hour_timer_with_pause_resume_and_cancel(self):
+        chrome = self.processes.spawn("chrome.exe", "C:\\chrome.exe", 3, exit_delay=4)
+        self.processes.spawn("steam.exe", "C:\\steam.exe")
+
+        # A first timer is cancelled half way
+        self.start(10 * 3600, ["chrome"])
+        self.clock.jump(5 * 3600)
+        self.assertEqual(self.remaining(), 5 * 3600)
+        self.timer.cancel_timer()
+        self.clock.jump(6 * 3600)
+        self.assertEqual(self.results, [])
+        self.assertIsNone(self.keeper.next_deadline())
+
+        # The second one is paused for two hours along the way
+        self.ticks.clear()
+        self.start(10 * 3600, ["chrome"])
+        self.clock.jump(4 * 3600)
+        self.assertEqual(self.remaining(), 6 * 3600)
+        self.timer.pause_timer()
+        self.clock.jump(2 * 3600)
+        self.assertEqual(self.remaining(), 6 * 3600)
+        self.timer.resume_timer()
+        self.clock.advance(3)
+        self.assertEqual(self.ticks[-4:], [21600, 21599, 21598, 21597])
+
+        self.clock.jump(6 * 3600 - 5)
+        self.assertEqual(self.remaining(), 2)
+        self.assertEqual(self.results, [])
+        self.clock.advance(2)
+
+        self.assertFalse(self.timer.is_running())
+        [result] = self.results
+        self.assertTrue(result["success"])
+        self.assertEqual(sorted(self.processes.terminated), chrome)
+        # Waiting for the exit took the 4s exit delay, on the virtual clock
+        self.assertEqual(result["stages"][1]["elapsed"], 4)
+        names = [g.name for g in process_manager.get_running_processes()]
+        self.assertEqual(names, ["steam.exe"])
+        self.assertEqual(self.clock.now(), datetime(2024, 1, 2, 12, 30, 4))
+
+    def test_wait_for_exit_times_out(self):
+        pids = self.processes.spawn("stuck", protected=True)
+        self.assertFalse(process_manager.kill_processes(pids))
+        self.assertFalse(process_manager.wait_for_exit(pids, 30))
+        self.assertEqual(self.clock.monotonic(), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import flet as ft
+from services.action_executor import PIPELINE_ACTIONS
+
+
+class PipelineBuilder(ft.Column):
+    """
+    Composes a list of pipeline stages. "Add Stage" appends a new stage that
+    runs after the previous one, "Add Parallel" adds the step to the last stage
+    so it runs alongside the steps already there.
+    """
+
+    def __init__(self, on_change=None):
+        super().__init__()
+        self.on_change = on_change
+        self.stages = []
+        self.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+
+        self.step_dropdown = ft.Dropdown(
+            label="Step",
+            options=[ft.dropdown.Option(action) for action in PIPELINE_ACTIONS],
+            value=PIPELINE_ACTIONS[0],
+            width=190,
+        )
+        self.timeout_input = ft.TextField(
+            label="Timeout (s)",
+            value="30",
+            width=100,
+            text_align=ft.TextAlign.CENTER,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            input_filter=ft.InputFilter(
+                allow=True, regex_string=r"^[0-9]*$", replacement_string=""
+            ),
+            max_length=4,
+        )
+        self.policy_dropdown = ft.Dropdown(
+            label="On Failure",
+            options=[ft.dropdown.Option("Continue"), ft.dropdown.Option("Abort")],
+            value="Continue",
+            width=130,
+        )
+
+        self.stages_list = ft.Column(spacing=5)
+        self.empty_text = ft.Text("No stages yet.", italic=True, color="grey500")
+
+        self.controls = [
+            ft.Row(
+                [self.step_dropdown, self.timeout_input, self.policy_dropdown],
+                alignment=ft.MainAxisAlignment.CENTER,
+                wrap=True,
+            ),
+            ft.Row(
+                [
+                    ft.TextButton("Add Stage", icon="add", on_click=self.add_stage),
+                    ft.TextButton(
+                        "Add Parallel", icon="call_split", on_click=self.add_parallel
+                    ),
+                    ft.TextButton("Clear", icon="clear_all", on_click=self.clear),
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+            ),
+            self.empty_text,
+            self.stages_list,
+        ]
+
+    def _timeout(self):
+        try:
+            timeout = int(self.timeout_input.value or 0)
+        except ValueError:
+            timeout = 0
+        return timeout if timeout > 0 else None
+
+    def add_stage(self, e=None):
+        self.stages.append(
+            {
+                "actions": [self.step_dropdown.value],
+                "timeout": self._timeout(),
+                "on_failure": self.policy_dropdown.value.lower(),
+            }
+        )
+        self.render()
+
+    def add_parallel(self, e=None):
+        if not self.stages:
+            self.add_stage()
+            return
+        self.stages[-1]["actions"].append(self.step_dropdown.value)
+        self.render()
+
+    def remove_stage(self, index):
+        del self.stages[index]
+        self.render()
+
+    def clear(self, e=None):
+        self.stages = []
+        self.render()
+
+    def get_stages(self):
+        return [dict(stage, actions=list(stage["actions"])) for stage in self.stages]
+
+    def render(self):
+        self.stages_list.controls = []
+        for index, stage in enumerate(self.stages):
+            timeout = f"{stage['timeout']}s" if stage["timeout"] else "no timeout"
+            self.stages_list.controls.append(
+                ft.Row(
+                    [
+                        ft.Text(f"{index + 1}.", weight=ft.FontWeight.BOLD),
+                        ft.Text(
+                            " + ".join(stage["actions"]),
+                            expand=True,
+                        ),
+                        ft.Text(
+                            f"{timeout}, {stage['on_failure']}",
+                            size=12,
+                            color="grey500",
+                        ),
+                        ft.IconButton(
+                            icon="delete",
+                            icon_size=18,
+                            on_click=lambda e, i=index: self.remove_stage(i),
+                        ),
+                    ],
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                )
+            )
+        self.empty_text.visible = not self.stages
+        self.update()
+
+        if self.on_change:
+            self.on_change(self.get_stages())
@@ -1,14 +1,56 @@
 import flet as ft
 from state import app_state
 import process_manager
+from services.profiler import profiler
+from services.telemetry import telemetry
+from views.render_batcher import render_batcher
+
+# Most rows in the list. Only a handful fit in the box, and every row is a
+# few controls the page has to diff and send, so with tens of thousands of
+# groups the rest is left to the search.
+MAX_ROWS = 100
+
+SELECTED_COLOR = "blue900"
 
 
 class ProcessSelector(ft.Column):
-    def __init__(self, on_selection_change=None):
+    """
+    Searchable list of the running process groups.
+
+    Rows are capped at MAX_ROWS, and the tile of a group is kept across
+    searches and refreshes, so typing only sends the rows that come and go.
+    Selecting a group sends just its tile and the label, and icons are only
+    extracted for rows that are shown.
+
+    With command line search on, a group whose name does not match but some
+    of whose command lines do is shown narrowed to those processes, and
+    selecting it targets just them. Command lines are read on the first such
+    search after a refresh, from CmdlineCache, which only reads processes it
+    has not seen yet. Each group's lines are joined into one string, so
+    later keystrokes search memory.
+    """
+
+    def __init__(self, on_selection_change=None, renderer=None):
         super().__init__()
         self.on_selection_change = on_selection_change
+        self.renderer = renderer or render_batcher
         self.selected_processes = []
         self.all_processes = []
+        # Group ids to select once the process list has loaded
+        self.pending_selection = []
+        self.search_cmdlines = False
+        # Full groups and the rows on screen (which may be narrowed), by id
+        self._groups = {}
+        self._rows = {}
+        self._tiles = {}
+        # Group id to its processes' command lines, built on demand
+        self._cmdlines = None
+        # (lowercase name, group) in list order, and the last search, so a
+        # query that extends it only searches the previous matches
+        self._search_keys = []
+        self._last_query = None
+        self._last_cmdlines = False
+        self._last_matches = []
 
         self.search_field = ft.TextField(
             hint_text="Search process...",
@@ -18,6 +60,13 @@ class ProcessSelector(ft.Column):
             expand=True,
         )
 
+        self.cmdline_checkbox = ft.Checkbox(
+            label="Command lines",
+            value=False,
+            tooltip="Also search the command lines of the processes",
+            on_change=lambda e: self.set_cmdline_search(e.control.value),
+        )
+
         self.refresh_button = ft.IconButton(
             icon="refresh",
             tooltip="Refresh Process List",
@@ -26,6 +75,8 @@ class ProcessSelector(ft.Column):
 
         self.process_list_view = ft.ListView(expand=True, spacing=10, padding=10)
 
+        self.more_label = ft.Text("", size=12, color="grey500", visible=False)
+
         self.selected_label = ft.Text(
             "",
             size=14,
@@ -40,7 +91,7 @@ class ProcessSelector(ft.Column):
                 "Select a Process to Terminate:", weight=ft.FontWeight.BOLD, size=16
             ),
             ft.Container(height=5),
-            ft.Row([self.search_field, self.refresh_button]),
+            ft.Row([self.search_field, self.cmdline_checkbox, self.refresh_button]),
             ft.Container(
                 content=self.process_list_view,
                 height=250,
@@ -48,67 +99,207 @@ class ProcessSelector(ft.Column):
                 border_radius=10,
                 padding=5,
             ),
+            self.more_label,
             self.selected_label,
             ft.Container(height=5),
         ]
 
-        # Register callback
-        app_state.refresh_processes_callback = self.refresh_processes
+        app_state.subscribe("show_system_processes", self.on_show_system_change)
+        app_state.subscribe("process_grouping", self.on_grouping_change)
+
+    def on_show_system_change(self, show_all):
+        self.refresh_processes()
 
+    def on_grouping_change(self, grouping):
+        # Groups of the old grouping mean nothing in the new one
+        self._tiles = {}
+        self.selected_processes = []
+        self.update_selected_label()
+        if self.on_selection_change:
+            self.on_selection_change(self.selected_processes)
+        self.refresh_processes()
+
+    def restore_selection(self, ids):
+        """
+        Selects the groups with these ids (see ProcessGroup.id) once the list
+        has loaded.
+        """
+        self.pending_selection = list(ids)
+
+    def set_cmdline_search(self, enabled):
+        self.search_cmdlines = enabled
+        self.search_field.hint_text = (
+            "Search process or command line..." if enabled else "Search process..."
+        )
+        self.filter_processes(self.search_field.value or "")
+
+    @profiler.section("process_refresh")
     def refresh_processes(self):
+        # Icons are filled in afterwards, so the list shows up right away
+        grouping = app_state.process_grouping
         self.all_processes = process_manager.get_running_processes(
-            show_all=app_state.show_system_processes
+            show_all=app_state.show_system_processes,
+            with_icons=False,
+            grouping=grouping,
         )
+        self._groups = {p.key: p for p in self.all_processes}
+        if grouping == "name":
+            self._search_keys = [(p.name.lower(), p) for p in self.all_processes]
+        else:
+            # Groups can share a name, the path tells them apart
+            self._search_keys = [
+                (f"{p.name}\n{p.path}".lower(), p) for p in self.all_processes
+            ]
+        self._last_query = None
+        self._cmdlines = None
+        # Tiles of groups that are still running are reused
+        self._tiles = {
+            key: tile for key, tile in self._tiles.items() if key in self._groups
+        }
+        if self.pending_selection:
+            self.selected_processes = []
+            for group_id in self.pending_selection:
+                key, _, match = group_id.partition("\n")
+                group = self._groups.get(key)
+                if group is not None:
+                    self.selected_processes.append(
+                        group.narrowed(match) if match else group
+                    )
+            self.pending_selection = []
+            self.update_selected_label()
+            if self.on_selection_change:
+                self.on_selection_change(self.selected_processes)
         self.filter_processes(
             self.search_field.value if self.search_field.value else ""
         )
 
+    def load_icons(self):
+        """
+        Fetches the missing icons of the rows in the list, without waiting.
+        Each one is swapped in as it arrives and the render batcher caps the
+        redraws. Groups that are never shown are never extracted.
+        """
+        paths = []
+        for tile in self.process_list_view.controls:
+            group = self._rows.get(tile.data)
+            if group and group.path and isinstance(tile.leading, ft.Icon):
+                paths.append(group.path)
+        process_manager.IconCache.fetch_async(paths, self.show_icon)
+
+    def show_icon(self, path, icon):
+        # May run on an icon worker thread
+        if not icon:
+            return
+        for tile in self.process_list_view.controls:
+            group = self._rows.get(tile.data)
+            if group and group.path == path and isinstance(tile.leading, ft.Icon):
+                self.renderer.set(tile, leading=self.leading_control(group))
+
+    @staticmethod
+    def leading_control(proc):
+        icon = proc.icon
+        if icon:
+            leading_control = ft.Image(src="", width=32, height=32)
+            leading_control.src_base64 = icon
+            return leading_control
+        return ft.Icon("apps")
+
+    def tile_for(self, proc, selected_ids):
+        # One tile per group, also when the row is narrowed to a match
+        tile = self._tiles.get(proc.key)
+        if proc.match:
+            subtitle = f"{len(proc.pids)} processes matching '{proc.match}'"
+        else:
+            subtitle = f"{len(proc.pids)} processes"
+        if proc.grouping != "name" and proc.path:
+            subtitle += f" · {proc.path}"
+        if tile is None:
+            tile = ft.ListTile(
+                leading=self.leading_control(proc),
+                title=ft.Text(proc.name),
+                subtitle=ft.Text(subtitle),
+                on_click=lambda e: self.select_process(self._rows[e.control.data]),
+                hover_color="grey900",
+            )
+            self._tiles[proc.key] = tile
+        else:
+            tile.subtitle.value = subtitle
+        tile.data = proc.id
+        tile.bgcolor = SELECTED_COLOR if proc.id in selected_ids else None
+        return tile
+
+    @telemetry.timed("ui.load_cmdlines")
+    def load_cmdlines(self):
+        get = process_manager.CmdlineCache.get
+        self._cmdlines = {
+            p.id: "\n".join([get(pid) for pid in p.pids]) for p in self.all_processes
+        }
+
+    @telemetry.timed("ui.filter_processes")
     def filter_processes(self, query):
-        self.process_list_view.controls.clear()
         query = query.lower()
-        selected_names = [p["name"] for p in self.selected_processes]
-
-        for proc in self.all_processes:
-            if query in proc["name"].lower():
-                # Determine icon
-                if proc.get("icon"):
-                    leading_control = ft.Image(src="", width=32, height=32)
-                    leading_control.src_base64 = proc["icon"]
-                else:
-                    leading_control = ft.Icon("apps")
-
-                # Create a list tile for each process
-                tile = ft.ListTile(
-                    leading=leading_control,
-                    title=ft.Text(proc["name"]),
-                    subtitle=ft.Text(f"{len(proc['pids'])} processes"),
-                    on_click=lambda e, p=proc: self.select_process(p),
-                    hover_color="grey900",
-                    data=proc["name"],
-                )
-
-                if proc["name"] in selected_names:
-                    tile.bgcolor = "blue900"
+        cmdlines = self.search_cmdlines and bool(query)
+        if cmdlines and self._cmdlines is None:
+            self.load_cmdlines()
+        if (
+            self._last_query is not None
+            and query.startswith(self._last_query)
+            and cmdlines == self._last_cmdlines
+        ):
+            candidates = self._last_matches
+        else:
+            candidates = self._search_keys
+        if cmdlines:
+            matches = [
+                item
+                for item in candidates
+                if query in item[0] or query in self._cmdlines[item[1].id]
+            ]
+        else:
+            matches = [item for item in candidates if query in item[0]]
+        self._last_query = query
+        self._last_cmdlines = cmdlines
+        self._last_matches = matches
 
-                self.process_list_view.controls.append(tile)
+        rows = [
+            proc if query in text else proc.narrowed(query)
+            for text, proc in matches[:MAX_ROWS]
+        ]
+        self._rows = {proc.id: proc for proc in rows}
+        selected_ids = {p.id for p in self.selected_processes}
+        self.process_list_view.controls = [
+            self.tile_for(proc, selected_ids) for proc in rows
+        ]
+        hidden = len(matches) - MAX_ROWS
+        self.more_label.value = f"{hidden} more, refine the search to see them"
+        self.more_label.visible = hidden > 0
 
         self.update()
+        self.load_icons()
 
     def select_process(self, proc):
-        # Check if already selected (by name)
-        existing = next(
-            (p for p in self.selected_processes if p["name"] == proc["name"]), None
-        )
+        # Check if already selected (by id)
+        existing = next((p for p in self.selected_processes if p.id == proc.id), None)
 
         if existing:
             self.selected_processes.remove(existing)
         else:
             self.selected_processes.append(proc)
 
-        # Update visual selection
-        selected_names = [p["name"] for p in self.selected_processes]
+        with self.renderer.batch():
+            self.update_selected_label()
+            for tile in self.process_list_view.controls:
+                if tile.data == proc.id:
+                    self.renderer.set(
+                        tile, bgcolor=None if existing else SELECTED_COLOR
+                    )
+
+        if self.on_selection_change:
+            self.on_selection_change(self.selected_processes)
+
+    def update_selected_label(self):
+        selected_names = [p.label for p in self.selected_processes]
 
-        # Update Label
         if self.selected_processes:
             count = len(self.selected_processes)
             if count > 3:
@@ -120,18 +311,7 @@ class ProcessSelector(ft.Column):
             else:
                 txt = "Selected: " + ", ".join(selected_names)
 
-            self.selected_label.value = txt
-            self.selected_label.visible = True
+            self.renderer.set(self.selected_label, value=txt, visible=True)
         else:
-            self.selected_label.visible = False
-
-        for tile in self.process_list_view.controls:
-            if tile.data in selected_names:
-                tile.bgcolor = "blue900"
-            else:
-                tile.bgcolor = None
-
-        self.update()
-
-        if self.on_selection_change:
-            self.on_selection_change(self.selected_processes)
+            self.renderer.set(self.selected_label, visible=False)
+        return selected_names
@@ -1,9 +1,12 @@
 import flet as ft
+from views.render_batcher import render_batcher
 
 
 class TimerControl(ft.Stack):
-    def __init__(self):
+    def __init__(self, renderer=None):
         super().__init__()
+        # Countdown changes go through the batcher, one page update per tick
+        self.renderer = renderer or render_batcher
         self.progress_ring = ft.ProgressRing(
             width=200, height=200, stroke_width=15, value=0, color="blue500"
         )
@@ -45,24 +48,29 @@ class TimerControl(ft.Stack):
         mins, secs = divmod(remaining_seconds, 60)
         hours, mins = divmod(mins, 60)
 
-        self.countdown_text.value = "{:02d}:{:02d}:{:02d}".format(hours, mins, secs)
-
-        # Dynamic font sizing
-        if len(self.countdown_text.value) > 8:
-            self.countdown_text.size = 28
-        else:
-            self.countdown_text.size = 40
-
         if total_seconds > 0:
-            self.progress_ring.value = (
-                total_seconds - remaining_seconds
-            ) / total_seconds
-            self.percentage_text.value = f"{int(self.progress_ring.value * 100)}%"
+            value = (total_seconds - remaining_seconds) / total_seconds
         else:
-            self.progress_ring.value = 0
-            self.percentage_text.value = "0%"
+            value = 0
+        self._show(
+            "{:02d}:{:02d}:{:02d}".format(hours, mins, secs),
+            value,
+        )
 
-        self.update()
+    def update_progress(self, value, label):
+        """
+        Shows progress that is not a countdown, e.g. processes left to exit.
+        """
+        self._show(label, value)
+
+    def _show(self, label, value):
+        # Dynamic font sizing
+        self.renderer.set(
+            self.countdown_text, value=label, size=28 if len(label) > 8 else 40
+        )
+        # A thousandth of the ring is under a pixel, finer steps only add traffic
+        self.renderer.set(self.progress_ring, value=round(value, 3))
+        self.renderer.set(self.percentage_text, value=f"{int(value * 100)}%")
 
     def reset(self):
         self.countdown_text.value = "00:00:00"
@@ -1,10 +1,37 @@
 import flet as ft
-from datetime import datetime, timedelta
+from services.clock import system_clock
+from services.resource_monitor import CPU_BELOW, MEMORY_ABOVE
+from services.disk_idle_monitor import list_disk_devices
+from services.time_utils import (
+    countdown_seconds,
+    next_occurrence,
+    parse_clock,
+    seconds_until,
+)
+from views.components.pipeline_builder import PipelineBuilder
+
+# Text inputs remembered between launches, by settings key
+SAVED_INPUTS = {
+    "hours": "hours_input",
+    "minutes": "minutes_input",
+    "seconds": "seconds_input",
+    "resource_threshold": "resource_threshold_input",
+    "resource_duration": "resource_duration_input",
+    "battery_threshold": "battery_threshold_input",
+    "disk_threshold": "disk_threshold_input",
+    "disk_duration": "disk_duration_input",
+}
 
 
 class TimerSetup(ft.Column):
-    def __init__(self, on_action_change=None, on_trigger_change=None):
+    def __init__(self, on_action_change=None, on_trigger_change=None, clock=None):
+        """
+        Args:
+            clock (SystemClock): Source of "now" for Specific Time, so tests
+                can use a VirtualClock.
+        """
         super().__init__()
+        self.clock = clock or system_clock
         self.on_action_change = on_action_change
         self.on_trigger_change = on_trigger_change
         self.horizontal_alignment = ft.CrossAxisAlignment.START
@@ -15,6 +42,10 @@ class TimerSetup(ft.Column):
             options=[
                 ft.dropdown.Option("Countdown"),
                 ft.dropdown.Option("Specific Time"),
+                ft.dropdown.Option("Resource Usage"),
+                ft.dropdown.Option("Battery Low"),
+                ft.dropdown.Option("Process Exit"),
+                ft.dropdown.Option("Disk Idle"),
                 ft.dropdown.Option("Immediate"),
             ],
             value="Countdown",
@@ -31,6 +62,7 @@ class TimerSetup(ft.Column):
                 ft.dropdown.Option("Restart"),
                 ft.dropdown.Option("Lock"),
                 ft.dropdown.Option("Sleep"),
+                ft.dropdown.Option("Pipeline"),
             ],
             value="Terminate Process",
             expand=True,
@@ -99,7 +131,7 @@ class TimerSetup(ft.Column):
             "Today", size=16, weight=ft.FontWeight.BOLD, text_align=ft.TextAlign.CENTER
         )
         self.date_display_text = ft.Text(
-            value=datetime.now().strftime("%A, %d %B %Y"),
+            value=self.clock.now().strftime("%A, %d %B %Y"),
             size=12,
             color="grey400",
             text_align=ft.TextAlign.CENTER,
@@ -141,6 +173,123 @@ class TimerSetup(ft.Column):
             visible=False,
         )
 
+        # Resource Usage Inputs
+        self.resource_metric_dropdown = ft.Dropdown(
+            label="Condition",
+            options=[
+                ft.dropdown.Option(CPU_BELOW),
+                ft.dropdown.Option(MEMORY_ABOVE),
+            ],
+            value=CPU_BELOW,
+            width=160,
+        )
+        self.resource_metric_dropdown.on_change = self.on_resource_metric_change
+        self.resource_threshold_input = ft.TextField(
+            label="CPU %",
+            value="2",
+            width=90,
+            text_align=ft.TextAlign.CENTER,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            input_filter=ft.InputFilter(
+                allow=True, regex_string=r"^[0-9]*\.?[0-9]*$", replacement_string=""
+            ),
+            max_length=6,
+        )
+        self.resource_duration_input = ft.TextField(
+            label="For (mins)",
+            value="3",
+            width=90,
+            text_align=ft.TextAlign.CENTER,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            input_filter=ft.InputFilter(
+                allow=True, regex_string=r"^[0-9]*$", replacement_string=""
+            ),
+            max_length=5,
+        )
+
+        self.resource_inputs = ft.Row(
+            [
+                self.resource_metric_dropdown,
+                self.resource_threshold_input,
+                self.resource_duration_input,
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            visible=False,
+        )
+
+        # Battery Low Inputs
+        self.battery_threshold_input = ft.TextField(
+            label="Below %",
+            value="20",
+            width=100,
+            text_align=ft.TextAlign.CENTER,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            input_filter=ft.InputFilter(
+                allow=True, regex_string=r"^[0-9]*$", replacement_string=""
+            ),
+            max_length=2,
+        )
+        self.battery_inputs = ft.Row(
+            [self.battery_threshold_input],
+            alignment=ft.MainAxisAlignment.CENTER,
+            visible=False,
+        )
+
+        # Disk Idle Inputs
+        self.disk_threshold_input = ft.TextField(
+            label="Below MB/s",
+            value="1",
+            width=110,
+            text_align=ft.TextAlign.CENTER,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            input_filter=ft.InputFilter(
+                allow=True, regex_string=r"^[0-9]*\.?[0-9]*$", replacement_string=""
+            ),
+            max_length=6,
+        )
+        self.disk_duration_input = ft.TextField(
+            label="For (mins)",
+            value="2",
+            width=90,
+            text_align=ft.TextAlign.CENTER,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            input_filter=ft.InputFilter(
+                allow=True, regex_string=r"^[0-9]*$", replacement_string=""
+            ),
+            max_length=5,
+        )
+        self.disk_device_chips = ft.Row(wrap=True, spacing=5)
+
+        self.disk_inputs = ft.Column(
+            [
+                ft.Row(
+                    [self.disk_threshold_input, self.disk_duration_input],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                ft.Text(
+                    "Disks (none selected = all):",
+                    size=12,
+                    color="grey500",
+                ),
+                self.disk_device_chips,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            visible=False,
+        )
+
+        # Pipeline Composer
+        self.pipeline_builder = PipelineBuilder(
+            on_change=lambda stages: self.on_action_change_handler(None)
+        )
+        self.pipeline_section = ft.Column(
+            [
+                ft.Divider(),
+                ft.Text("Pipeline Stages:", weight=ft.FontWeight.BOLD, size=16),
+                self.pipeline_builder,
+            ],
+            visible=False,
+        )
+
         self.settings_divider = ft.Divider()
         self.settings_header = ft.Text(
             "Timer Settings:", weight=ft.FontWeight.BOLD, size=16
@@ -163,6 +312,10 @@ class TimerSetup(ft.Column):
             ft.Container(height=5),
             self.countdown_inputs,
             self.specific_time_inputs,
+            self.resource_inputs,
+            self.battery_inputs,
+            self.disk_inputs,
+            self.pipeline_section,
         ]
 
     def open_time_picker(self, e):
@@ -170,61 +323,155 @@ class TimerSetup(ft.Column):
             self.page.open(self.time_picker)
 
     def on_trigger_type_change(self, e):
+        self._show_trigger_inputs()
+
+        if self.on_trigger_change:
+            self.on_trigger_change(self.trigger_type_dropdown.value)
+
+        self.update()
+
+    def _show_trigger_inputs(self):
         is_countdown = self.trigger_type_dropdown.value == "Countdown"
         is_specific = self.trigger_type_dropdown.value == "Specific Time"
+        is_resource = self.trigger_type_dropdown.value == "Resource Usage"
+        is_battery = self.trigger_type_dropdown.value == "Battery Low"
+        is_disk = self.trigger_type_dropdown.value == "Disk Idle"
         is_immediate = self.trigger_type_dropdown.value == "Immediate"
 
         self.countdown_inputs.visible = is_countdown
         self.specific_time_inputs.visible = is_specific
+        self.resource_inputs.visible = is_resource
+        self.battery_inputs.visible = is_battery
+        self.disk_inputs.visible = is_disk
+        if is_disk:
+            self.refresh_disk_devices()
 
         # Toggle settings header visibility
-        self.settings_divider.visible = not is_immediate
-        self.settings_header.visible = not is_immediate
-
-        if self.on_trigger_change:
-            self.on_trigger_change(self.trigger_type_dropdown.value)
-
-        self.update()
+        has_settings = not is_immediate and self.trigger_type_dropdown.value != (
+            "Process Exit"
+        )
+        self.settings_divider.visible = has_settings
+        self.settings_header.visible = has_settings
 
     def on_action_change_handler(self, e):
+        is_pipeline = self.action_dropdown.value == "Pipeline"
+        if self.pipeline_section.visible != is_pipeline:
+            self.pipeline_section.visible = is_pipeline
+            self.update()
+
         if self.on_action_change:
             self.on_action_change(self.action_dropdown.value)
 
+    def refresh_disk_devices(self):
+        selected = set(self.get_selected_disks())
+        self.disk_device_chips.controls = [
+            ft.Chip(
+                label=ft.Text(name),
+                selected=name in selected,
+                on_select=self.on_disk_chip_select,
+                data=name,
+            )
+            for name in list_disk_devices()
+        ]
+
+    def on_disk_chip_select(self, e):
+        e.control.selected = e.data == "true"
+        self.update()
+
+    def get_selected_disks(self):
+        return [chip.data for chip in self.disk_device_chips.controls if chip.selected]
+
+    def on_resource_metric_change(self, e):
+        if self.resource_metric_dropdown.value == MEMORY_ABOVE:
+            self.resource_threshold_input.label = "RAM GB"
+            self.resource_threshold_input.value = "4"
+        else:
+            self.resource_threshold_input.label = "CPU %"
+            self.resource_threshold_input.value = "2"
+        self.update()
+
     def on_time_picked(self, e):
         self.selected_time = self.time_picker.value
         if self.selected_time:
-            self.time_input_field.value = self.selected_time.strftime("%H:%M")
+            self._show_selected_time()
+        self.update()
 
-            # Update date display
-            now = datetime.now()
-            target_dt = datetime.combine(now.date(), self.selected_time)
-            is_tomorrow = False
-            if target_dt <= now:
-                target_dt += timedelta(days=1)
-                is_tomorrow = True
+    def _show_selected_time(self):
+        self.time_input_field.value = self.selected_time.strftime("%H:%M")
 
-            self.day_status_text.value = "Tomorrow" if is_tomorrow else "Today"
-            self.date_display_text.value = target_dt.strftime("%A, %d %B %Y")
+        # Update date display
+        now = self.clock.now()
+        target_dt = next_occurrence(self.selected_time, now)
+        is_tomorrow = target_dt.date() != now.date()
 
-        self.update()
+        self.day_status_text.value = "Tomorrow" if is_tomorrow else "Today"
+        self.date_display_text.value = target_dt.strftime("%A, %d %B %Y")
+
+    def get_saved_values(self):
+        """
+        Returns the trigger, action and inputs to remember for the next launch.
+        """
+        values = {
+            "trigger": self.trigger_type_dropdown.value,
+            "action": self.action_dropdown.value,
+            "resource_metric": self.resource_metric_dropdown.value,
+        }
+        for key, attr in SAVED_INPUTS.items():
+            values[key] = getattr(self, attr).value
+        if self.selected_time:
+            values["time"] = self.selected_time.strftime("%H:%M")
+        return values
+
+    def restore(self, values):
+        """
+        Applies values from get_saved_values(). Works before the control is
+        mounted, so it can run ahead of the first paint. Unknown or invalid
+        values are ignored.
+        """
+        for key, dropdown in (
+            ("trigger", self.trigger_type_dropdown),
+            ("action", self.action_dropdown),
+            ("resource_metric", self.resource_metric_dropdown),
+        ):
+            if values.get(key) in [option.key for option in dropdown.options]:
+                dropdown.value = values[key]
+        for key, attr in SAVED_INPUTS.items():
+            if isinstance(values.get(key), str):
+                getattr(self, attr).value = values[key]
+
+        if self.resource_metric_dropdown.value == MEMORY_ABOVE:
+            self.resource_threshold_input.label = "RAM GB"
+        if values.get("time"):
+            try:
+                self.selected_time = parse_clock(values["time"])
+                self._show_selected_time()
+            except ValueError:
+                pass
+
+        self._show_trigger_inputs()
+        self.pipeline_section.visible = self.action_dropdown.value == "Pipeline"
 
     def get_configuration(self):
         """
         Returns a dict containing the current configuration.
         Returns:
-            dict: { 'trigger_type': str, 'action': str, 'total_seconds': int, 'error': str|None }
+            dict: { 'trigger_type': str, 'action': str, 'total_seconds': int,
+                    'trigger_options': dict, 'pipeline': list, 'error': str|None }
         """
         trigger_type = self.trigger_type_dropdown.value
         action = self.action_dropdown.value
         total_seconds = 0
+        trigger_options = {}
+        pipeline = []
         error = None
 
         if trigger_type == "Countdown":
             try:
-                h = int(self.hours_input.value) if self.hours_input.value else 0
-                m = int(self.minutes_input.value) if self.minutes_input.value else 0
-                s = int(self.seconds_input.value) if self.seconds_input.value else 0
-                total_seconds = h * 3600 + m * 60 + s
+                total_seconds = countdown_seconds(
+                    self.hours_input.value,
+                    self.minutes_input.value,
+                    self.seconds_input.value,
+                )
                 if total_seconds <= 0:
                     error = "Time must be greater than 0!"
             except ValueError:
@@ -233,20 +480,72 @@ class TimerSetup(ft.Column):
             if not self.selected_time:
                 error = "Please pick a time!"
             else:
-                now = datetime.now()
-                target_time = datetime.combine(now.date(), self.selected_time)
-                if target_time <= now:
-                    target_time += timedelta(days=1)
+                total_seconds = seconds_until(self.selected_time, self.clock.now())
 
-                diff = target_time - now
-                total_seconds = int(diff.total_seconds())
+        elif trigger_type == "Resource Usage":
+            metric = self.resource_metric_dropdown.value
+            try:
+                threshold = float(self.resource_threshold_input.value or 0)
+                minutes = int(self.resource_duration_input.value or 0)
+            except ValueError:
+                threshold, minutes = 0, 0
+                error = "Invalid threshold input!"
+
+            if error:
+                pass
+            elif threshold <= 0:
+                error = "Threshold must be greater than 0!"
+            elif minutes <= 0:
+                error = "Duration must be greater than 0!"
+            elif metric == CPU_BELOW and threshold > 100:
+                error = "CPU threshold cannot exceed 100%!"
+            else:
+                if metric == MEMORY_ABOVE:
+                    threshold = int(threshold * 1024**3)
+                trigger_options = {
+                    "metric": metric,
+                    "threshold": threshold,
+                    "duration_seconds": minutes * 60,
+                }
+
+        elif trigger_type == "Battery Low":
+            try:
+                threshold = int(self.battery_threshold_input.value or 0)
+            except ValueError:
+                threshold = 0
+            if not 1 <= threshold <= 99:
+                error = "Battery threshold must be between 1 and 99%!"
+            else:
+                trigger_options = {"threshold": threshold}
+
+        elif trigger_type == "Disk Idle":
+            try:
+                threshold = float(self.disk_threshold_input.value or 0)
+                minutes = int(self.disk_duration_input.value or 0)
+            except ValueError:
+                threshold, minutes = 0, 0
+            if threshold <= 0 or minutes <= 0:
+                error = "Threshold and duration must be greater than 0!"
+            else:
+                trigger_options = {
+                    "devices": self.get_selected_disks(),
+                    "threshold": threshold * 1024**2,
+                    "duration_seconds": minutes * 60,
+                }
 
         elif trigger_type == "Immediate":
             pass
 
+        if action == "Pipeline" and not error:
+            pipeline = self.pipeline_builder.get_stages()
+            if not pipeline:
+                error = "Please add at least one pipeline stage!"
+
         return {
             "trigger_type": trigger_type,
             "action": action,
             "total_seconds": total_seconds,
+            "trigger_options": trigger_options,
+            "pipeline": pipeline,
             "error": error,
         }
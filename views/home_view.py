@@ -1,11 +1,27 @@
+import threading
 import flet as ft
 from datetime import datetime, timedelta
-from state import app_state
+from state import TimerInfo, app_state
 from views.components.timer_control import TimerControl
 from views.components.process_selector import ProcessSelector
 from views.components.timer_setup import TimerSetup
 from services.timer_service import TimerService
 from services.action_executor import ActionExecutor
+from services.resource_monitor import ResourceMonitor, format_bytes
+from services.battery_monitor import BatteryMonitor, PsutilPowerSource
+from services.process_exit_watcher import ProcessExitWatcher
+from services.disk_idle_monitor import DiskIdleMonitor
+from services.settings_store import settings
+from views.render_batcher import render_batcher
+
+# Longest a single action may take before its handle reports a timeout.
+# Pipelines are bounded by their own per-stage timeouts instead.
+ACTION_TIMEOUT = 60
+
+# Triggers that watch the selected processes, so a selection is needed even
+# when the action itself is not "Terminate Process".
+PROCESS_TRIGGERS = ("Resource Usage", "Process Exit")
+WATCHER_TRIGGERS = ("Resource Usage", "Battery Low", "Process Exit", "Disk Idle")
 
 
 class HomeView(ft.Column):
@@ -20,6 +36,10 @@ class HomeView(ft.Column):
         if not app_state.timer_service:
             app_state.timer_service = TimerService()
         self.timer_service = app_state.timer_service
+        self.active_watcher = None
+        self.action_handle = None
+        self._action_run = 0
+        self.refresh_thread = None
 
         # UI Components
         self.header = ft.Text(
@@ -38,6 +58,9 @@ class HomeView(ft.Column):
             on_action_change=self.on_action_change,
             on_trigger_change=self.on_trigger_change,
         )
+        # Last used configuration, before the first paint
+        self.timer_setup.restore(settings.get("last_timer", {}))
+        self.process_selector.restore_selection(settings.get("selected_processes", []))
 
         self.selected_process_text = ft.Text(
             "No process selected", italic=True, color="grey500"
@@ -65,6 +88,7 @@ class HomeView(ft.Column):
         self.finish_clock_text = ft.Text(
             "", size=16, weight=ft.FontWeight.BOLD, color="blue400"
         )
+        self.usage_text = ft.Text("", size=14, color="grey400", visible=False)
 
         # Containers
         self.timer_container = ft.Column(
@@ -73,6 +97,7 @@ class HomeView(ft.Column):
                 ft.Container(height=10),
                 ft.Text("Target:", color="grey400"),
                 self.selected_process_text,
+                self.usage_text,
                 ft.Container(height=10),
                 self.finish_day_text,
                 self.finish_date_text,
@@ -135,6 +160,29 @@ class HomeView(ft.Column):
             visible=False,
         )
 
+        # Progress of an action running in the background
+        self.action_progress_bar = ft.ProgressBar(width=300, value=0)
+        self.action_progress_text = ft.Text("", size=12, color="grey400")
+        self.action_status = ft.Column(
+            [
+                ft.Row(
+                    [
+                        self.action_progress_text,
+                        ft.IconButton(
+                            icon="close",
+                            icon_size=16,
+                            tooltip="Cancel Action",
+                            on_click=self.on_cancel_action_click,
+                        ),
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                self.action_progress_bar,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            visible=False,
+        )
+
         self.controls_list = [
             self.header,
             self.sub_header,
@@ -146,6 +194,7 @@ class HomeView(ft.Column):
                 [self.start_button, self.pause_button, self.cancel_button],
                 alignment=ft.MainAxisAlignment.CENTER,
             ),
+            self.action_status,
         ]
 
         self.controls = [
@@ -159,17 +208,25 @@ class HomeView(ft.Column):
         ]
 
     def did_mount(self):
-        # Initial refresh
-        self.process_selector.refresh_processes()
+        # Initial refresh, off the UI thread so enumerating processes and
+        # extracting icons does not hold up the first paint
+        self.refresh_thread = threading.Thread(
+            target=self.process_selector.refresh_processes, daemon=True
+        )
+        self.refresh_thread.start()
         # Ensure initial state is consistent
         self.current_trigger_type = self.timer_setup.trigger_type_dropdown.value
         self.on_action_change(self.timer_setup.action_dropdown.value)
 
         # Subscribe to pause changes
         self.timer_service.add_pause_listener(self.on_pause_change)
+        self.timer_service.add_tick_listener(self.on_timer_tick)
+        app_state.subscribe("timer", self.on_timer_info_change)
 
     def will_unmount(self):
         self.timer_service.remove_pause_listener(self.on_pause_change)
+        self.timer_service.remove_tick_listener(self.on_timer_tick)
+        app_state.unsubscribe("timer", self.on_timer_info_change)
 
     def on_pause_change(self, is_paused):
         self.timer_control.set_paused(is_paused)
@@ -182,32 +239,41 @@ class HomeView(ft.Column):
             self.pause_button.icon = "pause"
             self.pause_button.style.bgcolor = "orange600"
 
-        # Update status in config for tray
-        if app_state.timer_config:
-            app_state.timer_config["status"] = "Paused" if is_paused else "Running"
+        # Update status for the tray
+        if app_state.timer:
+            app_state.timer = app_state.timer.replace(
+                status="Paused" if is_paused else "Running"
+            )
 
         self.update()
 
     def on_process_selection_change(self, selected_processes):
+        # Runs on every click in the selector, so only the target text is
+        # sent rather than the whole view
         if not selected_processes:
-            self.selected_process_text.value = "No process selected"
-            self.selected_process_text.italic = True
-            self.selected_process_text.color = "grey500"
+            render_batcher.set(
+                self.selected_process_text,
+                value="No process selected",
+                italic=True,
+                color="grey500",
+            )
         else:
-            names = [p["name"] for p in selected_processes]
+            names = [p.label for p in selected_processes]
             if len(names) > 3:
                 display_text = f"{len(names)} apps selected"
             else:
                 display_text = ", ".join(names)
-            self.selected_process_text.value = display_text
-            self.selected_process_text.italic = False
-            self.selected_process_text.color = "white"
-        self.update()
+            render_batcher.set(
+                self.selected_process_text,
+                value=display_text,
+                italic=False,
+                color="white",
+            )
 
     def on_action_change(self, action):
         is_terminate = action == "Terminate Process"
 
-        self.process_selector.visible = is_terminate
+        self.process_selector.visible = self._needs_processes(action)
         self.action_description_text.visible = not is_terminate
         self.action_description_container.visible = not is_terminate
 
@@ -225,6 +291,9 @@ class HomeView(ft.Column):
 
     def on_trigger_change(self, trigger_type):
         self.current_trigger_type = trigger_type
+        self.process_selector.visible = self._needs_processes(
+            self.timer_setup.action_dropdown.value
+        )
         # Update description if currently showing action description
         if self.action_description_text.visible:
             current_action = self.timer_setup.action_dropdown.value
@@ -235,10 +304,30 @@ class HomeView(ft.Column):
         suffix_map = {
             "Countdown": "when timer ends.",
             "Specific Time": "at the specified time.",
+            "Resource Usage": "when the selected apps cross the usage threshold.",
+            "Battery Low": "when the battery runs low.",
+            "Process Exit": "when the selected apps exit.",
+            "Disk Idle": "when disk activity stays low.",
             "Immediate": "immediately.",
         }
         suffix = suffix_map.get(self.current_trigger_type, "when triggered.")
-        self.action_description_text.value = f"System will {action.lower()} {suffix}"
+        if action == "Pipeline":
+            self.action_description_text.value = f"Pipeline will run {suffix}"
+        else:
+            self.action_description_text.value = (
+                f"System will {action.lower()} {suffix}"
+            )
+
+    def _needs_processes(self, action):
+        if self.timer_setup.trigger_type_dropdown.value in PROCESS_TRIGGERS:
+            return True
+        if action == "Pipeline":
+            return any(
+                step in ("Terminate Process", "Wait For Exit")
+                for stage in self.timer_setup.pipeline_builder.stages
+                for step in stage["actions"]
+            )
+        return action == "Terminate Process"
 
     def on_start_click(self, e):
         config = self.timer_setup.get_configuration()
@@ -252,7 +341,7 @@ class HomeView(ft.Column):
 
         # Additional validation for Process Selection
         if (
-            action == "Terminate Process"
+            self._needs_processes(action)
             and not self.process_selector.selected_processes
         ):
             app_state.page.open(
@@ -267,11 +356,77 @@ class HomeView(ft.Column):
             )
             return
 
+        if (
+            config["trigger_type"] == "Battery Low"
+            and PsutilPowerSource().read() is None
+        ):
+            app_state.page.open(ft.SnackBar(content=ft.Text("No battery detected!")))
+            return
+
+        settings.update(
+            {
+                "last_timer": self.timer_setup.get_saved_values(),
+                "selected_processes": [
+                    p.id for p in self.process_selector.selected_processes
+                ],
+            }
+        )
+
         # Immediate Execution
         if config["trigger_type"] == "Immediate":
             self.on_timer_finish()
             return
 
+        self._show_running()
+
+        if config["trigger_type"] in WATCHER_TRIGGERS:
+            options = config["trigger_options"]
+            if config["trigger_type"] == "Resource Usage":
+                watcher = ResourceMonitor(
+                    self.process_selector.selected_processes,
+                    options["metric"],
+                    options["threshold"],
+                    options["duration_seconds"],
+                )
+                on_update = self.on_usage_update
+            elif config["trigger_type"] == "Battery Low":
+                watcher = BatteryMonitor(options["threshold"])
+                on_update = self.on_battery_update
+                self._battery_eta_total = 0
+            elif config["trigger_type"] == "Disk Idle":
+                watcher = DiskIdleMonitor(
+                    options["devices"],
+                    options["threshold"],
+                    options["duration_seconds"],
+                )
+                on_update = self.on_disk_update
+            else:
+                watcher = ProcessExitWatcher(self.process_selector.selected_processes)
+                on_update = self.on_exit_update
+            self._start_watcher(watcher, on_update)
+            self.usage_text.value = "Sampling..."
+            self.usage_text.visible = True
+            for text in (
+                self.finish_day_text,
+                self.finish_date_text,
+                self.finish_clock_text,
+            ):
+                text.value = ""
+            self._set_timer_info(action, total_seconds)
+            self.update()
+            return
+
+        self._show_finish_time(total_seconds)
+
+        # Start Service; ticks arrive through the tick listener
+        self.timer_service.start_timer(
+            total_seconds, on_tick=None, on_finish=self.on_timer_finish
+        )
+
+        self._set_timer_info(action, total_seconds)
+        self.update()
+
+    def _show_running(self):
         # Switch UI
         self.setup_container.visible = False
         self.timer_container.visible = True
@@ -284,9 +439,10 @@ class HomeView(ft.Column):
         self.pause_button.icon = "pause"
         self.pause_button.style.bgcolor = "orange600"
 
+    def _show_finish_time(self, remaining):
         # Calculate finish time info
         now = datetime.now()
-        finish_time = now + timedelta(seconds=total_seconds)
+        finish_time = now + timedelta(seconds=remaining)
 
         diff_days = (finish_time.date() - now.date()).days
         if diff_days == 0:
@@ -300,19 +456,39 @@ class HomeView(ft.Column):
         self.finish_date_text.value = finish_time.strftime("%A, %d %B %Y")
         self.finish_clock_text.value = finish_time.strftime("%H:%M")
 
-        # Start Service
-        self.timer_service.start_timer(
-            total_seconds, on_tick=self.on_timer_tick, on_finish=self.on_timer_finish
+    def on_timer_info_change(self, info):
+        # Also follows timers started, finished or cancelled through the
+        # control API, which do not go through this view
+        if info is not None:
+            if not self.timer_container.visible and self.timer_service.is_running():
+                status = self.timer_service.get_status()
+                self._show_running()
+                self._show_finish_time(status["remaining_seconds"])
+                self.timer_control.update_timer(
+                    status["remaining_seconds"], status["total_seconds"]
+                )
+                self.update()
+        elif self.timer_container.visible and not self.active_watcher:
+            self.reset_ui()
+
+    def _set_timer_info(self, action, total_seconds):
+        # Shared with the tray and the control API
+        app_state.timer = TimerInfo(
+            action=action,
+            target=self._get_target_description(),
+            total_seconds=total_seconds,
         )
 
-        # Update AppState config for Tray
-        app_state.timer_config = {
-            "action": action,
-            "target": self._get_target_description(),
-            "status": "Running",
-            "total_seconds": total_seconds,
-        }
-        self.update()
+    def _start_watcher(self, watcher, on_update):
+        self.active_watcher = watcher
+        watcher.add_pause_listener(self.on_pause_change)
+        watcher.start(on_update=on_update, on_fire=self.on_watcher_fire)
+
+    def _clear_watcher(self):
+        if self.active_watcher:
+            self.active_watcher.stop()
+            self.active_watcher.remove_pause_listener(self.on_pause_change)
+            self.active_watcher = None
 
     def _get_target_description(self):
         config = self.timer_setup.get_configuration()
@@ -320,32 +496,134 @@ class HomeView(ft.Column):
         if action == "Terminate Process":
             count = len(self.process_selector.selected_processes)
             if count == 1:
-                return self.process_selector.selected_processes[0]["name"]
+                return self.process_selector.selected_processes[0].label
             return f"{count} apps"
         return "System"
 
     def on_timer_tick(self, remaining, total):
-        # This callback comes from a thread, so we must not update UI directly if Flet is picky,
-        # but Flet usually handles updates from other threads via page.update() or control.update() if locking is correct.
-        # However, it's safer to ensure we are thread-safe. Flet controls are generally thread-safe for property updates.
-        self.timer_control.update_timer(remaining, total)
-
-        # Update finish time based on remaining duration
-        finish_time = datetime.now() + timedelta(seconds=remaining)
-        new_text = finish_time.strftime("%H:%M")
-        if self.finish_clock_text.value != new_text:
-            self.finish_clock_text.value = new_text
-            self.finish_clock_text.update()
+        # Called on the housekeeping thread. Everything changed in this tick
+        # goes out as one page update, and only if it actually changed.
+        with render_batcher.batch():
+            self.timer_control.update_timer(remaining, total)
+
+            # Update finish time based on remaining duration
+            finish_time = datetime.now() + timedelta(seconds=remaining)
+            render_batcher.set(
+                self.finish_clock_text, value=finish_time.strftime("%H:%M")
+            )
+
+    def _update_hold_progress(self, stats):
+        # Ring shows how much of the sustained window has been met so far
+        duration = stats["duration_seconds"]
+        remaining = max(0, int(duration - stats["held_seconds"] + 0.5))
+        self.timer_control.update_timer(remaining, duration)
+
+    def on_usage_update(self, stats):
+        with render_batcher.batch():
+            self._update_hold_progress(stats)
+            render_batcher.set(
+                self.usage_text,
+                value=f"CPU {stats['cpu_percent']:.1f}% · RAM {format_bytes(stats['rss'])}"
+                f" · {stats['alive']} running",
+            )
+
+    def on_disk_update(self, stats):
+        with render_batcher.batch():
+            self._update_hold_progress(stats)
+            render_batcher.set(
+                self.usage_text,
+                value=f"Disk read {format_bytes(stats['read_rate'])}/s"
+                f" · write {format_bytes(stats['write_rate'])}/s",
+            )
+
+    def on_battery_update(self, status):
+        if status["percent"] is None:
+            text = "No battery detected"
+        else:
+            power = "Charging" if status["plugged"] else "On battery"
+            text = f"Battery {status['percent']:.0f}% · {power}"
+            if not status["armed"]:
+                text += " · waiting for charger"
+
+        with render_batcher.batch():
+            render_batcher.set(self.usage_text, value=text)
+            eta = status.get("eta")
+            if eta is not None:
+                # Ring fills up as the charge approaches the threshold
+                self._battery_eta_total = max(self._battery_eta_total, int(eta))
+                self.timer_control.update_timer(int(eta), self._battery_eta_total)
+
+    def on_exit_update(self, status):
+        alive, total = status["alive"], status["total"]
+        value = (total - alive) / total if total else 1
+        with render_batcher.batch():
+            self.timer_control.update_progress(value, f"{alive} left")
+            render_batcher.set(
+                self.usage_text,
+                value=f"Waiting for {alive}/{total} processes to exit",
+            )
+
+    def on_watcher_fire(self):
+        # Re-arming watchers keep running after they fire, so only the action
+        # runs and the UI stays in its running state.
+        if self.active_watcher and self.active_watcher.is_running():
+            self.run_action()
+        else:
+            self.on_timer_finish()
 
     def on_timer_finish(self):
-        # Execute Action
+        self.run_action()
+        app_state.timer = None
+        self.reset_ui()
+
+    def run_action(self):
+        # Execute Action on the action workers so the timer and watcher
+        # threads return immediately; feedback arrives in on_action_done.
         config = self.timer_setup.get_configuration()
-        result = ActionExecutor.execute(
-            config["action"], self.process_selector.selected_processes
+        is_pipeline = config["action"] == "Pipeline"
+        # A re-arming watcher can fire again while an action still runs;
+        # only the latest run owns the status row and the cancel button.
+        self._action_run += 1
+        run = self._action_run
+
+        self.action_progress_bar.value = None  # Indeterminate until progress
+        self.action_progress_text.value = f"Running {config['action']}..."
+        self.action_status.visible = True
+        self.update()
+
+        handle = ActionExecutor.submit(
+            config["action"],
+            list(self.process_selector.selected_processes),
+            pipeline=config["pipeline"],
+            timeout=None if is_pipeline else ACTION_TIMEOUT,
+            on_progress=lambda fraction, message: self.on_action_progress(
+                run, fraction, message
+            ),
+            on_done=lambda result: self.on_action_done(run, result),
         )
+        if not handle.done():
+            self.action_handle = handle
+
+    def on_action_progress(self, run, fraction, message):
+        if run != self._action_run:
+            return
+        self.action_progress_bar.value = fraction
+        if message:
+            self.action_progress_text.value = message
+        self.action_status.update()
+
+    def on_cancel_action_click(self, e):
+        if self.action_handle:
+            self.action_handle.cancel()
+
+    def on_action_done(self, run, result):
+        if run == self._action_run:
+            self.action_handle = None
+            self.action_status.visible = False
+            self.update()
 
         # UI Feedback
-        # Note: Since this runs in the service thread, ensure UI calls are safe.
+        # Note: This runs on an action worker thread, ensure UI calls are safe.
         # Flet page.open usually works from threads.
 
         if result["success"]:
@@ -363,6 +641,10 @@ class HomeView(ft.Column):
                     msg = "Failed to terminate selected apps."
                     bgcolor = "red700"
 
+                app_state.page.open(ft.SnackBar(content=ft.Text(msg), bgcolor=bgcolor))
+            elif result.get("type") == "pipeline":
+                all_ok = all(stage.get("success") for stage in result["stages"])
+                bgcolor = "green700" if all_ok else "orange700"
                 app_state.page.open(ft.SnackBar(content=ft.Text(msg), bgcolor=bgcolor))
             else:
                 app_state.page.open(ft.SnackBar(content=ft.Text(msg)))
@@ -373,19 +655,23 @@ class HomeView(ft.Column):
                 )
             )
 
-        self.reset_ui()
-
     def on_pause_click(self, e):
         # Service call will trigger listener update
-        self.timer_service.toggle_pause()
+        if self.active_watcher:
+            self.active_watcher.toggle_pause()
+        else:
+            self.timer_service.toggle_pause()
 
     def on_cancel_click(self, e):
+        self._clear_watcher()
         self.timer_service.cancel_timer()
         app_state.page.open(ft.SnackBar(content=ft.Text("Timer cancelled.")))
-        app_state.timer_config = {}  # Clear config
+        app_state.timer = None
         self.reset_ui()
 
     def reset_ui(self):
+        self._clear_watcher()
+        self.usage_text.visible = False
         self.setup_container.visible = True
         self.timer_container.visible = False
         self.start_button.visible = True
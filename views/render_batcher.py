@@ -0,0 +1,113 @@
+import threading
+from contextlib import contextmanager
+from services.housekeeping import housekeeper as default_housekeeper
+
+# Most page updates per second sent by the batcher
+MAX_FPS = 20
+
+
+class RenderBatcher:
+    """
+    Collects control property changes and sends them to the page as one
+    update, at most `max_fps` times a second.
+
+    set() skips values equal to what the control already has, and only the
+    controls that changed are sent, so an update carries just the changed
+    properties instead of a whole subtree per control.
+    """
+
+    def __init__(self, page=None, max_fps=MAX_FPS, housekeeper=None):
+        """
+        Args:
+            page (ft.Page): Page to update. Defaults to the page of the
+                changed controls.
+            max_fps (int): Frame-rate cap for flushes.
+            housekeeper (Housekeeper): Runs deferred flushes.
+        """
+        self.page = page
+        self.min_interval = 1.0 / max_fps
+        self.housekeeper = housekeeper or default_housekeeper
+        self.flushes = 0
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._last_flush = None
+        self._flush_task = None
+
+    def set(self, control, **props):
+        """
+        Sets properties on a control and queues it for the next flush if any
+        of them changed.
+
+        Returns:
+            bool: True if something changed.
+        """
+        changed = False
+        for name, value in props.items():
+            if getattr(control, name) != value:
+                setattr(control, name, value)
+                changed = True
+        if changed:
+            with self._lock:
+                self._dirty[id(control)] = control
+            if not self._depth:
+                self.request_flush()
+        return changed
+
+    @contextmanager
+    def batch(self):
+        """
+        Changes made inside the block are flushed together when it exits.
+        """
+        with self._lock:
+            self._depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                outermost = not self._depth
+            if outermost:
+                self.request_flush()
+
+    def request_flush(self):
+        """
+        Flushes now, or schedules the flush for when the frame-rate cap
+        allows it.
+        """
+        now = self.housekeeper.time_func()
+        with self._lock:
+            if not self._dirty or self._flush_task:
+                return
+            if self._last_flush is None or now - self._last_flush >= self.min_interval:
+                due = None
+            else:
+                due = self._last_flush + self.min_interval
+                self._flush_task = self.housekeeper.call_at(
+                    due, self.flush, name="render"
+                )
+        if due is None:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush_task = None
+            controls = list(self._dirty.values())
+            self._dirty.clear()
+            if not controls:
+                return
+            self._last_flush = self.housekeeper.time_func()
+
+        page = self.page or next((c.page for c in controls if c.page), None)
+        mounted = [c for c in controls if c.page]
+        if page is None or not mounted:
+            # Not on screen yet, the values go out with the first update
+            return
+        try:
+            page.update(*mounted)
+            self.flushes += 1
+        except Exception as e:
+            print(f"Error flushing UI changes: {e}")
+
+
+render_batcher = RenderBatcher()
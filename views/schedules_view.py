@@ -0,0 +1,139 @@
+import flet as ft
+from datetime import datetime
+from state import app_state
+from services.scheduler import SCHEDULE_ACTIONS, Schedule, scheduler
+
+
+class SchedulesView(ft.Column):
+    """
+    Lists the recurring schedules and adds new ones. The list is redrawn
+    whenever the scheduler reports a change, including after a fire.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.visible = False
+        self.scroll = ft.ScrollMode.AUTO
+
+        self.rule_input = ft.TextField(
+            label="When",
+            hint_text="weekdays 23:30, daily 01:00 or 30 23 * * 1-5",
+            expand=True,
+        )
+        self.action_dropdown = ft.Dropdown(
+            label="Action",
+            options=[ft.dropdown.Option(action) for action in SCHEDULE_ACTIONS],
+            value=SCHEDULE_ACTIONS[0],
+            width=190,
+            on_change=self.on_action_change,
+        )
+        self.processes_input = ft.TextField(
+            label="Processes",
+            hint_text="chrome, steam",
+            expand=True,
+        )
+        self.schedule_list = ft.Column(spacing=5)
+        self.empty_text = ft.Text("No schedules yet.", italic=True, color="grey500")
+
+        self.controls = [
+            ft.Container(
+                padding=20,
+                content=ft.Column(
+                    [
+                        ft.Text("Schedules", size=30, weight=ft.FontWeight.BOLD),
+                        ft.Divider(),
+                        ft.Row([self.rule_input]),
+                        ft.Row([self.action_dropdown, self.processes_input]),
+                        ft.Row(
+                            [
+                                ft.ElevatedButton(
+                                    "Add Schedule",
+                                    icon="add",
+                                    on_click=self.add_schedule,
+                                )
+                            ],
+                            alignment=ft.MainAxisAlignment.END,
+                        ),
+                        ft.Divider(),
+                        self.empty_text,
+                        self.schedule_list,
+                    ]
+                ),
+            )
+        ]
+
+        self.render()
+        scheduler.add_change_listener(self.on_schedules_change)
+
+    def on_action_change(self, e):
+        self.processes_input.visible = e.control.value == "Terminate Process"
+        self.update()
+
+    def add_schedule(self, e):
+        names = []
+        if self.processes_input.visible:
+            names = (self.processes_input.value or "").split(",")
+        try:
+            schedule = Schedule(
+                self.rule_input.value or "", self.action_dropdown.value, names
+            )
+        except ValueError as error:
+            self.show_message(str(error))
+            return
+        scheduler.add(schedule)
+        self.rule_input.value = ""
+        self.show_message(f"Next run: {format_fire(schedule.next_fire)}")
+
+    def show_message(self, text):
+        if app_state.page:
+            app_state.page.open(ft.SnackBar(content=ft.Text(text)))
+
+    def on_schedules_change(self):
+        self.render()
+        if self.page:
+            self.update()
+
+    def render(self):
+        rows = []
+        for schedule in scheduler.schedules():
+            rows.append(
+                ft.Row(
+                    [
+                        ft.Switch(
+                            value=schedule.enabled,
+                            on_change=lambda e, s=schedule: scheduler.set_enabled(
+                                s.id, e.control.value
+                            ),
+                        ),
+                        ft.Column(
+                            [
+                                ft.Text(
+                                    f"{schedule.rule.text} · {schedule.describe()}",
+                                    weight=ft.FontWeight.W_500,
+                                ),
+                                ft.Text(
+                                    f"Next: {format_fire(schedule.next_fire)}",
+                                    size=12,
+                                    color="grey500",
+                                ),
+                            ],
+                            spacing=2,
+                            expand=True,
+                        ),
+                        ft.IconButton(
+                            icon="delete",
+                            icon_size=18,
+                            on_click=lambda e, s=schedule: scheduler.remove(s.id),
+                        ),
+                    ],
+                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                )
+            )
+        self.schedule_list.controls = rows
+        self.empty_text.visible = not rows
+
+
+def format_fire(timestamp):
+    if timestamp is None:
+        return "disabled"
+    return datetime.fromtimestamp(timestamp).strftime("%a %d %b %H:%M")
@@ -1,11 +1,49 @@
+import os
+import threading
 import flet as ft
+from datetime import datetime
 from state import app_state
+from process_manager import GROUPINGS
+from services.profiler import profiler
+from services.settings_store import settings
+from services.telemetry import telemetry
 
 
 class SettingsView(ft.Column):
     def __init__(self):
         super().__init__()
         self.visible = False
+
+        self.profile_switch = ft.Switch(
+            label="Record Profile (60 s)",
+            value=profiler.is_active(),
+            on_change=self.toggle_profile,
+        )
+        profiler.add_done_listener(self.on_profile_done)
+
+        self.diagnostics_list = ft.Column(spacing=2)
+        self.diagnostics_section = ft.Column(
+            [
+                self.diagnostics_list,
+                ft.Row(
+                    [
+                        ft.TextButton(
+                            "Refresh", icon="refresh", on_click=self.refresh_diagnostics
+                        ),
+                        ft.TextButton(
+                            "Reset", icon="restart_alt", on_click=self.reset_diagnostics
+                        ),
+                        ft.TextButton(
+                            "Export JSON",
+                            icon="download",
+                            on_click=self.export_diagnostics,
+                        ),
+                    ]
+                ),
+            ],
+            visible=telemetry.enabled,
+        )
+
         self.controls = [
             ft.Container(
                 padding=20,
@@ -14,19 +52,40 @@ class SettingsView(ft.Column):
                         ft.Text("Settings", size=30, weight=ft.FontWeight.BOLD),
                         ft.Divider(),
                         ft.Switch(
-                            label="Dark Mode", value=True, on_change=self.toggle_theme
+                            label="Dark Mode",
+                            value=app_state.dark_mode,
+                            on_change=self.toggle_theme,
                         ),
                         ft.Switch(
                             label="Show System Processes",
                             value=app_state.show_system_processes,
                             on_change=self.toggle_system_processes,
                         ),
+                        ft.Dropdown(
+                            label="Group Processes By",
+                            options=[
+                                ft.dropdown.Option(key, label)
+                                for key, label in GROUPINGS.items()
+                            ],
+                            value=app_state.process_grouping,
+                            on_change=self.change_grouping,
+                            width=250,
+                        ),
                         ft.Switch(
                             label="Minimize to Tray",
                             value=app_state.minimize_to_tray,
                             on_change=self.toggle_minimize_to_tray,
                         ),
                         ft.Divider(),
+                        ft.Text("Diagnostics", size=20, weight=ft.FontWeight.BOLD),
+                        ft.Switch(
+                            label="Collect Timings",
+                            value=telemetry.enabled,
+                            on_change=self.toggle_telemetry,
+                        ),
+                        self.diagnostics_section,
+                        self.profile_switch,
+                        ft.Divider(),
                         ft.Text("About", size=20, weight=ft.FontWeight.BOLD),
                         ft.Text("Time to Sleep v1.0", color="grey500"),
                         ft.Text("Created with Flet & Python", color="grey500"),
@@ -36,16 +95,78 @@ class SettingsView(ft.Column):
         ]
 
     def toggle_theme(self, e):
+        app_state.dark_mode = e.control.value
         if app_state.page:
             app_state.page.theme_mode = (
-                ft.ThemeMode.LIGHT
-                if app_state.page.theme_mode == ft.ThemeMode.DARK
-                else ft.ThemeMode.DARK
+                ft.ThemeMode.DARK if app_state.dark_mode else ft.ThemeMode.LIGHT
             )
             app_state.page.update()
 
     def toggle_system_processes(self, e):
-        app_state.toggle_system_processes(e.control.value)
+        app_state.show_system_processes = e.control.value
+
+    def change_grouping(self, e):
+        app_state.process_grouping = e.control.value
 
     def toggle_minimize_to_tray(self, e):
         app_state.minimize_to_tray = e.control.value
+
+    def toggle_telemetry(self, e):
+        telemetry.enabled = e.control.value
+        settings.set("telemetry", telemetry.enabled)
+        self.diagnostics_section.visible = telemetry.enabled
+        self.refresh_diagnostics()
+
+    def refresh_diagnostics(self, e=None):
+        snapshot = telemetry.snapshot()
+        rows = []
+        for name, stats in snapshot["histograms"].items():
+            rows.append(
+                ft.Text(
+                    f"{name}: {stats['count']} calls · p50 {format_us(stats['p50_us'])}"
+                    f" · p95 {format_us(stats['p95_us'])} · max {format_us(stats['max_us'])}",
+                    size=12,
+                )
+            )
+        for name, value in sorted(snapshot["counters"].items()):
+            rows.append(ft.Text(f"{name}: {value}", size=12))
+        if not rows:
+            rows.append(ft.Text("No samples yet.", italic=True, color="grey500"))
+        self.diagnostics_list.controls = rows
+        self.update()
+
+    def toggle_profile(self, e):
+        if e.control.value:
+            profiler.start("sample")
+        else:
+            # Writes the files, reported through on_profile_done
+            threading.Thread(target=profiler.stop, daemon=True).start()
+
+    def on_profile_done(self, paths):
+        self.profile_switch.value = False
+        message = f"Profile saved to {paths[0]}" if paths else "Profile failed"
+        if app_state.page:
+            app_state.page.open(ft.SnackBar(content=ft.Text(message)))
+        self.update()
+
+    def reset_diagnostics(self, e):
+        telemetry.reset()
+        self.refresh_diagnostics()
+
+    def export_diagnostics(self, e):
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(os.path.dirname(settings.path), f"diagnostics-{stamp}.json")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            telemetry.export_json(path)
+            message = f"Saved to {path}"
+        except OSError as e:
+            message = f"Export failed: {e}"
+        if app_state.page:
+            app_state.page.open(ft.SnackBar(content=ft.Text(message)))
+
+
+def format_us(us):
+    if us >= 1000:
+        return f"{us / 1000:.1f} ms"
+    return f"{us:.0f} µs"